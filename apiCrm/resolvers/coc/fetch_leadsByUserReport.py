@@ -1,6 +1,6 @@
 import asyncio
 import logging
-from typing import List, Dict
+from typing import List, Dict, Optional
 from ..fetch_graphql import fetch_graphql
 from dotenv import load_dotenv
 import os
@@ -10,7 +10,7 @@ load_dotenv()
 
 logger = logging.getLogger(__name__)
 
-async def fetch_leadsByUserReport(session, start_date: str, end_date: str) -> List[Dict]:
+async def fetch_leadsByUserReport(session, start_date: str, end_date: str) -> Optional[List[Dict]]:
     """
     Fetches leads by user report data from the CRM API within a specified date range.
     Report name: "Leads por Atendente"
@@ -19,7 +19,7 @@ async def fetch_leadsByUserReport(session, start_date: str, end_date: str) -> Li
         start_date: Start date in ISO format (YYYY-MM-DD)
         end_date: End date in ISO format (YYYY-MM-DD)
     Returns:
-        List of leads by user report dictionaries
+        List of leads by user report dictionaries, or None if the request failed
     """
     all_leads = []
     api_url = os.getenv('API_CRM_URL', 'https://open-api.eprocorpo.com.br/graphql')
@@ -62,7 +62,7 @@ async def fetch_leadsByUserReport(session, start_date: str, end_date: str) -> Li
     if data is None or 'errors' in data:
         error_msg = data.get('errors', [{'message': 'Unknown error'}])[0]['message'] if data else 'No data returned'
         logger.error(f"Failed initial leads by user report fetch: {error_msg}")
-        return all_leads  # Return empty list on initial failure
+        return None
     
     try:
         if 'data' in data and 'leadsByUserReport' in data['data']:
@@ -105,9 +105,11 @@ async def fetch_leadsByUserReport(session, start_date: str, end_date: str) -> Li
                     await asyncio.sleep(0.5)
         else:
             logger.error(f"Unexpected API response structure: {data}")
+            return None
     
     except Exception as e:
         logger.error(f"Error processing leads by user report data: {str(e)}")
+        return None
     
     logger.info(f"Total leads by user fetched: {len(all_leads)}")
     return all_leads
@@ -161,4 +163,4 @@ async def fetch_and_process_leadsByUserReport(start_date: str, end_date: str) ->
     async with aiohttp.ClientSession() as session:
         leadsByUserReport = await fetch_leadsByUserReport(session, start_date, end_date)
     
-    return leadsByUserReport
+    return leadsByUserReport or []
@@ -5,7 +5,7 @@ python -m apiCrm.tests.fetch_appointmentReport_test
 
 import asyncio
 import logging
-from typing import List, Dict
+from typing import List, Dict, Optional
 from ..fetch_graphql import fetch_graphql
 from dotenv import load_dotenv
 import os
@@ -337,7 +337,7 @@ async def fetch_and_process_appointment_report(start_date: str, end_date: str) -
     return appointments
 
 
-async def fetch_appointmentReportCreatedAt(session, start_date: str, end_date: str) -> List[Dict]:
+async def fetch_appointmentReportCreatedAt(session, start_date: str, end_date: str) -> Optional[List[Dict]]:
     """
     Fetches appointment report data from the CRM API within a specified date range.
     
@@ -347,7 +347,8 @@ async def fetch_appointmentReportCreatedAt(session, start_date: str, end_date: s
         end_date: End date in ISO format (YYYY-MM-DD)
         
     Returns:
-        List of appointment report dictionaries
+        List of appointment report dictionaries, or None if the request failed
+        (an empty list means the range really has no appointments)
     """
     current_page = 1
     all_appointments = []
@@ -461,7 +462,7 @@ async def fetch_appointmentReportCreatedAt(session, start_date: str, end_date: s
         # Carefully check for None and errors
         if data is None:
             logger.error("GraphQL request returned None response")
-            return all_appointments
+            return None
             
         if 'errors' in data:
             error_msg = "Unknown error"
@@ -469,26 +470,26 @@ async def fetch_appointmentReportCreatedAt(session, start_date: str, end_date: s
                 if 'message' in data['errors'][0]:
                     error_msg = data['errors'][0]['message']
             logger.error(f"Failed initial appointments fetch: {error_msg}")
-            return all_appointments
+            return None
             
         try:
             if 'data' not in data:
                 logger.error("No 'data' field in GraphQL response")
-                return all_appointments
+                return None
                 
             if 'appointmentsReport' not in data['data']:
                 logger.error("No 'appointmentsReport' field in GraphQL data")
-                return all_appointments
+                return None
                 
             appointments_report = data['data']['appointmentsReport']
             if not appointments_report:
                 logger.error("Empty 'appointmentsReport' in response")
-                return all_appointments
+                return None
                 
             # Check first for the appointments data
             if 'data' not in appointments_report:
-                logger.info("No 'data' field in appointmentsReport")
-                return all_appointments
+                logger.error("No 'data' field in appointmentsReport")
+                return None
                 
             appointments_data = appointments_report.get('data', [])
             if not appointments_data:
@@ -634,13 +635,13 @@ async def fetch_appointmentReportCreatedAt(session, start_date: str, end_date: s
             logger.error(f"Error processing appointment data: {str(e)}")
             import traceback
             logger.error(f"Traceback: {traceback.format_exc()}")
-            return all_appointments
+            return None
             
     except Exception as e:
         logger.error(f"Error making GraphQL request: {str(e)}")
         import traceback
         logger.error(f"Traceback: {traceback.format_exc()}")
-        return all_appointments
+        return None
 
 async def fetch_and_process_appointment_report_created_at(start_date: str, end_date: str) -> List[Dict]:
     """
@@ -658,4 +659,48 @@ async def fetch_and_process_appointment_report_created_at(start_date: str, end_d
     async with aiohttp.ClientSession() as session:
         appointments = await fetch_appointmentReportCreatedAt(session, start_date, end_date)
     
-    return appointments
\ No newline at end of file
+    return appointments or []
+
+async def fetch_appointmentReportCreatedAt_total(session, start_date: str, end_date: str) -> Optional[int]:
+    """
+    Fetches only the number of appointments created within a date range.
+    
+    Used as a cheap change probe: a single request with perPage=1 and no
+    appointment fields, so callers can skip the full paginated fetch when
+    nothing new was created.
+    
+    Args:
+        session: The aiohttp ClientSession object
+        start_date: Start date in ISO format (YYYY-MM-DD)
+        end_date: End date in ISO format (YYYY-MM-DD)
+        
+    Returns:
+        Total number of appointments, or None if the request failed
+    """
+    api_url = os.getenv('API_CRM_URL', 'https://open-api.eprocorpo.com.br/graphql')
+
+    query = '''
+    query AppointmentsReportTotal($start: Date!, $end: Date!) {
+        appointmentsReport(
+            filters: { createdAtRange: { start: $start, end: $end } }
+            pagination: { currentPage: 1, perPage: 1 }
+        ) {
+            meta {
+                total
+            }
+        }
+    }
+    '''
+
+    variables = {
+        'start': start_date,
+        'end': end_date
+    }
+
+    data = await fetch_graphql(session, api_url, query, variables)
+
+    try:
+        return int(data['data']['appointmentsReport']['meta']['total'])
+    except (TypeError, KeyError, ValueError):
+        logger.error(f"Failed to fetch appointments total from {start_date} to {end_date}")
+        return None
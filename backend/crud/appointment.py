@@ -1,101 +1,114 @@
-from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+from sqlalchemy import func, select
 from typing import List, Optional
 from datetime import datetime, date
 
 from ..models.appointment import Appointment
 from ..schemas.appointment import AppointmentCreate, AppointmentUpdate
+from .counts import invalidate_counts
+from .pagination import apply_page
 
-def get_appointment(db: Session, appointment_id: int) -> Optional[Appointment]:
-    return db.query(Appointment).filter(Appointment.id == appointment_id).first()
+# Sort key of the list pages (see pagination.py)
+APPOINTMENT_ORDER = (Appointment.date, Appointment.id)
 
-def get_appointments(
-    db: Session,
+async def get_appointment(db: AsyncSession, appointment_id: int) -> Optional[Appointment]:
+    return await db.scalar(select(Appointment).where(Appointment.id == appointment_id))
+
+async def get_appointments(
+    db: AsyncSession,
     skip: int = 0,
     limit: int = 100,
     lead_id: Optional[int] = None,
     unit: Optional[str] = None,
     status: Optional[str] = None,
     date_from: Optional[date] = None,
-    date_to: Optional[date] = None
+    date_to: Optional[date] = None,
+    after: Optional[str] = None
 ) -> List[Appointment]:
-    query = db.query(Appointment)
+    query = select(Appointment)
     
     if lead_id:
-        query = query.filter(Appointment.lead_id == lead_id)
+        query = query.where(Appointment.lead_id == lead_id)
     if unit:
-        query = query.filter(Appointment.unit == unit)
+        query = query.where(Appointment.unit == unit)
     if status:
-        query = query.filter(Appointment.status == status)
+        query = query.where(Appointment.status == status)
     if date_from:
-        query = query.filter(Appointment.date >= date_from)
+        query = query.where(Appointment.date >= date_from)
     if date_to:
-        query = query.filter(Appointment.date <= date_to)
+        query = query.where(Appointment.date <= date_to)
         
-    return query.offset(skip).limit(limit).all()
+    return (await db.scalars(apply_page(query, APPOINTMENT_ORDER, skip=skip, limit=limit, after=after))).all()
 
-def create_appointment(db: Session, appointment: AppointmentCreate) -> Appointment:
+async def create_appointment(db: AsyncSession, appointment: AppointmentCreate) -> Appointment:
     db_appointment = Appointment(**appointment.dict())
     db.add(db_appointment)
-    db.commit()
-    db.refresh(db_appointment)
+    await db.commit()
+    invalidate_counts(Appointment.__table__)
+    await db.refresh(db_appointment)
     return db_appointment
 
-def update_appointment(
-    db: Session, 
+async def update_appointment(
+    db: AsyncSession, 
     appointment_id: int, 
     appointment: AppointmentUpdate
 ) -> Optional[Appointment]:
-    db_appointment = get_appointment(db, appointment_id)
+    db_appointment = await get_appointment(db, appointment_id)
     if not db_appointment:
         return None
         
     for key, value in appointment.dict(exclude_unset=True).items():
         setattr(db_appointment, key, value)
     
-    db.commit()
-    db.refresh(db_appointment)
+    await db.commit()
+    invalidate_counts(Appointment.__table__)
+    await db.refresh(db_appointment)
     return db_appointment
 
-def delete_appointment(db: Session, appointment_id: int) -> bool:
-    db_appointment = get_appointment(db, appointment_id)
+async def delete_appointment(db: AsyncSession, appointment_id: int) -> bool:
+    # Deleting detaches the appointment's sales, which must be loaded up front (no lazy loads under asyncio)
+    db_appointment = await db.scalar(
+        select(Appointment).where(Appointment.id == appointment_id).options(selectinload(Appointment.sales))
+    )
     if not db_appointment:
         return False
         
-    db.delete(db_appointment)
-    db.commit()
+    await db.delete(db_appointment)
+    await db.commit()
+    invalidate_counts(Appointment.__table__)
     return True
 
 # Additional utility functions
 
-def get_appointments_count(
-    db: Session,
+async def get_appointments_count(
+    db: AsyncSession,
     unit: Optional[str] = None,
     status: Optional[str] = None,
     date_from: Optional[date] = None,
     date_to: Optional[date] = None
 ) -> int:
-    query = db.query(func.count(Appointment.id))
+    query = select(func.count(Appointment.id))
     
     if unit:
-        query = query.filter(Appointment.unit == unit)
+        query = query.where(Appointment.unit == unit)
     if status:
-        query = query.filter(Appointment.status == status)
+        query = query.where(Appointment.status == status)
     if date_from:
-        query = query.filter(Appointment.date >= date_from)
+        query = query.where(Appointment.date >= date_from)
     if date_to:
-        query = query.filter(Appointment.date <= date_to)
+        query = query.where(Appointment.date <= date_to)
         
-    return query.scalar()
+    return await db.scalar(query)
 
-def get_appointments_by_unit(db: Session) -> List[dict]:
-    return db.query(
+async def get_appointments_by_unit(db: AsyncSession) -> List[dict]:
+    return (await db.execute(select(
         Appointment.unit,
         func.count(Appointment.id).label('count')
-    ).group_by(Appointment.unit).all()
+    ).group_by(Appointment.unit))).mappings().all()
 
-def get_appointments_by_status(db: Session) -> List[dict]:
-    return db.query(
+async def get_appointments_by_status(db: AsyncSession) -> List[dict]:
+    return (await db.execute(select(
         Appointment.status,
         func.count(Appointment.id).label('count')
-    ).group_by(Appointment.status).all()
\ No newline at end of file
+    ).group_by(Appointment.status))).mappings().all()
\ No newline at end of file
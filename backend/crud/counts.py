@@ -0,0 +1,74 @@
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from sqlalchemy import Table, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# Totals of the list endpoints. Counting a large table costs more than reading a page, so
+# totals can be skipped (include_total=false), are cached per table and filter set for
+# COUNT_CACHE_TTL seconds, and unfiltered totals can come from the planner's statistics.
+# The cache lives in the worker process; writes through the CRUD modules invalidate it.
+
+COUNT_CACHE_TTL = 30  # seconds
+COUNT_CACHE_SIZE = 1024
+_count_cache: Dict[Tuple, Tuple[int, float]] = {}
+
+def _cache_key(table: Table, filters: Dict[str, Any]) -> Tuple:
+    return (table.name, tuple(sorted((name, str(value)) for name, value in filters.items() if value)))
+
+def invalidate_counts(table: Table) -> None:
+    for key in [key for key in _count_cache if key[0] == table.name]:
+        _count_cache.pop(key, None)
+
+async def cached_count(table: Table, filters: Dict[str, Any], count: Callable[[], Awaitable[int]]) -> int:
+    """Exact count from `count()`, reused for COUNT_CACHE_TTL seconds for the same table and filters."""
+    key = _cache_key(table, filters)
+    cached = _count_cache.get(key)
+    if cached is not None and time.monotonic() - cached[1] < COUNT_CACHE_TTL:
+        return cached[0]
+
+    total = await count()
+    _count_cache.pop(key, None)
+    _count_cache[key] = (total, time.monotonic())
+    while len(_count_cache) > COUNT_CACHE_SIZE:
+        _count_cache.pop(next(iter(_count_cache)))
+    return total
+
+async def estimated_count(db: AsyncSession, table: Table) -> Optional[int]:
+    """
+    Row count from PostgreSQL's statistics (pg_class.reltuples), kept up to date by autovacuum/ANALYZE.
+    None when there are no statistics (never analyzed, or another database such as SQLite).
+    """
+    if db.get_bind().dialect.name != "postgresql":
+        return None
+    estimate = await db.scalar(
+        text("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:table_name)"),
+        {"table_name": table.name},
+    )
+    # -1 (PostgreSQL 14+) or 0 (older versions) until the table is first analyzed
+    if estimate is None or estimate <= 0:
+        return None
+    return int(estimate)
+
+async def resolve_total(
+    db: AsyncSession,
+    table: Table,
+    filters: Dict[str, Any],
+    count: Callable[[], Awaitable[int]],
+    include_total: bool = True,
+    estimate: bool = False
+) -> Tuple[Optional[int], bool]:
+    """
+    Total for a list endpoint.
+
+    Returns:
+        tuple: (total, estimated) - total is None when include_total is False; estimated is True
+        when it came from the statistics (only for unfiltered queries, exact count otherwise)
+    """
+    if not include_total:
+        return None, False
+    if estimate and not any(filters.values()):
+        total = await estimated_count(db, table)
+        if total is not None:
+            return total, True
+    return await cached_count(table, filters, count), False
@@ -1,88 +1,101 @@
-from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+from sqlalchemy import func, select
 from typing import List, Optional
 from datetime import datetime
 
 from ..models.lead import Lead
 from ..schemas.lead import LeadCreate, LeadUpdate
+from .counts import invalidate_counts
+from .pagination import apply_page
 
-def get_lead(db: Session, lead_id: int) -> Optional[Lead]:
-    return db.query(Lead).filter(Lead.id == lead_id).first()
+# Sort key of the list pages (see pagination.py)
+LEAD_ORDER = (Lead.id,)
 
-def get_leads(
-    db: Session, 
+async def get_lead(db: AsyncSession, lead_id: int) -> Optional[Lead]:
+    return await db.scalar(select(Lead).where(Lead.id == lead_id))
+
+async def get_leads(
+    db: AsyncSession, 
     skip: int = 0, 
     limit: int = 100,
     unit: Optional[str] = None,
     status: Optional[str] = None,
-    source: Optional[str] = None
+    source: Optional[str] = None,
+    after: Optional[str] = None
 ) -> List[Lead]:
-    query = db.query(Lead)
+    query = select(Lead)
     
     if unit:
-        query = query.filter(Lead.unit == unit)
+        query = query.where(Lead.unit == unit)
     if status:
-        query = query.filter(Lead.status == status)
+        query = query.where(Lead.status == status)
     if source:
-        query = query.filter(Lead.source == source)
+        query = query.where(Lead.source == source)
         
-    return query.offset(skip).limit(limit).all()
+    return (await db.scalars(apply_page(query, LEAD_ORDER, skip=skip, limit=limit, after=after))).all()
 
-def create_lead(db: Session, lead: LeadCreate) -> Lead:
+async def create_lead(db: AsyncSession, lead: LeadCreate) -> Lead:
     db_lead = Lead(**lead.dict())
     db.add(db_lead)
-    db.commit()
-    db.refresh(db_lead)
+    await db.commit()
+    invalidate_counts(Lead.__table__)
+    await db.refresh(db_lead)
     return db_lead
 
-def update_lead(db: Session, lead_id: int, lead: LeadUpdate) -> Optional[Lead]:
-    db_lead = get_lead(db, lead_id)
+async def update_lead(db: AsyncSession, lead_id: int, lead: LeadUpdate) -> Optional[Lead]:
+    db_lead = await get_lead(db, lead_id)
     if not db_lead:
         return None
         
     for key, value in lead.dict(exclude_unset=True).items():
         setattr(db_lead, key, value)
     
-    db.commit()
-    db.refresh(db_lead)
+    await db.commit()
+    invalidate_counts(Lead.__table__)
+    await db.refresh(db_lead)
     return db_lead
 
-def delete_lead(db: Session, lead_id: int) -> bool:
-    db_lead = get_lead(db, lead_id)
+async def delete_lead(db: AsyncSession, lead_id: int) -> bool:
+    # The cascade deletes appointments and sales, which must be loaded up front (no lazy loads under asyncio)
+    db_lead = await db.scalar(
+        select(Lead).where(Lead.id == lead_id).options(selectinload(Lead.appointments), selectinload(Lead.sales))
+    )
     if not db_lead:
         return False
         
-    db.delete(db_lead)
-    db.commit()
+    await db.delete(db_lead)
+    await db.commit()
+    invalidate_counts(Lead.__table__)
     return True
 
 # Additional utility functions
 
-def get_leads_count(
-    db: Session,
+async def get_leads_count(
+    db: AsyncSession,
     unit: Optional[str] = None,
     status: Optional[str] = None,
     source: Optional[str] = None
 ) -> int:
-    query = db.query(func.count(Lead.id))
+    query = select(func.count(Lead.id))
     
     if unit:
-        query = query.filter(Lead.unit == unit)
+        query = query.where(Lead.unit == unit)
     if status:
-        query = query.filter(Lead.status == status)
+        query = query.where(Lead.status == status)
     if source:
-        query = query.filter(Lead.source == source)
+        query = query.where(Lead.source == source)
         
-    return query.scalar()
+    return await db.scalar(query)
 
-def get_leads_by_source(db: Session) -> List[dict]:
-    return db.query(
+async def get_leads_by_source(db: AsyncSession) -> List[dict]:
+    return (await db.execute(select(
         Lead.source,
         func.count(Lead.id).label('count')
-    ).group_by(Lead.source).all()
+    ).group_by(Lead.source))).mappings().all()
 
-def get_leads_by_status(db: Session) -> List[dict]:
-    return db.query(
+async def get_leads_by_status(db: AsyncSession) -> List[dict]:
+    return (await db.execute(select(
         Lead.status,
         func.count(Lead.id).label('count')
-    ).group_by(Lead.status).all()
\ No newline at end of file
+    ).group_by(Lead.status))).mappings().all()
@@ -1,88 +1,97 @@
-from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import func, select
 from typing import List, Optional
 from datetime import datetime
 
 from ..models.mkt_lead import MktLead
 from ..schemas.mkt_lead import MktLeadCreate, MktLeadUpdate
+from .counts import invalidate_counts
+from .pagination import apply_page
 
-def get_mkt_lead(db: Session, lead_id: int) -> Optional[MktLead]:
-    return db.query(MktLead).filter(MktLead.lead_id == lead_id).first()
+# Sort key of the list pages (see pagination.py)
+MKT_LEAD_ORDER = (MktLead.lead_id,)
 
-def get_mkt_leads(
-    db: Session, 
+async def get_mkt_lead(db: AsyncSession, lead_id: int) -> Optional[MktLead]:
+    return await db.scalar(select(MktLead).where(MktLead.lead_id == lead_id))
+
+async def get_mkt_leads(
+    db: AsyncSession, 
     skip: int = 0, 
     limit: int = 100,
     unit: Optional[str] = None,
     status: Optional[str] = None,
-    source: Optional[str] = None
+    source: Optional[str] = None,
+    after: Optional[str] = None
 ) -> List[MktLead]:
-    query = db.query(MktLead)
+    query = select(MktLead)
     
     if unit:
-        query = query.filter(MktLead.unit == unit)
+        query = query.where(MktLead.unit == unit)
     if status:
-        query = query.filter(MktLead.status == status)
+        query = query.where(MktLead.status == status)
     if source:
-        query = query.filter(MktLead.source == source)
+        query = query.where(MktLead.source == source)
         
-    return query.offset(skip).limit(limit).all()
+    return (await db.scalars(apply_page(query, MKT_LEAD_ORDER, skip=skip, limit=limit, after=after))).all()
 
-def create_mkt_lead(db: Session, mkt_lead: MktLeadCreate) -> MktLead:
+async def create_mkt_lead(db: AsyncSession, mkt_lead: MktLeadCreate) -> MktLead:
     db_mkt_lead = MktLead(**mkt_lead.dict())
     db.add(db_mkt_lead)
-    db.commit()
-    db.refresh(db_mkt_lead)
+    await db.commit()
+    invalidate_counts(MktLead.__table__)
+    await db.refresh(db_mkt_lead)
     return db_mkt_lead
 
-def update_mkt_lead(db: Session, lead_id: int, mkt_lead: MktLeadUpdate) -> Optional[MktLead]:
-    db_mkt_lead = get_mkt_lead(db, lead_id)
+async def update_mkt_lead(db: AsyncSession, lead_id: int, mkt_lead: MktLeadUpdate) -> Optional[MktLead]:
+    db_mkt_lead = await get_mkt_lead(db, lead_id)
     if not db_mkt_lead:
         return None
         
     for key, value in mkt_lead.dict(exclude_unset=True).items():
         setattr(db_mkt_lead, key, value)
     
-    db.commit()
-    db.refresh(db_mkt_lead)
+    await db.commit()
+    invalidate_counts(MktLead.__table__)
+    await db.refresh(db_mkt_lead)
     return db_mkt_lead
 
-def delete_mkt_lead(db: Session, lead_id: int) -> bool:
-    db_mkt_lead = get_mkt_lead(db, lead_id)
+async def delete_mkt_lead(db: AsyncSession, lead_id: int) -> bool:
+    db_mkt_lead = await get_mkt_lead(db, lead_id)
     if not db_mkt_lead:
         return False
         
-    db.delete(db_mkt_lead)
-    db.commit()
+    await db.delete(db_mkt_lead)
+    await db.commit()
+    invalidate_counts(MktLead.__table__)
     return True
 
 # Additional utility functions
 
-def get_mkt_leads_count(
-    db: Session,
+async def get_mkt_leads_count(
+    db: AsyncSession,
     unit: Optional[str] = None,
     status: Optional[str] = None,
     source: Optional[str] = None
 ) -> int:
-    query = db.query(func.count(MktLead.lead_id))
+    query = select(func.count(MktLead.lead_id))
     
     if unit:
-        query = query.filter(MktLead.unit == unit)
+        query = query.where(MktLead.unit == unit)
     if status:
-        query = query.filter(MktLead.status == status)
+        query = query.where(MktLead.status == status)
     if source:
-        query = query.filter(MktLead.source == source)
+        query = query.where(MktLead.source == source)
         
-    return query.scalar()
+    return await db.scalar(query)
 
-def get_mkt_leads_by_source(db: Session) -> List[dict]:
-    return db.query(
+async def get_mkt_leads_by_source(db: AsyncSession) -> List[dict]:
+    return (await db.execute(select(
         MktLead.source,
         func.count(MktLead.lead_id).label('count')
-    ).group_by(MktLead.source).all()
+    ).group_by(MktLead.source))).mappings().all()
 
-def get_mkt_leads_by_status(db: Session) -> List[dict]:
-    return db.query(
+async def get_mkt_leads_by_status(db: AsyncSession) -> List[dict]:
+    return (await db.execute(select(
         MktLead.status,
         func.count(MktLead.lead_id).label('count')
-    ).group_by(MktLead.status).all()
\ No newline at end of file
+    ).group_by(MktLead.status))).mappings().all()
@@ -0,0 +1,54 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, Optional, Sequence, Tuple
+
+from sqlalchemy import tuple_
+
+# Keyset (cursor) pagination: a page starts right after the sort key of the last row of the
+# previous page, so the database seeks through the index instead of scanning `skip` rows.
+# The cursor is opaque to clients: url-safe base64 of the JSON sort key.
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    payload = json.dumps([value.isoformat() if isinstance(value, datetime) else value for value in values])
+    return base64.urlsafe_b64encode(payload.encode()).decode()
+
+def decode_cursor(cursor: str, order_by: Sequence[Any]) -> Tuple[Any, ...]:
+    """Sort key stored in `cursor`, typed like the `order_by` columns. Raises ValueError when malformed."""
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+    if not isinstance(values, list) or len(values) != len(order_by):
+        raise ValueError(f"Invalid cursor: {cursor}")
+
+    decoded = []
+    for column, value in zip(order_by, values):
+        python_type = column.type.python_type
+        try:
+            decoded.append(datetime.fromisoformat(value) if python_type is datetime else python_type(value))
+        except (ValueError, TypeError) as e:
+            raise ValueError(f"Invalid cursor: {cursor}") from e
+    return tuple(decoded)
+
+def apply_page(query, order_by: Sequence[Any], skip: int = 0, limit: int = 100, after: Optional[str] = None):
+    """
+    Order `query` by the `order_by` columns and restrict it to one page: after the `after`
+    cursor when given, then `skip`/`limit` (offset paging stays available for compatibility).
+    """
+    if after:
+        query = query.where(tuple_(*order_by) > tuple_(*decode_cursor(after, order_by)))
+    query = query.order_by(*order_by)
+    if skip:
+        query = query.offset(skip)
+    return query.limit(limit)
+
+def next_cursor(items: Sequence[Any], limit: int, order_by: Sequence[Any]) -> Tuple[Sequence[Any], Optional[str]]:
+    """
+    Split the `limit + 1` rows fetched for a page into the page itself and the cursor
+    of the next one (None on the last page).
+    """
+    if len(items) <= limit:
+        return items, None
+    page = items[:limit]
+    return page, encode_cursor([getattr(page[-1], column.key) for column in order_by])
@@ -1,17 +1,22 @@
-from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import func, select
 from typing import List, Optional
 from datetime import datetime, date
 from decimal import Decimal
 
 from ..models.sale import Sale
 from ..schemas.sale import SaleCreate, SaleUpdate
+from .counts import invalidate_counts
+from .pagination import apply_page
 
-def get_sale(db: Session, sale_id: int) -> Optional[Sale]:
-    return db.query(Sale).filter(Sale.id == sale_id).first()
+# Sort key of the list pages (see pagination.py)
+SALE_ORDER = (Sale.date, Sale.id)
 
-def get_sales(
-    db: Session,
+async def get_sale(db: AsyncSession, sale_id: int) -> Optional[Sale]:
+    return await db.scalar(select(Sale).where(Sale.id == sale_id))
+
+async def get_sales(
+    db: AsyncSession,
     skip: int = 0,
     limit: int = 100,
     lead_id: Optional[int] = None,
@@ -19,109 +24,113 @@ def get_sales(
     status: Optional[str] = None,
     seller: Optional[str] = None,
     date_from: Optional[date] = None,
-    date_to: Optional[date] = None
+    date_to: Optional[date] = None,
+    after: Optional[str] = None
 ) -> List[Sale]:
-    query = db.query(Sale)
+    query = select(Sale)
     
     if lead_id:
-        query = query.filter(Sale.lead_id == lead_id)
+        query = query.where(Sale.lead_id == lead_id)
     if unit:
-        query = query.filter(Sale.unit == unit)
+        query = query.where(Sale.unit == unit)
     if status:
-        query = query.filter(Sale.status == status)
+        query = query.where(Sale.status == status)
     if seller:
-        query = query.filter(Sale.seller == seller)
+        query = query.where(Sale.seller == seller)
     if date_from:
-        query = query.filter(Sale.date >= date_from)
+        query = query.where(Sale.date >= date_from)
     if date_to:
-        query = query.filter(Sale.date <= date_to)
+        query = query.where(Sale.date <= date_to)
         
-    return query.offset(skip).limit(limit).all()
+    return (await db.scalars(apply_page(query, SALE_ORDER, skip=skip, limit=limit, after=after))).all()
 
-def create_sale(db: Session, sale: SaleCreate) -> Sale:
+async def create_sale(db: AsyncSession, sale: SaleCreate) -> Sale:
     db_sale = Sale(**sale.dict())
     db.add(db_sale)
-    db.commit()
-    db.refresh(db_sale)
+    await db.commit()
+    invalidate_counts(Sale.__table__)
+    await db.refresh(db_sale)
     return db_sale
 
-def update_sale(db: Session, sale_id: int, sale: SaleUpdate) -> Optional[Sale]:
-    db_sale = get_sale(db, sale_id)
+async def update_sale(db: AsyncSession, sale_id: int, sale: SaleUpdate) -> Optional[Sale]:
+    db_sale = await get_sale(db, sale_id)
     if not db_sale:
         return None
         
     for key, value in sale.dict(exclude_unset=True).items():
         setattr(db_sale, key, value)
     
-    db.commit()
-    db.refresh(db_sale)
+    await db.commit()
+    invalidate_counts(Sale.__table__)
+    await db.refresh(db_sale)
     return db_sale
 
-def delete_sale(db: Session, sale_id: int) -> bool:
-    db_sale = get_sale(db, sale_id)
+async def delete_sale(db: AsyncSession, sale_id: int) -> bool:
+    db_sale = await get_sale(db, sale_id)
     if not db_sale:
         return False
         
-    db.delete(db_sale)
-    db.commit()
+    await db.delete(db_sale)
+    await db.commit()
+    invalidate_counts(Sale.__table__)
     return True
 
 # Additional utility functions
 
-def get_sales_count(
-    db: Session,
+async def get_sales_count(
+    db: AsyncSession,
     unit: Optional[str] = None,
     status: Optional[str] = None,
     seller: Optional[str] = None,
     date_from: Optional[date] = None,
     date_to: Optional[date] = None
 ) -> int:
-    query = db.query(func.count(Sale.id))
+    query = select(func.count(Sale.id))
     
     if unit:
-        query = query.filter(Sale.unit == unit)
+        query = query.where(Sale.unit == unit)
     if status:
-        query = query.filter(Sale.status == status)
+        query = query.where(Sale.status == status)
     if seller:
-        query = query.filter(Sale.seller == seller)
+        query = query.where(Sale.seller == seller)
     if date_from:
-        query = query.filter(Sale.date >= date_from)
+        query = query.where(Sale.date >= date_from)
     if date_to:
-        query = query.filter(Sale.date <= date_to)
+        query = query.where(Sale.date <= date_to)
         
-    return query.scalar()
+    return await db.scalar(query)
 
-def get_total_sales_value(
-    db: Session,
+async def get_total_sales_value(
+    db: AsyncSession,
     unit: Optional[str] = None,
     seller: Optional[str] = None,
     date_from: Optional[date] = None,
     date_to: Optional[date] = None
 ) -> Decimal:
-    query = db.query(func.sum(Sale.final_value))
+    query = select(func.sum(Sale.final_value))
     
     if unit:
-        query = query.filter(Sale.unit == unit)
+        query = query.where(Sale.unit == unit)
     if seller:
-        query = query.filter(Sale.seller == seller)
+        query = query.where(Sale.seller == seller)
     if date_from:
-        query = query.filter(Sale.date >= date_from)
+        query = query.where(Sale.date >= date_from)
     if date_to:
-        query = query.filter(Sale.date <= date_to)
+        query = query.where(Sale.date <= date_to)
         
-    return query.scalar() or Decimal('0.0')
+    return await db.scalar(query) or Decimal('0.0')
 
-def get_sales_by_unit(db: Session) -> List[dict]:
-    return db.query(
+async def get_sales_by_unit(db: AsyncSession) -> List[dict]:
+    return (await db.execute(select(
         Sale.unit,
         func.count(Sale.id).label('count'),
         func.sum(Sale.final_value).label('total_value')
-    ).group_by(Sale.unit).all()
+    ).group_by(Sale.unit))).mappings().all()
 
-def get_sales_by_seller(db: Session) -> List[dict]:
-    return db.query(
+async def get_sales_by_seller(db: AsyncSession) -> List[dict]:
+    return (await db.execute(select(
         Sale.seller,
         func.count(Sale.id).label('count'),
         func.sum(Sale.final_value).label('total_value'),
         func.sum(Sale.commission).label('total_commission')
-    ).group_by(Sale.seller).all()
\ No newline at end of file
+    ).group_by(Sale.seller))).mappings().all()
\ No newline at end of file
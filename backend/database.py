@@ -1,5 +1,6 @@
 import logging
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, inspect
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import declarative_base, sessionmaker
 from dotenv import load_dotenv
 import os
@@ -14,12 +15,17 @@ DEV_MODE = os.getenv("DEV_MODE", "True").lower() == "true"
 # Create Base class before engine setup
 Base = declarative_base()
 
+ALEMBIC_INI = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "alembic.ini")
+
 # Default to SQLite in development mode to avoid connection issues
 try:
     if DEV_MODE:
         # Use SQLite for development
         DATABASE_URL = "sqlite:///./database.db"
         engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
+        # Async engine for the FastAPI backend (aiosqlite)
+        ASYNC_DATABASE_URL = "sqlite+aiosqlite:///./database.db"
+        async_engine = create_async_engine(ASYNC_DATABASE_URL)
         logger.info("Connected to SQLite database")
     else:
         # Use Supabase PostgreSQL for production
@@ -31,7 +37,8 @@ try:
         
         # Use credentials directly from .env without modification
         # For Supabase, the DB_USER should already be in the format "postgres.project_ref"
-        DATABASE_URL = f"postgresql://{user}:{password}@{host}:{port}/{dbname}"
+        # psycopg2 explicitly: SQLAlchemy 2.1 defaults postgresql:// to psycopg 3, and copy_merge uses copy_expert
+        DATABASE_URL = f"postgresql+psycopg2://{user}:{password}@{host}:{port}/{dbname}"
         
         # Create engine with appropriate settings for Supabase
         engine = create_engine(
@@ -44,6 +51,20 @@ try:
             # Add connection health check
             pool_pre_ping=True
         )
+
+        # Async engine for the FastAPI backend (asyncpg)
+        ASYNC_DATABASE_URL = f"postgresql+asyncpg://{user}:{password}@{host}:{port}/{dbname}"
+        async_engine = create_async_engine(
+            ASYNC_DATABASE_URL,
+            connect_args={
+                "server_settings": {"statement_timeout": "0", "idle_in_transaction_session_timeout": "0"},
+                # Supabase's pooler runs in transaction mode, where prepared statements cannot be cached
+                "statement_cache_size": 0,
+            },
+            pool_size=20,
+            max_overflow=20,
+            pool_pre_ping=True
+        )
         
         logger.info(f"Connected to PostgreSQL database at {host}")
 except Exception as e:
@@ -53,6 +74,9 @@ except Exception as e:
 # Create SessionLocal class
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Create AsyncSessionLocal class; objects stay readable after commit, since lazy loads cannot run outside await
+AsyncSessionLocal = async_sessionmaker(bind=async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
 # Dependency to get DB session
 def get_db():
     db = SessionLocal()
@@ -61,6 +85,11 @@ def get_db():
     finally:
         db.close()
 
+# Dependency to get an async DB session (FastAPI endpoints)
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
 # Function to create all tables
 def create_tables():
     try:
@@ -75,4 +104,53 @@ def create_tables():
     except Exception as e:
         logger.error(f"Error creating database tables: {str(e)}")
         if not DEV_MODE:  # Only raise in production mode
-            raise
\ No newline at end of file
+            raise
+
+def unversioned_revision(connection):
+    """
+    Migration an unversioned database built by create_tables() already matches.
+
+    Returns None when the database is empty or already tracked by Alembic.
+    Tables created before migrations existed match 0001_initial; those created
+    since MktLead.match_fingerprint was added match 0002_match_fingerprint, and
+    those that also have the filter indexes match head.
+    """
+    inspector = inspect(connection)
+    tables = inspector.get_table_names()
+    if "alembic_version" in tables or "mkt_leads" not in tables:
+        return None
+    if "match_fingerprint" not in {column["name"] for column in inspector.get_columns("mkt_leads")}:
+        return "0001_initial"
+    existing = {index["name"] for table in tables for index in inspector.get_indexes(table)}
+    expected = {index.name for table in Base.metadata.tables.values() for index in table.indexes}
+    return "head" if expected <= existing else "0002_match_fingerprint"
+
+def migrate_database(connection=None):
+    """
+    Bring the database to the latest migration (alembic upgrade head), stamping
+    a database built by create_tables() at the revision it matches first.
+
+    Args:
+        connection: Connection to migrate instead of the configured engine
+    """
+    from alembic import command
+    from alembic.config import Config
+    from . import models  # noqa: F401 - registers the tables on Base.metadata
+
+    config = Config(ALEMBIC_INI)
+    config.attributes["configure_logger"] = False
+
+    def _migrate(connection):
+        config.attributes["connection"] = connection
+        revision = unversioned_revision(connection)
+        if revision is not None:
+            logger.info(f"Stamping unversioned database at {revision}")
+            command.stamp(config, revision)
+        command.upgrade(config, "head")
+
+    if connection is not None:
+        _migrate(connection)
+        return
+    with engine.begin() as connection:
+        _migrate(connection)
+    logger.info("Database migrated to head")
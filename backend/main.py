@@ -1,24 +1,40 @@
 from fastapi import FastAPI, Depends, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from contextlib import asynccontextmanager
 from typing import Optional, List
 from datetime import date
 
-from .database import engine, get_db, create_tables
+from .database import DEV_MODE, engine, get_async_db, migrate_database
 from .schemas.lead import Lead as LeadSchema, LeadCreate, LeadUpdate, LeadList
 from .schemas.appointment import Appointment as AppointmentSchema, AppointmentCreate, AppointmentUpdate, AppointmentList
 from .schemas.sale import Sale as SaleSchema, SaleCreate, SaleUpdate, SaleList
 from .schemas.mkt_lead import MktLead as MktLeadSchema, MktLeadCreate, MktLeadUpdate, MktLeadList
+from .models.lead import Lead as LeadModel
+from .models.appointment import Appointment as AppointmentModel
+from .models.sale import Sale as SaleModel
+from .models.mkt_lead import MktLead as MktLeadModel
 from .crud import lead as lead_crud
 from .crud import appointment as appointment_crud
 from .crud import sale as sale_crud
 from .crud import mkt_lead as mkt_lead_crud
+from .crud.counts import resolve_total
+from .crud.pagination import next_cursor
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # The schema is managed by Alembic (alembic upgrade head); the SQLite
+    # development database is migrated on startup so it stays versioned too
+    if DEV_MODE:
+        migrate_database()
+    yield
 
 # Create FastAPI app
 app = FastAPI(
     title="Dash Analytics API",
     description="API for managing leads, appointments, and sales data",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Configure CORS
@@ -30,140 +46,170 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Create database tables
-create_tables()
-
 # Mkt Lead endpoints
 @app.post("/mkt-leads/", response_model=MktLeadSchema, tags=["Mkt Leads"])
-def create_mkt_lead(mkt_lead: MktLeadCreate, db: Session = Depends(get_db)):
+async def create_mkt_lead(mkt_lead: MktLeadCreate, db: AsyncSession = Depends(get_async_db)):
     """Create a new mkt lead"""
-    return mkt_lead_crud.create_mkt_lead(db=db, mkt_lead=mkt_lead)
+    return await mkt_lead_crud.create_mkt_lead(db=db, mkt_lead=mkt_lead)
 
 @app.get("/mkt-leads/", response_model=MktLeadList, tags=["Mkt Leads"])
-def read_mkt_leads(
+async def read_mkt_leads(
     skip: int = 0,
     limit: int = 100,
+    after: Optional[str] = Query(None, description="next_cursor of the previous page (keyset pagination)"),
+    include_total: bool = Query(True, description="false skips counting the matching rows"),
+    estimate_total: bool = Query(False, description="unfiltered totals from the database statistics"),
     unit: Optional[str] = None,
     status: Optional[str] = None,
     source: Optional[str] = None,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get all mkt leads with optional filtering"""
-    mkt_leads = mkt_lead_crud.get_mkt_leads(db, skip=skip, limit=limit, unit=unit, status=status, source=source)
-    total = mkt_lead_crud.get_mkt_leads_count(db, unit=unit, status=status, source=source)
-    return {"total": total, "mkt_leads": mkt_leads}
+    try:
+        mkt_leads = await mkt_lead_crud.get_mkt_leads(
+            db, skip=skip, limit=limit + 1, after=after, unit=unit, status=status, source=source
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    mkt_leads, cursor = next_cursor(mkt_leads, limit, mkt_lead_crud.MKT_LEAD_ORDER)
+    filters = {"unit": unit, "status": status, "source": source}
+    total, estimated = await resolve_total(
+        db, MktLeadModel.__table__, filters, lambda: mkt_lead_crud.get_mkt_leads_count(db, **filters),
+        include_total=include_total, estimate=estimate_total
+    )
+    return {"total": total, "total_estimated": estimated, "mkt_leads": mkt_leads, "next_cursor": cursor}
 
 @app.get("/mkt-leads/{mkt_lead_id}", response_model=MktLeadSchema, tags=["Mkt Leads"])
-def read_mkt_lead(mkt_lead_id: int, db: Session = Depends(get_db)):
+async def read_mkt_lead(mkt_lead_id: int, db: AsyncSession = Depends(get_async_db)):
     """Get a specific mkt lead by ID"""
-    db_mkt_lead = mkt_lead_crud.get_mkt_lead(db, mkt_lead_id=mkt_lead_id)
+    db_mkt_lead = await mkt_lead_crud.get_mkt_lead(db, lead_id=mkt_lead_id)
     if db_mkt_lead is None:
         raise HTTPException(status_code=404, detail="Mkt lead not found")
     return db_mkt_lead
 
 @app.put("/mkt-leads/{mkt_lead_id}", response_model=MktLeadSchema, tags=["Mkt Leads"])
-def update_mkt_lead(mkt_lead_id: int, mkt_lead: MktLeadUpdate, db: Session = Depends(get_db)):
+async def update_mkt_lead(mkt_lead_id: int, mkt_lead: MktLeadUpdate, db: AsyncSession = Depends(get_async_db)):
     """Update a mkt lead"""
-    db_mkt_lead = mkt_lead_crud.update_mkt_lead(db, mkt_lead_id=mkt_lead_id, mkt_lead=mkt_lead)
+    db_mkt_lead = await mkt_lead_crud.update_mkt_lead(db, lead_id=mkt_lead_id, mkt_lead=mkt_lead)
     if db_mkt_lead is None:
         raise HTTPException(status_code=404, detail="Mkt lead not found")
     return db_mkt_lead
 
 @app.delete("/mkt-leads/{mkt_lead_id}", tags=["Mkt Leads"])
-def delete_mkt_lead(mkt_lead_id: int, db: Session = Depends(get_db)):
+async def delete_mkt_lead(mkt_lead_id: int, db: AsyncSession = Depends(get_async_db)):
     """Delete a mkt lead"""
-    success = mkt_lead_crud.delete_mkt_lead(db, mkt_lead_id=mkt_lead_id)
+    success = await mkt_lead_crud.delete_mkt_lead(db, lead_id=mkt_lead_id)
     if not success:
         raise HTTPException(status_code=404, detail="Mkt lead not found")
     return {"detail": "Mkt lead deleted successfully"}
 
 # Lead endpoints
 @app.post("/leads/", response_model=LeadSchema, tags=["Leads"])
-def create_lead(lead: LeadCreate, db: Session = Depends(get_db)):
+async def create_lead(lead: LeadCreate, db: AsyncSession = Depends(get_async_db)):
     """Create a new lead"""
-    return lead_crud.create_lead(db=db, lead=lead)
+    return await lead_crud.create_lead(db=db, lead=lead)
 
 @app.get("/leads/", response_model=LeadList, tags=["Leads"])
-def read_leads(
+async def read_leads(
     skip: int = 0,
     limit: int = 100,
+    after: Optional[str] = Query(None, description="next_cursor of the previous page (keyset pagination)"),
+    include_total: bool = Query(True, description="false skips counting the matching rows"),
+    estimate_total: bool = Query(False, description="unfiltered totals from the database statistics"),
     unit: Optional[str] = None,
     status: Optional[str] = None,
     source: Optional[str] = None,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get all leads with optional filtering"""
-    leads = lead_crud.get_leads(db, skip=skip, limit=limit, unit=unit, status=status, source=source)
-    total = lead_crud.get_leads_count(db, unit=unit, status=status, source=source)
-    return {"total": total, "leads": leads}
+    try:
+        leads = await lead_crud.get_leads(db, skip=skip, limit=limit + 1, after=after, unit=unit, status=status, source=source)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    leads, cursor = next_cursor(leads, limit, lead_crud.LEAD_ORDER)
+    filters = {"unit": unit, "status": status, "source": source}
+    total, estimated = await resolve_total(
+        db, LeadModel.__table__, filters, lambda: lead_crud.get_leads_count(db, **filters),
+        include_total=include_total, estimate=estimate_total
+    )
+    return {"total": total, "total_estimated": estimated, "leads": leads, "next_cursor": cursor}
 
 @app.get("/leads/{lead_id}", response_model=LeadSchema, tags=["Leads"])
-def read_lead(lead_id: int, db: Session = Depends(get_db)):
+async def read_lead(lead_id: int, db: AsyncSession = Depends(get_async_db)):
     """Get a specific lead by ID"""
-    db_lead = lead_crud.get_lead(db, lead_id=lead_id)
+    db_lead = await lead_crud.get_lead(db, lead_id=lead_id)
     if db_lead is None:
         raise HTTPException(status_code=404, detail="Lead not found")
     return db_lead
 
 @app.put("/leads/{lead_id}", response_model=LeadSchema, tags=["Leads"])
-def update_lead(lead_id: int, lead: LeadUpdate, db: Session = Depends(get_db)):
+async def update_lead(lead_id: int, lead: LeadUpdate, db: AsyncSession = Depends(get_async_db)):
     """Update a lead"""
-    db_lead = lead_crud.update_lead(db, lead_id=lead_id, lead=lead)
+    db_lead = await lead_crud.update_lead(db, lead_id=lead_id, lead=lead)
     if db_lead is None:
         raise HTTPException(status_code=404, detail="Lead not found")
     return db_lead
 
 @app.delete("/leads/{lead_id}", tags=["Leads"])
-def delete_lead(lead_id: int, db: Session = Depends(get_db)):
+async def delete_lead(lead_id: int, db: AsyncSession = Depends(get_async_db)):
     """Delete a lead"""
-    success = lead_crud.delete_lead(db, lead_id=lead_id)
+    success = await lead_crud.delete_lead(db, lead_id=lead_id)
     if not success:
         raise HTTPException(status_code=404, detail="Lead not found")
     return {"detail": "Lead deleted successfully"}
 
 # Appointment endpoints
 @app.post("/appointments/", response_model=AppointmentSchema, tags=["Appointments"])
-def create_appointment(appointment: AppointmentCreate, db: Session = Depends(get_db)):
+async def create_appointment(appointment: AppointmentCreate, db: AsyncSession = Depends(get_async_db)):
     """Create a new appointment"""
-    return appointment_crud.create_appointment(db=db, appointment=appointment)
+    return await appointment_crud.create_appointment(db=db, appointment=appointment)
 
 @app.get("/appointments/", response_model=AppointmentList, tags=["Appointments"])
-def read_appointments(
+async def read_appointments(
     skip: int = 0,
     limit: int = 100,
+    after: Optional[str] = Query(None, description="next_cursor of the previous page (keyset pagination)"),
+    include_total: bool = Query(True, description="false skips counting the matching rows"),
+    estimate_total: bool = Query(False, description="unfiltered totals from the database statistics"),
     lead_id: Optional[int] = None,
     unit: Optional[str] = None,
     status: Optional[str] = None,
     date_from: Optional[date] = None,
     date_to: Optional[date] = None,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get all appointments with optional filtering"""
-    appointments = appointment_crud.get_appointments(
-        db, skip=skip, limit=limit, lead_id=lead_id,
-        unit=unit, status=status, date_from=date_from, date_to=date_to
-    )
-    total = appointment_crud.get_appointments_count(
-        db, unit=unit, status=status, date_from=date_from, date_to=date_to
+    try:
+        appointments = await appointment_crud.get_appointments(
+            db, skip=skip, limit=limit + 1, after=after, lead_id=lead_id,
+            unit=unit, status=status, date_from=date_from, date_to=date_to
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    appointments, cursor = next_cursor(appointments, limit, appointment_crud.APPOINTMENT_ORDER)
+    filters = {"unit": unit, "status": status, "date_from": date_from, "date_to": date_to}
+    total, estimated = await resolve_total(
+        db, AppointmentModel.__table__, filters, lambda: appointment_crud.get_appointments_count(db, **filters),
+        include_total=include_total, estimate=estimate_total
     )
-    return {"total": total, "appointments": appointments}
+    return {"total": total, "total_estimated": estimated, "appointments": appointments, "next_cursor": cursor}
 
 @app.get("/appointments/{appointment_id}", response_model=AppointmentSchema, tags=["Appointments"])
-def read_appointment(appointment_id: int, db: Session = Depends(get_db)):
+async def read_appointment(appointment_id: int, db: AsyncSession = Depends(get_async_db)):
     """Get a specific appointment by ID"""
-    db_appointment = appointment_crud.get_appointment(db, appointment_id=appointment_id)
+    db_appointment = await appointment_crud.get_appointment(db, appointment_id=appointment_id)
     if db_appointment is None:
         raise HTTPException(status_code=404, detail="Appointment not found")
     return db_appointment
 
 @app.put("/appointments/{appointment_id}", response_model=AppointmentSchema, tags=["Appointments"])
-def update_appointment(
+async def update_appointment(
     appointment_id: int,
     appointment: AppointmentUpdate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update an appointment"""
-    db_appointment = appointment_crud.update_appointment(
+    db_appointment = await appointment_crud.update_appointment(
         db, appointment_id=appointment_id, appointment=appointment
     )
     if db_appointment is None:
@@ -171,89 +217,97 @@ def update_appointment(
     return db_appointment
 
 @app.delete("/appointments/{appointment_id}", tags=["Appointments"])
-def delete_appointment(appointment_id: int, db: Session = Depends(get_db)):
+async def delete_appointment(appointment_id: int, db: AsyncSession = Depends(get_async_db)):
     """Delete an appointment"""
-    success = appointment_crud.delete_appointment(db, appointment_id=appointment_id)
+    success = await appointment_crud.delete_appointment(db, appointment_id=appointment_id)
     if not success:
         raise HTTPException(status_code=404, detail="Appointment not found")
     return {"detail": "Appointment deleted successfully"}
 
 # Sale endpoints
 @app.post("/sales/", response_model=SaleSchema, tags=["Sales"])
-def create_sale(sale: SaleCreate, db: Session = Depends(get_db)):
+async def create_sale(sale: SaleCreate, db: AsyncSession = Depends(get_async_db)):
     """Create a new sale"""
-    return sale_crud.create_sale(db=db, sale=sale)
+    return await sale_crud.create_sale(db=db, sale=sale)
 
 @app.get("/sales/", response_model=SaleList, tags=["Sales"])
-def read_sales(
+async def read_sales(
     skip: int = 0,
     limit: int = 100,
+    after: Optional[str] = Query(None, description="next_cursor of the previous page (keyset pagination)"),
+    include_total: bool = Query(True, description="false skips counting the matching rows"),
+    estimate_total: bool = Query(False, description="unfiltered totals from the database statistics"),
     lead_id: Optional[int] = None,
     unit: Optional[str] = None,
     status: Optional[str] = None,
     seller: Optional[str] = None,
     date_from: Optional[date] = None,
     date_to: Optional[date] = None,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get all sales with optional filtering"""
-    sales = sale_crud.get_sales(
-        db, skip=skip, limit=limit, lead_id=lead_id,
-        unit=unit, status=status, seller=seller,
-        date_from=date_from, date_to=date_to
-    )
-    total = sale_crud.get_sales_count(
-        db, unit=unit, status=status, seller=seller,
-        date_from=date_from, date_to=date_to
+    try:
+        sales = await sale_crud.get_sales(
+            db, skip=skip, limit=limit + 1, after=after, lead_id=lead_id,
+            unit=unit, status=status, seller=seller,
+            date_from=date_from, date_to=date_to
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    sales, cursor = next_cursor(sales, limit, sale_crud.SALE_ORDER)
+    filters = {"unit": unit, "status": status, "seller": seller, "date_from": date_from, "date_to": date_to}
+    total, estimated = await resolve_total(
+        db, SaleModel.__table__, filters, lambda: sale_crud.get_sales_count(db, **filters),
+        include_total=include_total, estimate=estimate_total
     )
-    return {"total": total, "sales": sales}
+    return {"total": total, "total_estimated": estimated, "sales": sales, "next_cursor": cursor}
 
 @app.get("/sales/{sale_id}", response_model=SaleSchema, tags=["Sales"])
-def read_sale(sale_id: int, db: Session = Depends(get_db)):
+async def read_sale(sale_id: int, db: AsyncSession = Depends(get_async_db)):
     """Get a specific sale by ID"""
-    db_sale = sale_crud.get_sale(db, sale_id=sale_id)
+    db_sale = await sale_crud.get_sale(db, sale_id=sale_id)
     if db_sale is None:
         raise HTTPException(status_code=404, detail="Sale not found")
     return db_sale
 
 @app.put("/sales/{sale_id}", response_model=SaleSchema, tags=["Sales"])
-def update_sale(sale_id: int, sale: SaleUpdate, db: Session = Depends(get_db)):
+async def update_sale(sale_id: int, sale: SaleUpdate, db: AsyncSession = Depends(get_async_db)):
     """Update a sale"""
-    db_sale = sale_crud.update_sale(db, sale_id=sale_id, sale=sale)
+    db_sale = await sale_crud.update_sale(db, sale_id=sale_id, sale=sale)
     if db_sale is None:
         raise HTTPException(status_code=404, detail="Sale not found")
     return db_sale
 
 @app.delete("/sales/{sale_id}", tags=["Sales"])
-def delete_sale(sale_id: int, db: Session = Depends(get_db)):
+async def delete_sale(sale_id: int, db: AsyncSession = Depends(get_async_db)):
     """Delete a sale"""
-    success = sale_crud.delete_sale(db, sale_id=sale_id)
+    success = await sale_crud.delete_sale(db, sale_id=sale_id)
     if not success:
         raise HTTPException(status_code=404, detail="Sale not found")
     return {"detail": "Sale deleted successfully"}
 
 # Analytics endpoints
 @app.get("/analytics/leads/by-source", tags=["Analytics"])
-def get_leads_by_source(db: Session = Depends(get_db)):
+async def get_leads_by_source(db: AsyncSession = Depends(get_async_db)):
     """Get lead count grouped by source"""
-    return lead_crud.get_leads_by_source(db)
+    return await lead_crud.get_leads_by_source(db)
 
 @app.get("/analytics/leads/by-status", tags=["Analytics"])
-def get_leads_by_status(db: Session = Depends(get_db)):
+async def get_leads_by_status(db: AsyncSession = Depends(get_async_db)):
     """Get lead count grouped by status"""
-    return lead_crud.get_leads_by_status(db)
+    return await lead_crud.get_leads_by_status(db)
 
 @app.get("/analytics/appointments/by-unit", tags=["Analytics"])
-def get_appointments_by_unit(db: Session = Depends(get_db)):
+async def get_appointments_by_unit(db: AsyncSession = Depends(get_async_db)):
     """Get appointment count grouped by unit"""
-    return appointment_crud.get_appointments_by_unit(db)
+    return await appointment_crud.get_appointments_by_unit(db)
 
 @app.get("/analytics/sales/by-unit", tags=["Analytics"])
-def get_sales_by_unit(db: Session = Depends(get_db)):
+async def get_sales_by_unit(db: AsyncSession = Depends(get_async_db)):
     """Get sales statistics grouped by unit"""
-    return sale_crud.get_sales_by_unit(db)
+    return await sale_crud.get_sales_by_unit(db)
 
 @app.get("/analytics/sales/by-seller", tags=["Analytics"])
-def get_sales_by_seller(db: Session = Depends(get_db)):
+async def get_sales_by_seller(db: AsyncSession = Depends(get_async_db)):
     """Get sales statistics grouped by seller"""
-    return sale_crud.get_sales_by_seller(db)
\ No newline at end of file
+    return await sale_crud.get_sales_by_seller(db)
\ No newline at end of file
@@ -0,0 +1,149 @@
+"""Tables as created by create_tables() before migrations existed
+
+Revision ID: 0001_initial
+Revises:
+Create Date: 2026-10-19 09:00:00
+
+Only databases created by create_tables() before MktLead.match_fingerprint
+existed are at this revision; newer ones are at 0002_match_fingerprint, or at
+head when they also have the filter indexes (see alembic.ini). Stamp the
+matching revision once, then run `alembic upgrade head`.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0001_initial'
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'leads',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(length=100), nullable=True),
+        sa.Column('email', sa.String(length=100), nullable=True),
+        sa.Column('phone', sa.String(length=20), nullable=True),
+        sa.Column('message', sa.Text(), nullable=True),
+        sa.Column('region', sa.String(length=50), nullable=True),
+        sa.Column('unit', sa.String(length=50), nullable=True),
+        sa.Column('source', sa.String(length=100), nullable=True),
+        sa.Column('entry_day', sa.Integer(), nullable=True),
+        sa.Column('status', sa.String(length=50), nullable=True),
+        sa.Column('procedure_group', sa.String(length=100), nullable=True),
+        sa.Column('appointment_count', sa.Integer(), nullable=True),
+        sa.Column('gclid', sa.String(length=100), nullable=True),
+        sa.Column('utm_source', sa.String(length=100), nullable=True),
+        sa.Column('utm_medium', sa.String(length=100), nullable=True),
+        sa.Column('utm_term', sa.String(length=100), nullable=True),
+        sa.Column('utm_content', sa.String(length=100), nullable=True),
+        sa.Column('utm_campaign', sa.String(length=100), nullable=True),
+        sa.Column('referral_site', sa.String(length=200), nullable=True),
+        sa.Column('search_term', sa.String(length=200), nullable=True),
+        sa.Column('device', sa.String(length=50), nullable=True),
+        sa.Column('page_name', sa.String(length=200), nullable=True),
+        sa.Column('last_attendant', sa.String(length=100), nullable=True),
+        sa.Column('last_appointment', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_leads_id', 'leads', ['id'])
+
+    op.create_table(
+        'appointments',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('lead_id', sa.Integer(), nullable=False),
+        sa.Column('date', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('status', sa.String(length=50), nullable=False),
+        sa.Column('unit', sa.String(length=50), nullable=False),
+        sa.Column('procedure', sa.String(length=100), nullable=True),
+        sa.Column('value', sa.Numeric(precision=10, scale=2), nullable=True),
+        sa.Column('payment_method', sa.String(length=50), nullable=True),
+        sa.Column('notes', sa.Text(), nullable=True),
+        sa.Column('attendant', sa.String(length=100), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['lead_id'], ['leads.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_appointments_id', 'appointments', ['id'])
+
+    op.create_table(
+        'sales',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('lead_id', sa.Integer(), nullable=False),
+        sa.Column('appointment_id', sa.Integer(), nullable=True),
+        sa.Column('date', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('procedure', sa.String(length=100), nullable=False),
+        sa.Column('unit', sa.String(length=50), nullable=False),
+        sa.Column('total_value', sa.Numeric(precision=10, scale=2), nullable=False),
+        sa.Column('discount', sa.Numeric(precision=10, scale=2), nullable=True),
+        sa.Column('final_value', sa.Numeric(precision=10, scale=2), nullable=False),
+        sa.Column('payment_method', sa.String(length=50), nullable=False),
+        sa.Column('installments', sa.Integer(), nullable=True),
+        sa.Column('is_confirmed', sa.Boolean(), nullable=True),
+        sa.Column('status', sa.String(length=50), nullable=False),
+        sa.Column('seller', sa.String(length=100), nullable=False),
+        sa.Column('commission', sa.Numeric(precision=10, scale=2), nullable=True),
+        sa.Column('notes', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['appointment_id'], ['appointments.id']),
+        sa.ForeignKeyConstraint(['lead_id'], ['leads.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_sales_id', 'sales', ['id'])
+
+    op.create_table(
+        'mkt_leads',
+        sa.Column('lead_id', sa.Integer(), nullable=False),
+        sa.Column('lead_email', sa.String(length=100), nullable=True),
+        sa.Column('lead_phone', sa.String(length=20), nullable=True),
+        sa.Column('lead_message', sa.Text(), nullable=True),
+        sa.Column('lead_store', sa.String(length=50), nullable=True),
+        sa.Column('lead_source', sa.String(length=100), nullable=True),
+        sa.Column('lead_entry_day', sa.Integer(), nullable=True),
+        sa.Column('lead_mkt_source', sa.String(length=100), nullable=True),
+        sa.Column('lead_mkt_medium', sa.String(length=100), nullable=True),
+        sa.Column('lead_mkt_term', sa.String(length=100), nullable=True),
+        sa.Column('lead_mkt_content', sa.String(length=100), nullable=True),
+        sa.Column('lead_mkt_campaign', sa.String(length=100), nullable=True),
+        sa.Column('lead_month', sa.String(length=100), nullable=True),
+        sa.Column('lead_category', sa.String(length=100), nullable=True),
+        sa.Column('appointment_date', sa.DateTime(), nullable=True),
+        sa.Column('appointment_procedure', sa.String(length=100), nullable=True),
+        sa.Column('appointment_status', sa.String(length=100), nullable=True),
+        sa.Column('appointment_store', sa.String(length=50), nullable=True),
+        sa.Column('sale_cleaned_phone', sa.String(length=20), nullable=True),
+        sa.Column('sales_phone', sa.String(length=20), nullable=True),
+        sa.Column('sales_quote_id', sa.String(length=20), nullable=True),
+        sa.Column('sales_date', sa.DateTime(), nullable=True),
+        sa.Column('sales_store', sa.String(length=50), nullable=True),
+        sa.Column('sales_first_quote', sa.String(length=20), nullable=True),
+        sa.Column('sales_total_bought', sa.String(length=20), nullable=True),
+        sa.Column('sales_number_of_quotes', sa.String(length=20), nullable=True),
+        sa.Column('sales_day', sa.Integer(), nullable=True),
+        sa.Column('sales_month', sa.String(length=100), nullable=True),
+        sa.Column('sales_day_of_week', sa.String(length=100), nullable=True),
+        sa.Column('sales_purchased', sa.Boolean(), nullable=True),
+        sa.Column('sales_interval', sa.Integer(), nullable=True),
+        sa.PrimaryKeyConstraint('lead_id'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('mkt_leads')
+    op.drop_index('ix_sales_id', table_name='sales')
+    op.drop_table('sales')
+    op.drop_index('ix_appointments_id', table_name='appointments')
+    op.drop_table('appointments')
+    op.drop_index('ix_leads_id', table_name='leads')
+    op.drop_table('leads')
@@ -0,0 +1,30 @@
+"""Add mkt_leads.match_fingerprint for the incremental marketing funnel
+
+Revision ID: 0002_match_fingerprint
+Revises: 0001_initial
+Create Date: 2026-10-19 09:05:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002_match_fingerprint'
+down_revision: Union[str, Sequence[str], None] = '0001_initial'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('mkt_leads') as batch_op:
+        batch_op.add_column(sa.Column('match_fingerprint', sa.String(length=40), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('mkt_leads') as batch_op:
+        batch_op.drop_column('match_fingerprint')
@@ -0,0 +1,52 @@
+"""Composite indexes for the list filters, keyset pages and group-bys
+
+Revision ID: 0003_filter_indexes
+Revises: 0002_match_fingerprint
+Create Date: 2026-10-19 09:10:00
+
+Each index puts the equality filter first and the page order after it, so a
+filtered page is one index range read in sort order (checked by
+benchmarks/query_plans.py). On a large PostgreSQL table, build them with
+CREATE INDEX CONCURRENTLY outside a transaction instead, to avoid locking writes.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003_filter_indexes'
+down_revision: Union[str, Sequence[str], None] = '0002_match_fingerprint'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = [
+    ('ix_leads_unit_id', 'leads', ['unit', 'id']),
+    ('ix_leads_status_id', 'leads', ['status', 'id']),
+    ('ix_leads_source_id', 'leads', ['source', 'id']),
+    ('ix_appointments_date_id', 'appointments', ['date', 'id']),
+    ('ix_appointments_unit_date_id', 'appointments', ['unit', 'date', 'id']),
+    ('ix_appointments_status_date_id', 'appointments', ['status', 'date', 'id']),
+    ('ix_appointments_lead_id', 'appointments', ['lead_id']),
+    ('ix_sales_date_id', 'sales', ['date', 'id']),
+    ('ix_sales_unit_date_id', 'sales', ['unit', 'date', 'id']),
+    ('ix_sales_seller_date_id', 'sales', ['seller', 'date', 'id']),
+    ('ix_sales_status_date_id', 'sales', ['status', 'date', 'id']),
+    ('ix_sales_lead_id', 'sales', ['lead_id']),
+    ('ix_mkt_leads_lead_source_lead_id', 'mkt_leads', ['lead_source', 'lead_id']),
+    ('ix_mkt_leads_lead_store_lead_id', 'mkt_leads', ['lead_store', 'lead_id']),
+    ('ix_mkt_leads_lead_category_lead_id', 'mkt_leads', ['lead_category', 'lead_id']),
+    ('ix_mkt_leads_sales_purchased_lead_id', 'mkt_leads', ['sales_purchased', 'lead_id']),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Numeric, Text
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Numeric, Text, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from ..database import Base
@@ -6,6 +6,14 @@ from ..database import Base
 class Appointment(Base):
     __tablename__ = "appointments"
 
+    # Keyset sort key (date, id) and the filters of backend/crud/appointment.py in front of it
+    __table_args__ = (
+        Index("ix_appointments_date_id", "date", "id"),
+        Index("ix_appointments_unit_date_id", "unit", "date", "id"),
+        Index("ix_appointments_status_date_id", "status", "date", "id"),
+        Index("ix_appointments_lead_id", "lead_id"),
+    )
+
     id = Column(Integer, primary_key=True, index=True)
     lead_id = Column(Integer, ForeignKey("leads.id"), nullable=False)
     
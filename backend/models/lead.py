@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Text
+from sqlalchemy import Column, Integer, String, DateTime, Text, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from ..database import Base
@@ -6,6 +6,13 @@ from ..database import Base
 class Lead(Base):
     __tablename__ = "leads"
 
+    # Filters of backend/crud/lead.py, each followed by the keyset sort key (id)
+    __table_args__ = (
+        Index("ix_leads_unit_id", "unit", "id"),
+        Index("ix_leads_status_id", "status", "id"),
+        Index("ix_leads_source_id", "source", "id"),
+    )
+
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(100), nullable=True)
     email = Column(String(100), nullable=True)
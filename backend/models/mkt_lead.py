@@ -1,10 +1,18 @@
-from sqlalchemy import Column, Integer, String, DateTime, Text, Boolean
+from sqlalchemy import Column, Integer, String, DateTime, Text, Boolean, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from ..database import Base
 
 class MktLead(Base):
     __tablename__ = "mkt_leads"
+
+    # Sidebar filters of frontend/st_mkt/mkt_leads_view.py, each followed by the page order (lead_id)
+    __table_args__ = (
+        Index("ix_mkt_leads_lead_source_lead_id", "lead_source", "lead_id"),
+        Index("ix_mkt_leads_lead_store_lead_id", "lead_store", "lead_id"),
+        Index("ix_mkt_leads_lead_category_lead_id", "lead_category", "lead_id"),
+        Index("ix_mkt_leads_sales_purchased_lead_id", "sales_purchased", "lead_id"),
+    )
     
     lead_id = Column(Integer, nullable=False, primary_key=True)
     lead_email = Column(String(100), nullable=True)
@@ -40,4 +48,7 @@ class MktLead(Base):
     sales_month = Column(String(100), nullable=True)
     sales_day_of_week = Column(String(100), nullable=True)
     sales_purchased = Column(Boolean, nullable=True)
-    sales_interval = Column(Integer, nullable=True)
\ No newline at end of file
+    sales_interval = Column(Integer, nullable=True)
+
+    # digest of the lead, appointment and sale evidence behind the match (see frontend/marketing/incremental.py)
+    match_fingerprint = Column(String(40), nullable=True)
\ No newline at end of file
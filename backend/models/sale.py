@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Numeric, Text, Boolean
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Numeric, Text, Boolean, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from ..database import Base
@@ -6,6 +6,15 @@ from ..database import Base
 class Sale(Base):
     __tablename__ = "sales"
 
+    # Keyset sort key (date, id) and the filters of backend/crud/sale.py in front of it
+    __table_args__ = (
+        Index("ix_sales_date_id", "date", "id"),
+        Index("ix_sales_unit_date_id", "unit", "date", "id"),
+        Index("ix_sales_seller_date_id", "seller", "date", "id"),
+        Index("ix_sales_status_date_id", "status", "date", "id"),
+        Index("ix_sales_lead_id", "lead_id"),
+    )
+
     id = Column(Integer, primary_key=True, index=True)
     lead_id = Column(Integer, ForeignKey("leads.id"), nullable=False)
     appointment_id = Column(Integer, ForeignKey("appointments.id"), nullable=True)
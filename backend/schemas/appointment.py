@@ -34,6 +34,10 @@ class Appointment(AppointmentBase):
 
 # Schema for Appointment list response
 class AppointmentList(BaseModel):
-    total: int
+    # None with include_total=false; total_estimated when it comes from the database statistics
+    total: Optional[int] = None
+    total_estimated: bool = False
     appointments: list[Appointment]
+    # Cursor of the next page (pass it as `after`); None on the last page
+    next_cursor: Optional[str] = None
     model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
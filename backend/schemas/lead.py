@@ -49,6 +49,10 @@ class Lead(LeadBase):
 
 # Schema for Lead list response
 class LeadList(BaseModel):
-    total: int
+    # None with include_total=false; total_estimated when it comes from the database statistics
+    total: Optional[int] = None
+    total_estimated: bool = False
     leads: list[Lead]
+    # Cursor of the next page (pass it as `after`); None on the last page
+    next_cursor: Optional[str] = None
     model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
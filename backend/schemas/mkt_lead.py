@@ -61,6 +61,10 @@ class MktLead(BaseModel):
 # Schema for MktLead list response
 
 class MktLeadList(BaseModel):
-    total: int
+    # None with include_total=false; total_estimated when it comes from the database statistics
+    total: Optional[int] = None
+    total_estimated: bool = False
     mkt_leads: list[MktLead]
+    # Cursor of the next page (pass it as `after`); None on the last page
+    next_cursor: Optional[str] = None
     model_config = ConfigDict(from_attributes=True)
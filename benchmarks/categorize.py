@@ -0,0 +1,85 @@
+"""
+categorize.py
+benchmark for lead categorization (frontend/leads/lead_category.py).
+
+Compares the compiled keyword matcher with the original per-keyword loop on
+synthetic Content/Mensagem texts.
+
+    python -m benchmarks.categorize --rows 1000000
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from frontend.leads.lead_category import category_mapping, categorize_series, process_lead_categories
+
+NOISE = ['', 'nan', 'campanha_verao_2024', 'lead pop up de saída. ganhou peeling diamante.',
+         'quero saber o valor', 'lp_institucional_sp', 'gostaria de agendar uma avaliação']
+
+
+def legacy_categorize(text):
+    """The original implementation: one lowered substring check per keyword."""
+    if not isinstance(text, str):
+        text = str(text)
+    for keyword, category in category_mapping.items():
+        if keyword.lower() in text.lower():
+            return category
+    return 'Indefinido'
+
+
+def synthetic_texts(rows, seed=42, distinct=5000):
+    """`rows` texts drawn from `distinct` variants of keywords and noise."""
+    rng = np.random.default_rng(seed)
+    vocabulary = list(category_mapping) + NOISE
+    variants = [
+        f"{rng.choice(vocabulary)}_{rng.choice(vocabulary)}_{i}".lower() if i % 3 else str(rng.choice(NOISE))
+        for i in range(distinct)
+    ]
+    return pd.Series(rng.choice(variants, size=rows))
+
+
+def run(rows, legacy_rows=50_000, seed=42):
+    content = synthetic_texts(rows, seed)
+    mensagem = synthetic_texts(rows, seed + 1)
+    results = {}
+
+    sample = content.iloc[:legacy_rows]
+    started = time.perf_counter()
+    expected = sample.apply(legacy_categorize)
+    results['legacy_per_row_s'] = (time.perf_counter() - started) / len(sample)
+
+    started = time.perf_counter()
+    compiled = categorize_series(sample)
+    results['compiled_per_row_s'] = (time.perf_counter() - started) / len(sample)
+    assert compiled.equals(expected), "compiled matcher disagrees with the original loop"
+
+    started = time.perf_counter()
+    categorize_series(content)
+    results['compiled_total_s'] = time.perf_counter() - started
+
+    df_leads = pd.DataFrame({'Content': content, 'Mensagem': mensagem, 'Fonte': 'Google Pesquisa'})
+    started = time.perf_counter()
+    process_lead_categories(df_leads)
+    results['process_lead_categories_s'] = time.perf_counter() - started
+    results['rows'] = rows
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    results = run(args.rows, seed=args.seed)
+    print(f"legacy loop:  {results['legacy_per_row_s'] * 1e6:.2f} µs/row")
+    print(f"compiled:     {results['compiled_per_row_s'] * 1e6:.2f} µs/row")
+    print(f"categorize_series on {results['rows']} texts: {results['compiled_total_s']:.2f}s")
+    print(f"process_lead_categories on {results['rows']} leads: {results['process_lead_categories_s']:.2f}s")
+
+
+if __name__ == '__main__':
+    main()
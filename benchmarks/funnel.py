@@ -0,0 +1,180 @@
+"""
+funnel.py
+benchmark suite for the marketing funnel (load_page_marketing's pipeline).
+
+Generates seeded synthetic exports (benchmarks/synthetic.py) and times each
+stage: clean, categorize, match (Atendido + other statuses), purchase join,
+table assembly and save. The save stage writes the whole funnel table through
+save_data_to_db_batch (write_leads: ON CONFLICT upsert on SQLite, COPY + merge
+on PostgreSQL) into an empty table, then again as 'resave', where every row is
+an update. It uses a throwaway SQLite file unless --database-url points at a
+scratch database. Results are compared with benchmarks/baselines.json, so
+regressions and improvements are visible; --save-baseline records them.
+
+    python -m benchmarks.funnel --sizes 10k 100k 1M
+    python -m benchmarks.funnel --sizes 1M --skip-save
+    python -m benchmarks.funnel --sizes 100k --database-url postgresql+psycopg2://localhost/dash_bench
+"""
+
+import argparse
+import json
+import logging
+import os
+import tempfile
+import time
+from contextlib import contextmanager
+from unittest import mock
+
+from sqlalchemy import create_engine, delete
+from sqlalchemy.orm import sessionmaker
+
+from backend.database import Base
+from backend.models.mkt_lead import MktLead
+from benchmarks.synthetic import SIZES, generate
+from frontend.leads import lead_category
+from frontend.leads.lead_category import process_lead_categories
+from frontend.marketing.funnel import build_funnel
+from frontend.marketing.ingestion import CLEANERS
+from helpers import cleaner
+from helpers.data_wrestler import save_data_to_db_batch
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), 'baselines.json')
+STAGES = ['clean', 'categorize', 'match', 'purchase_join', 'assemble', 'save', 'resave']
+
+
+def _clear_caches():
+    # Distinct-value caches would make every run after the first look free
+    cleaner._phone_cache.clear()
+    lead_category._category_cache.clear()
+
+
+@contextmanager
+def _bench_session(database_url=None):
+    """
+    An empty mkt_leads table standing in for the real one during the save stage:
+    a throwaway SQLite file, or the table in a scratch database (emptied before
+    and after the run).
+    """
+    with tempfile.TemporaryDirectory(prefix='dash_bench_') as tmp_dir:
+        engine = create_engine(database_url or f"sqlite:///{os.path.join(tmp_dir, 'bench.db')}")
+        Base.metadata.create_all(engine, tables=[MktLead.__table__])
+        factory = sessionmaker(bind=engine)
+        if database_url:
+            _empty_table(factory)
+        try:
+            with mock.patch('helpers.data_wrestler.SessionLocal', factory):
+                yield engine.dialect.name
+        finally:
+            if database_url:
+                _empty_table(factory)
+            engine.dispose()
+
+
+def _empty_table(factory):
+    with factory() as session:
+        session.execute(delete(MktLead))
+        session.commit()
+
+
+def run(rows, seed=42, save=True, database_url=None):
+    """
+    Time every funnel stage on `rows` synthetic rows per file.
+
+    Args:
+        save: Time the save stages (the slowest part at large sizes)
+        database_url: Scratch database for the save stages instead of a temporary SQLite file
+
+    Returns:
+        dict: stage -> seconds, plus 'rows', 'leads_matched' and, when saving, 'save_dialect'
+    """
+    df_leads, df_appointments, df_sales = generate(rows, seed)
+    _clear_caches()
+    timings = {'rows': rows}
+
+    started = time.perf_counter()
+    df_leads = CLEANERS['leads'](df_leads)
+    df_appointments = CLEANERS['appointments'](df_appointments)
+    df_sales = CLEANERS['sales'](df_sales)
+    timings['clean'] = time.perf_counter() - started
+
+    # Categorization also runs inside clean_leads; time it on its own with cold caches
+    _clear_caches()
+    started = time.perf_counter()
+    process_lead_categories(df_leads)
+    timings['categorize'] = time.perf_counter() - started
+
+    events = {}
+    started = time.perf_counter()
+    funnel = build_funnel(df_leads, df_appointments, df_sales,
+                          progress=lambda event: events.__setitem__(event['stage'], event))
+    total = time.perf_counter() - started
+    timings['match'] = events['atendidos']['elapsed'] + events['outros_status']['elapsed']
+    timings['purchase_join'] = events['compras']['elapsed']
+    timings['assemble'] = events['tabela']['elapsed']
+    timings['funnel_total'] = total
+    timings['leads_matched'] = int((funnel['Status Agenda'] != 'Não está na agenda').sum())
+
+    if save:
+        with _bench_session(database_url) as dialect:
+            timings['save_dialect'] = dialect
+            for stage in ['save', 'resave']:
+                started = time.perf_counter()
+                success, message = save_data_to_db_batch(funnel)
+                timings[stage] = time.perf_counter() - started
+                if not success:
+                    raise RuntimeError(f"{stage} failed: {message}")
+    return timings
+
+
+def load_baselines(path=BASELINE_PATH):
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_baselines(results, path=BASELINE_PATH):
+    baselines = load_baselines(path)
+    baselines.update(results)
+    with open(path, 'w') as f:
+        json.dump(baselines, f, indent=2, sort_keys=True)
+
+
+def report(name, timings, baseline=None):
+    saved_to = f", saved to {timings['save_dialect']}" if 'save_dialect' in timings else ""
+    lines = [f"== {name} ({timings['rows']} rows, {timings['leads_matched']} leads on the agenda{saved_to})"]
+    for stage in STAGES + ['funnel_total']:
+        if stage not in timings:
+            continue
+        line = f"  {stage:<14} {timings[stage]:8.2f}s"
+        if baseline and stage in baseline:
+            change = (timings[stage] - baseline[stage]) / baseline[stage] * 100 if baseline[stage] else 0
+            line += f"   baseline {baseline[stage]:8.2f}s ({change:+.0f}%)"
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', nargs='+', default=['10k', '100k'], choices=list(SIZES))
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--skip-save', action='store_true', help="skip the save stages")
+    parser.add_argument('--database-url', help="scratch database for the save stages (its mkt_leads table is emptied)")
+    parser.add_argument('--save-baseline', action='store_true', help="record these results as the new baseline")
+    args = parser.parse_args()
+    # data_wrestler logs every saved row, which would dominate the save timings
+    logging.disable(logging.INFO)
+
+    baselines = load_baselines()
+    results = {}
+    for size in args.sizes:
+        results[size] = run(SIZES[size], seed=args.seed, save=not args.skip_save, database_url=args.database_url)
+        print(report(size, results[size], baselines.get(size)))
+
+    if args.save_baseline:
+        save_baselines(results)
+        print(f"Baseline saved to {BASELINE_PATH}")
+
+
+if __name__ == '__main__':
+    main()
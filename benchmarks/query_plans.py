@@ -0,0 +1,139 @@
+"""
+query_plans.py
+checks that the hot backend and mkt_leads_view queries use the indexes created by the migrations.
+
+Each query is built the way the app builds it (backend/crud filters and keyset
+pages, mkt_leads_view.apply_filters), explained on the target database and
+looked up for the index it should use. On PostgreSQL, sequential scans are
+disabled for the check, so small or freshly loaded tables still show whether the
+index can serve the query. Exits with status 1 when a query misses its index.
+
+    python -m benchmarks.query_plans            # database from backend/database.py
+    python -m benchmarks.query_plans --scratch  # new SQLite database migrated to head
+    python -m benchmarks.query_plans --verbose  # print every plan
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+from datetime import datetime
+
+from sqlalchemy import create_engine, desc, func, select, text
+
+from backend.crud.appointment import APPOINTMENT_ORDER
+from backend.crud.lead import LEAD_ORDER
+from backend.crud.pagination import apply_page, encode_cursor
+from backend.crud.sale import SALE_ORDER
+from backend.database import migrate_database
+from backend.models import Appointment, Lead, MktLead, Sale
+from frontend.st_mkt.mkt_leads_view import LEAD_COLUMNS, apply_filters
+
+PAGE = 101  # the endpoints fetch limit + 1 rows
+START, END = datetime(2024, 1, 1), datetime(2024, 1, 31)
+
+
+def _mkt_leads_page(**filters):
+    return apply_filters(select(*LEAD_COLUMNS.values()), **filters).order_by(desc(MktLead.lead_id)).limit(PAGE)
+
+
+# (name, statement, index the plan must use)
+HOT_QUERIES = [
+    ("leads page by unit",
+     apply_page(select(Lead).where(Lead.unit == 'MOEMA'), LEAD_ORDER, limit=PAGE, after=encode_cursor([100])),
+     'ix_leads_unit_id'),
+    ("leads page by status",
+     apply_page(select(Lead).where(Lead.status == 'Novo'), LEAD_ORDER, limit=PAGE), 'ix_leads_status_id'),
+    ("leads count by source",
+     select(func.count(Lead.id)).where(Lead.source == 'Google'), 'ix_leads_source_id'),
+    ("appointments next page",
+     apply_page(select(Appointment), APPOINTMENT_ORDER, limit=PAGE, after=encode_cursor([START, 100])),
+     'ix_appointments_date_id'),
+    ("appointments page by unit and period",
+     apply_page(select(Appointment).where(Appointment.unit == 'MOEMA', Appointment.date >= START, Appointment.date <= END),
+                APPOINTMENT_ORDER, limit=PAGE),
+     'ix_appointments_unit_date_id'),
+    ("appointments page by status",
+     apply_page(select(Appointment).where(Appointment.status == 'Atendido'), APPOINTMENT_ORDER, limit=PAGE),
+     'ix_appointments_status_date_id'),
+    ("appointments by unit",
+     select(Appointment.unit, func.count(Appointment.id)).group_by(Appointment.unit), 'ix_appointments_unit_date_id'),
+    ("appointments of a lead",
+     select(Appointment).where(Appointment.lead_id == 1), 'ix_appointments_lead_id'),
+    ("sales next page",
+     apply_page(select(Sale), SALE_ORDER, limit=PAGE, after=encode_cursor([START, 100])), 'ix_sales_date_id'),
+    ("sales page by seller and period",
+     apply_page(select(Sale).where(Sale.seller == 'Ana', Sale.date >= START, Sale.date <= END), SALE_ORDER, limit=PAGE),
+     'ix_sales_seller_date_id'),
+    ("sales page by unit",
+     apply_page(select(Sale).where(Sale.unit == 'MOEMA'), SALE_ORDER, limit=PAGE), 'ix_sales_unit_date_id'),
+    ("sales page by status",
+     apply_page(select(Sale).where(Sale.status == 'Finalizado'), SALE_ORDER, limit=PAGE), 'ix_sales_status_date_id'),
+    ("sales of a lead",
+     select(Sale).where(Sale.lead_id == 1), 'ix_sales_lead_id'),
+    ("mkt leads page by source",
+     _mkt_leads_page(source_filter='Google Pesquisa'), 'ix_mkt_leads_lead_source_lead_id'),
+    ("mkt leads page by store",
+     _mkt_leads_page(store_filter='MOEMA'), 'ix_mkt_leads_lead_store_lead_id'),
+    ("mkt leads page by category",
+     _mkt_leads_page(category_filter='Botox'), 'ix_mkt_leads_lead_category_lead_id'),
+    ("mkt leads page of buyers",
+     _mkt_leads_page(purchased_filter=True), 'ix_mkt_leads_sales_purchased_lead_id'),
+    ("mkt leads count by category",
+     apply_filters(select(func.count(MktLead.lead_id)), category_filter='Botox'), 'ix_mkt_leads_lead_category_lead_id'),
+]
+
+
+def explain(connection, statement):
+    """Query plan of `statement` as text."""
+    sql = str(statement.compile(dialect=connection.dialect, compile_kwargs={"literal_binds": True}))
+    if connection.dialect.name == 'sqlite':
+        return "\n".join(row[-1] for row in connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}"))
+    return "\n".join(row[0] for row in connection.exec_driver_sql(f"EXPLAIN {sql}"))
+
+
+def check_plans(connection):
+    """
+    Returns:
+        list[dict]: one {"name", "index", "used", "plan"} per HOT_QUERIES entry
+    """
+    results = []
+    with connection.begin():
+        if connection.dialect.name == 'postgresql':
+            connection.execute(text("SET LOCAL enable_seqscan = off"))
+        for name, statement, index in HOT_QUERIES:
+            plan = explain(connection, statement)
+            results.append({"name": name, "index": index, "used": index in plan, "plan": plan})
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scratch', action='store_true', help="check a new SQLite database migrated to head")
+    parser.add_argument('--verbose', action='store_true', help="print every plan")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix='dash_plans_') as tmp_dir:
+        if args.scratch:
+            engine = create_engine(f"sqlite:///{os.path.join(tmp_dir, 'plans.db')}")
+            with engine.connect() as connection:
+                migrate_database(connection)
+                connection.commit()
+        else:
+            from backend.database import engine
+
+        with engine.connect() as connection:
+            results = check_plans(connection)
+        engine.dispose()
+
+    for result in results:
+        print(f"{'ok  ' if result['used'] else 'MISS'} {result['name']:<40} {result['index']}")
+        if args.verbose or not result['used']:
+            print("     " + result['plan'].replace("\n", "\n     "))
+    missed = sum(not result['used'] for result in results)
+    print(f"{len(results) - missed}/{len(results)} queries use their index")
+    sys.exit(1 if missed else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,140 @@
+"""
+synthetic.py
+seeded generator of leads, appointments and sales exports for benchmarks.
+
+The frames have the columns of the real uploads that the ingest cleaners read
+(lead_clean_columns, the raw columns behind appointments_clean_columns and
+colunas_reduzido), with phones written in the formats seen in the exports
+("(11) 98888-0001", "+55 11 98888-0001", several numbers per customer) and
+controlled overlap between the three files.
+"""
+
+import numpy as np
+import pandas as pd
+
+from frontend.appointments.appointment_columns import avaliacao_procedures
+from frontend.leads.lead_category import category_mapping
+from frontend.leads.lead_columns import lead_clean_columns
+from frontend.marketing.apt_cleaner import status_agendamentos_marketing
+
+SIZES = {"10k": 10_000, "100k": 100_000, "1M": 1_000_000}
+
+# Share of leads with an appointment, matched by phone or only by email, and share of leads that buy
+APPOINTMENT_RATE = 0.35
+EMAIL_ONLY_RATE = 0.05
+PURCHASE_RATE = 0.12
+
+STORES = ['MOEMA', 'LAPA', 'ITAIM', 'MOOCA', 'SANTO AMARO', 'TATUAPÉ', 'OSASCO', 'CAMPINAS']
+SOURCES = ['Google Pesquisa', 'Facebook Leads', 'Instagram', 'Indique e Multiplique', 'CRM BÔNUS', 'Site']
+APPOINTMENT_STATUSES = ['Atendido'] * 4 + status_agendamentos_marketing
+MESSAGES = ['', 'Quero saber o valor', 'Lead Pop Up de Saída. Ganhou Peeling Diamante.',
+            'Lead salvo pelo modal de WhatsApp da Isa', 'Gostaria de agendar uma avaliação']
+
+
+def _phones(rng, n):
+    """Canonical 11-digit mobile numbers, unique per customer."""
+    ddd = rng.choice([11, 11, 11, 12, 13, 19, 21], size=n)
+    # 37 is coprime with 90M, so the numbers never repeat
+    number = 900_000_000 + (rng.permutation(n).astype(np.int64) * 37 + 11) % 90_000_000
+    return ddd.astype(np.int64) * 1_000_000_000 + number
+
+
+def _format_phones(rng, phones):
+    """Write the numbers the way the exports do."""
+    text = pd.Series(phones).astype(str)
+    ddd, first, last = text.str[:2], text.str[2:7], text.str[7:]
+    style = rng.integers(0, 4, size=len(phones))
+    formatted = np.select(
+        [style == 0, style == 1, style == 2],
+        [('(' + ddd + ') ' + first + '-' + last).to_numpy(),
+         ('+55 ' + ddd + ' ' + first + '-' + last).to_numpy(),
+         ('0' + text).to_numpy()],
+        text.to_numpy()
+    )
+    return formatted
+
+
+def _dates(rng, n, start, days):
+    return pd.Timestamp(start) + pd.to_timedelta(rng.integers(0, days * 24 * 60, size=n), unit='min')
+
+
+def generate(rows, seed=42):
+    """
+    Leads, appointments and sales exports of about `rows` rows each.
+
+    Returns:
+        tuple: (df_leads, df_appointments, df_sales) shaped like the uploaded XLSX files
+    """
+    rng = np.random.default_rng(seed)
+    n_customers = rows * 2
+    phones = _phones(rng, n_customers)
+    emails = ('cliente' + pd.Series(np.arange(n_customers)).astype(str) + '@exemplo.com.br').to_numpy(dtype=object)
+
+    # Leads: the first `rows` customers
+    lead_customers = np.arange(rows)
+    entries = _dates(rng, rows, '2024-01-01', 90)
+    contents = list(category_mapping) + ['institucional', 'lp_geral', 'nan']
+    df_leads = pd.DataFrame({
+        'ID do lead': np.arange(1, rows + 1),
+        'Nome do lead': 'Lead ' + pd.Series(np.arange(rows)).astype(str),
+        'Email do lead': emails[lead_customers],
+        'Telefone do lead': _format_phones(rng, phones[lead_customers]),
+        'Mensagem': rng.choice(MESSAGES, size=rows),
+        'Unidade': rng.choice(STORES, size=rows),
+        'Fonte': rng.choice(SOURCES, size=rows),
+        'Dia da entrada': entries.strftime('%Y-%m-%d %H:%M:%S'),
+        'Status': rng.choice(['Novo', 'Em contato', 'Convertido'], size=rows),
+        'Source': rng.choice(['google', 'facebook', 'instagram'], size=rows),
+        'Medium': rng.choice(['cpc', 'social'], size=rows),
+        'Term': '',
+        'Content': pd.Series(rng.choice([content.lower() for content in contents], size=rows)) + '_' + pd.Series(rng.integers(0, 50, size=rows)).astype(str),
+        'Campaign': rng.choice(['verao', 'inverno', 'black_friday'], size=rows),
+        'Mês': entries.month,
+    })[lead_clean_columns]
+
+    # Appointments: some leads (by phone, or by email with another phone) plus other customers
+    booked = rng.random(rows) < APPOINTMENT_RATE
+    email_only = booked & (rng.random(rows) < EMAIL_ONLY_RATE / APPOINTMENT_RATE)
+    customers = np.concatenate([lead_customers[booked], rng.integers(rows, n_customers, size=rows - booked.sum())])
+    appointment_phones = phones[customers].copy()
+    email_only_rows = np.flatnonzero(email_only[booked])
+    appointment_phones[email_only_rows] = phones[rng.integers(rows, n_customers, size=len(email_only_rows))]
+    appointment_dates = np.concatenate([
+        (entries[booked] + pd.to_timedelta(rng.integers(0, 30, size=booked.sum()), unit='D')).to_numpy(),
+        _dates(rng, len(customers) - booked.sum(), '2024-01-01', 120).to_numpy(),
+    ])
+    procedures = np.array(avaliacao_procedures + ['BOTOX', 'LIMPEZA DE PELE'], dtype=object)
+    df_appointments = pd.DataFrame({
+        'ID agendamento': np.arange(1, len(customers) + 1),
+        'ID cliente': customers + 1,
+        'Unidade do agendamento': rng.choice(STORES, size=len(customers)),
+        'Procedimento': rng.choice(procedures, size=len(customers)),
+        'Status': rng.choice(APPOINTMENT_STATUSES, size=len(customers)),
+        'Data': pd.DatetimeIndex(appointment_dates).strftime('%d/%m/%Y'),
+        'Telefone': _format_phones(rng, appointment_phones),
+        'Email': emails[customers],
+    })
+
+    # Sales: some leads plus other customers; a share of customers list two numbers
+    bought = rng.random(rows) < PURCHASE_RATE
+    customers = np.concatenate([lead_customers[bought], rng.integers(rows, n_customers, size=rows - bought.sum())])
+    sale_phones = pd.Series(_format_phones(rng, phones[customers]))
+    second = rng.random(len(customers)) < 0.1
+    sale_phones[second] = sale_phones[second] + ', ' + _format_phones(rng, phones[rng.integers(0, n_customers, size=second.sum())])
+    sale_dates = np.concatenate([
+        (entries[bought] + pd.to_timedelta(rng.integers(0, 60, size=bought.sum()), unit='D')).to_numpy(),
+        _dates(rng, len(customers) - bought.sum(), '2024-01-01', 120).to_numpy(),
+    ])
+    df_sales = pd.DataFrame({
+        'ID orçamento': np.arange(1, len(customers) + 1),
+        'ID cliente': customers + 1,
+        'Status': rng.choice(['Finalizado'] * 9 + ['Cancelado'], size=len(customers)),
+        'Consultor': rng.choice(['Ana', 'Bia', 'Carla', 'BKO VENDAS'], size=len(customers), p=[0.3, 0.3, 0.35, 0.05]),
+        'Unidade': rng.choice(STORES, size=len(customers)),
+        'Data venda': pd.DatetimeIndex(sale_dates).strftime('%Y-%m-%d'),
+        'Valor líquido': rng.integers(200, 20_000, size=len(customers)).astype(str),
+        'Telefone(s) do cliente': sale_phones.to_numpy(),
+        'Email do cliente': emails[customers],
+    })
+
+    return df_leads, df_appointments, df_sales
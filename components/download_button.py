@@ -0,0 +1,52 @@
+import os
+import streamlit as st
+from helpers.export import EXPORT_FORMATS, available_formats, export_dataframe
+
+def download_button(df, file_name, key, sheet_name="Leads"):
+    """
+    Format picker plus download button that only builds the file when asked.
+
+    The export is generated on "Gerar arquivo" and cached by dataset hash, so
+    reruns of the page never serialize or hash the table and repeated downloads
+    reuse the file already on disk. The generated file stays tied to the
+    DataFrame object it came from, so pass one kept in st.session_state.
+
+    Args:
+        df: DataFrame to export
+        file_name: Download file name without extension
+        key: Unique widget key prefix
+        sheet_name: Worksheet name for Excel exports
+    """
+    formats = available_formats()
+    col1, col2 = st.columns([1, 3])
+    with col1:
+        fmt = st.selectbox(
+            "Formato",
+            formats,
+            format_func=lambda f: EXPORT_FORMATS[f][0],
+            key=f"{key}_format",
+            label_visibility="collapsed"
+        )
+
+    export_key = f"{key}_export"
+    with col2:
+        if st.button("Gerar arquivo", key=f"{key}_generate"):
+            with st.spinner("Gerando arquivo..."):
+                try:
+                    path = export_dataframe(df, fmt, sheet_name=sheet_name)
+                    st.session_state[export_key] = (fmt, df, path)
+                except Exception as e:
+                    st.error(f"Erro ao gerar arquivo: {str(e)}")
+
+    export = st.session_state.get(export_key)
+    if export is None or export[0] != fmt or export[1] is not df or not os.path.exists(export[2]):
+        return
+
+    with open(export[2], "rb") as f:
+        st.download_button(
+            label=f"Baixar {EXPORT_FORMATS[fmt][0]}",
+            data=f,
+            file_name=f"{file_name}.{fmt}",
+            mime=EXPORT_FORMATS[fmt][1],
+            key=f"{key}_download"
+        )
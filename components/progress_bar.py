@@ -0,0 +1,46 @@
+import streamlit as st
+import pandas as pd
+
+class ProgressBar:
+    """
+    Renders progress events from the marketing matching stages.
+
+    Each stage takes an equal share of the bar. Pass the instance as the
+    `progress` callback of the matching functions.
+
+    Args:
+        stages: dict stage name -> label shown to the user
+    """
+
+    def __init__(self, stages):
+        self.stages = stages
+        self.timings = {}
+        self._bar = st.progress(0, text="Preparando cruzamento...")
+
+    def __call__(self, event):
+        position = list(self.stages).index(event["stage"])
+        stage_fraction = event["done"] / event["total"] if event["total"] else 1
+        overall = (position + stage_fraction) / len(self.stages)
+
+        label = self.stages[event["stage"]]
+        text = f"{label}: {event['done']}/{event['total']} linhas, {event['matched']} encontrados ({event['elapsed']:.1f}s)"
+        self._bar.progress(min(overall, 1.0), text=text)
+
+        if event["finished"]:
+            self.timings[event["stage"]] = event
+
+    def complete(self):
+        total_elapsed = sum(event["elapsed"] for event in self.timings.values())
+        self._bar.progress(1.0, text=f"Cruzamento concluído em {total_elapsed:.1f}s")
+
+    def summary(self):
+        """Stage timings as a DataFrame, for display."""
+        return pd.DataFrame([
+            {
+                "Etapa": self.stages[stage],
+                "Linhas": event["total"],
+                "Encontrados": event["matched"],
+                "Tempo (s)": round(event["elapsed"], 2),
+            }
+            for stage, event in self.timings.items()
+        ])
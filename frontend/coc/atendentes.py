@@ -1,7 +1,6 @@
 import streamlit as st
 import pandas as pd
-from google.oauth2.service_account import Credentials
-from helpers.gsheet import get_gspread_client, get_ss_url
+from frontend.coc.roster import get_roster_table
 
 atendentes_puxadas_manha = {
     'Geovanna Maynara Soares' : 'Sorocaba',
@@ -57,19 +56,11 @@ def get_atendente_from_spreadsheet():
         Exception: If there's an error accessing the spreadsheet
     """
     try:
-        spreadsheet_url = get_ss_url()
-        client = get_gspread_client()
+        df_atendentes = get_roster_table("atendentes")
 
-        # Atendentes
-        sheet_name = client.open_by_url(spreadsheet_url)
-        atendentes = sheet_name.worksheet("atendentes")
-        dados_atendentes = atendentes.get_all_values()
-        
-        if len(dados_atendentes) <= 1:  # Only header or empty
+        if df_atendentes.empty:  # Only header or empty
             st.warning("Planilha de atendentes vazia ou sem dados")
             return pd.DataFrame(), pd.DataFrame()
-            
-        df_atendentes = pd.DataFrame(dados_atendentes[1:], columns=dados_atendentes[0])
         
         # Ensure required columns exist
         required_columns = ['Atendente', 'Unidade', 'Turno', 'Tam']
@@ -1,7 +1,6 @@
 import streamlit as st
 import pandas as pd
-from google.oauth2.service_account import Credentials
-from helpers.gsheet import get_gspread_client, get_ss_url
+from frontend.coc.roster import get_roster_table
 
 consultoras_manha = {
     'Beatriz Emanoela da Silva' : 'Tatuapé',
@@ -57,19 +56,11 @@ def get_consultora_from_spreadsheet():
         Exception: If there's an error accessing the spreadsheet
     """
     try:
-        spreadsheet_url = get_ss_url()
-        client = get_gspread_client()
+        df_consultoras = get_roster_table("consultoras")
 
-        # Atendentes
-        sheet_name = client.open_by_url(spreadsheet_url)
-        consultoras = sheet_name.worksheet("consultoras")
-        dados_consultoras = consultoras.get_all_values()
-        
-        if len(dados_consultoras) <= 1:  # Only header or empty
+        if df_consultoras.empty:  # Only header or empty
             st.warning("Planilha de consultoras vazia ou sem dados")
             return pd.DataFrame(), pd.DataFrame()
-            
-        df_consultoras = pd.DataFrame(dados_consultoras[1:], columns=dados_consultoras[0])
         
         # Ensure required columns exist
         required_columns = ['Consultora', 'Unidade', 'Turno', 'Tam']
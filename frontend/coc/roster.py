@@ -0,0 +1,88 @@
+# frontend/coc/roster.py
+"""
+Cached COC roster tables from the Google Sheets dashboard.
+
+The COC reports need the "atendentes", "consultoras", "lojas" and "dias"
+worksheets. Instead of authorizing a new client and opening the spreadsheet
+once per worksheet on every page load, all of them are read in a single
+values_batch_get call and kept in memory as DataFrames for ROSTER_TTL seconds.
+
+The admin pages call invalidate() after changing a worksheet so the next
+report picks up the new rows.
+"""
+
+import logging
+import threading
+import time
+
+import pandas as pd
+from gspread.utils import fill_gaps
+
+from helpers.gsheet import get_gspread_client, get_ss_url
+
+logger = logging.getLogger(__name__)
+
+ROSTER_WORKSHEETS = ("atendentes", "consultoras", "lojas", "dias")
+ROSTER_TTL = 10 * 60  # seconds
+
+_client = None
+_tables = {}
+_loaded_at = None
+_lock = threading.Lock()
+
+
+def get_client():
+    """Return a gspread client, authorizing only once per process."""
+    global _client
+    if _client is None:
+        _client = get_gspread_client()
+    return _client
+
+
+def _values_to_df(values):
+    if len(values) <= 1:  # Only header or empty
+        return pd.DataFrame(columns=values[0] if values else None)
+    # The Sheets API trims trailing empty cells; pad rows like get_all_values does
+    rows = fill_gaps(values, cols=len(values[0]))
+    return pd.DataFrame(rows[1:], columns=rows[0])
+
+
+def _load():
+    spreadsheet = get_client().open_by_url(get_ss_url())
+    response = spreadsheet.values_batch_get(list(ROSTER_WORKSHEETS))
+    value_ranges = response.get("valueRanges", [])
+    return {
+        worksheet: _values_to_df(value_range.get("values", []))
+        for worksheet, value_range in zip(ROSTER_WORKSHEETS, value_ranges)
+    }
+
+
+def get_roster_table(worksheet):
+    """
+    Get a roster worksheet as a DataFrame, reloading every worksheet when the cache expired.
+
+    Args:
+        worksheet: One of ROSTER_WORKSHEETS
+
+    Returns:
+        pd.DataFrame: Copy of the cached worksheet (empty if the worksheet has no data rows)
+    """
+    global _tables, _loaded_at
+    with _lock:
+        if _loaded_at is None or time.monotonic() - _loaded_at > ROSTER_TTL:
+            started = time.monotonic()
+            _tables = _load()
+            _loaded_at = time.monotonic()
+            logger.info(f"Loaded roster worksheets in {_loaded_at - started:.2f}s")
+        df = _tables.get(worksheet)
+    if df is None:
+        raise KeyError(f"Worksheet '{worksheet}' not found in roster")
+    return df.copy()
+
+
+def invalidate():
+    """Drop the cached roster so the next read goes back to the spreadsheet."""
+    global _loaded_at
+    with _lock:
+        _loaded_at = None
+    logger.info("Roster cache invalidated")
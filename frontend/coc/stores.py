@@ -1,7 +1,6 @@
 import streamlit as st
 import pandas as pd
-from google.oauth2.service_account import Credentials
-from helpers.gsheet import get_gspread_client, get_ss_url
+from frontend.coc.roster import get_roster_table
 
 def get_stores_from_spreadsheet():
     """
@@ -14,19 +13,11 @@ def get_stores_from_spreadsheet():
         Exception: If there's an error accessing the spreadsheet
     """
     try:
-        spreadsheet_url = get_ss_url()
-        client = get_gspread_client()
+        df_stores = get_roster_table("lojas")
 
-        # Atendentes
-        sheet_name = client.open_by_url(spreadsheet_url)
-        stores = sheet_name.worksheet("lojas")
-        dados_stores = stores.get_all_values()
-        
-        if len(dados_stores) <= 1:  # Only header or empty
+        if df_stores.empty:  # Only header or empty
             st.warning("Planilha de lojas vazia ou sem dados")
             return pd.DataFrame()
-            
-        df_stores = pd.DataFrame(dados_stores[1:], columns=dados_stores[0])
         
         # Ensure required columns exist
         required_columns = ['Unidade', 'Tam']
@@ -54,19 +45,11 @@ def get_days_from_dashboard():
         Exception: If there's an error accessing the spreadsheet
     """
     try:
-        spreadsheet_url = get_ss_url()
-        client = get_gspread_client()
+        df_days = get_roster_table("dias")
 
-        # Atendentes
-        sheet_name = client.open_by_url(spreadsheet_url)
-        days = sheet_name.worksheet("dias")
-        dados_days = days.get_all_values()
-        
-        if len(dados_days) <= 1:  # Only header or empty
+        if df_days.empty:  # Only header or empty
             st.warning("Planilha de dias vazia ou sem dados")
             return pd.DataFrame()
-            
-        df_days = pd.DataFrame(dados_days[1:], columns=dados_days[0])
     
         return df_days
         
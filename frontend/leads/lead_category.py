@@ -1,4 +1,6 @@
 import re
+import pandas as pd
+from helpers.distinct import DistinctCache, map_distinct
 
 # Key, Category
 category_mapping = {
@@ -40,15 +42,53 @@ category_mapping = {
     'Silicone': 'Prótese de Mama',
 }
 
+DEFAULT_CATEGORY = 'Indefinido'
+
+def compile_category_mapping(mapping):
+    """
+    Compile the keyword mapping into a single regex, so each text is scanned once.
+
+    The lookahead alternation finds, at every position, the highest-priority keyword
+    starting there; the lowest priority index among the hits is the first keyword of
+    the mapping contained in the text, exactly what the old per-keyword loop returned.
+
+    Returns:
+        tuple: (compiled pattern, dict lowered keyword -> (priority, category))
+    """
+    keywords = {}
+    for priority, (keyword, category) in enumerate(mapping.items()):
+        # 'prolipo' and 'Prolipo' are the same keyword once lowered; the first one wins
+        keywords.setdefault(keyword.lower(), (priority, category))
+
+    alternation = '|'.join(re.escape(keyword) for keyword in keywords)
+    return re.compile(f'(?=({alternation}))'), keywords
+
+_compiled_mapping = compile_category_mapping(category_mapping)
+
+def _category_of_hits(hits, keywords):
+    if not hits:
+        return DEFAULT_CATEGORY
+    return min(keywords[hit] for hit in hits)[1]
+
 def categorize(text):
     """Categorize text based on keywords."""
     if not isinstance(text, str):
         text = str(text)
-    
-    for keyword, category in category_mapping.items():
-        if keyword.lower() in text.lower():
-            return category
-    return 'Indefinido'
+
+    pattern, keywords = _compiled_mapping
+    return _category_of_hits(pattern.findall(text.lower()), keywords)
+
+# Content/Mensagem values repeat across leads and across reruns
+_category_cache = DistinctCache(maxsize=200_000)
+
+def _categorize_distinct(texts):
+    pattern, keywords = _compiled_mapping
+    findall = pattern.findall
+    return pd.Series([_category_of_hits(findall(text), keywords) for text in texts.str.lower()], dtype=object)
+
+def categorize_series(texts):
+    """Categorize a Series of texts at once (same result as texts.apply(categorize))."""
+    return map_distinct(texts.astype(str), _categorize_distinct, vectorized=True, cache=_category_cache)
 
 def process_lead_categories(df_leads):
     """Process and categorize leads in the DataFrame."""
@@ -57,11 +97,11 @@ def process_lead_categories(df_leads):
     df_leads['Mensagem'] = df_leads['Mensagem'].astype(str)
     
     # Categorize based on Content
-    df_leads['Categoria'] = df_leads['Content'].apply(categorize)
+    df_leads['Categoria'] = categorize_series(df_leads['Content'])
     
     # Categorize based on Mensagem for Indefinido cases
-    df_leads.loc[df_leads['Categoria'] == 'Indefinido', 'Categoria'] = \
-        df_leads.loc[df_leads['Categoria'] == 'Indefinido', 'Mensagem'].apply(categorize)
+    undefined = df_leads['Categoria'] == DEFAULT_CATEGORY
+    df_leads.loc[undefined, 'Categoria'] = categorize_series(df_leads.loc[undefined, 'Mensagem'])
     
     # Extra categories
     df_leads.loc[(df_leads['Fonte'] == 'Indique e Multiplique') & (df_leads['Categoria'] == 'Indefinido'), 'Categoria'] = 'Cortesia Indique'
@@ -1,5 +1,5 @@
 import pandas as pd
-from helpers.cleaner import clean_telephone
+from helpers.cleaner import normalize_phones
 from .lead_columns import lead_clean_columns, undesired_stores
 
 def filter_relevant_leads_to_mkt(df_leads):
@@ -10,7 +10,7 @@ def filter_relevant_leads_to_mkt(df_leads):
     # Tratamento de dados no df_leads
     df_leads['Telefone do lead'] = df_leads['Telefone do lead'].fillna('Cliente sem telefone')
     df_leads['Email do lead'] = df_leads['Email do lead'].fillna('None')
-    df_leads['Telefone do lead'] = df_leads['Telefone do lead'].astype(str).apply(clean_telephone)
+    df_leads['Telefone do lead'] = normalize_phones(df_leads['Telefone do lead'])
 
     # Columns
     df_leads = df_leads[lead_clean_columns]
@@ -0,0 +1,164 @@
+"""
+funnel.py
+responsible for building the Leads x Agenda x Vendas funnel table in a single pipeline.
+
+Every stage resolves the leads against an index (see worker.py and
+sales_checker.py) and returns columns aligned to the leads index; the final
+table is assembled once from those pieces, already with its final column
+names, instead of merging, writing back and renaming positionally.
+
+Status precedence: an 'Atendido' appointment wins over any other status,
+and leads with neither are 'Não está na agenda'.
+"""
+
+import pandas as pd
+
+from frontend.marketing.apt_cleaner import (aesthetic_procedures_aval,
+                                            status_agendamentos_marketing,
+                                            status_comparecimentos_marketing)
+from frontend.marketing.progress import StageProgress
+from frontend.marketing.sales_checker import match_leads_to_sales
+from frontend.marketing.worker import match_leads_to_appointments
+from helpers.cleaner import columns_to_hide_from_final_df_leads_appointments_sales
+
+FUNNEL_STAGES = {
+    'atendidos': "Leads atendidos",
+    'outros_status': "Leads com outros status",
+    'compras': "Leads x Vendas",
+    'tabela': "Tabela final",
+}
+
+NOT_IN_AGENDA = 'Não está na agenda'
+NOT_PURCHASED = 'Não comprou'
+
+# Source column -> column of the final table, in display order
+LEAD_FUNNEL_COLUMNS = {
+    'ID do lead': 'ID lead',
+    'Email do lead': 'Email do lead',
+    'Telefone do lead': 'Telefone do lead',
+    'Mensagem': 'Mensagem',
+    'Unidade': 'Unidade do lead',
+    'Fonte': 'Fonte',
+    'Dia da entrada': 'Dia da entrada',
+    'Source': 'Source',
+    'Medium': 'Medium',
+    'Term': 'Term',
+    'Content': 'Content',
+    'Campaign': 'Campaign',
+    'Mês': 'Mês do lead',
+    'Categoria': 'Categoria',
+}
+
+APPOINTMENT_FUNNEL_COLUMNS = {
+    'data_agenda': 'Data Na Agenda',
+    'procedimento': 'Procedimento',
+    'status': 'Status Agenda',
+    'unidade': 'Unidade da Agenda',
+}
+
+SALE_FUNNEL_COLUMNS = {
+    'Telefones Limpos': 'Telefones Limpos',
+    'Telefone(s) do cliente': 'Telefone(s) do cliente',
+    'ID orçamento': 'ID orçamento',
+    'Data venda': 'Data Venda',
+    'Unidade': 'Unidade da Venda',
+    'Valor líquido': 'Valor primeiro orçamento',
+    'Total comprado pelo cliente': 'Total comprado pelo cliente',
+    'Número de orçamentos do cliente': 'Número de orçamentos do cliente',
+    'Dia': 'Dia',
+    'Mês': 'Mês da Venda',
+    'Dia da Semana': 'Dia da Semana',
+}
+
+# Columns of the table returned by build_funnel, in order
+FUNNEL_COLUMNS = [
+    column
+    for column in [*LEAD_FUNNEL_COLUMNS.values(), *APPOINTMENT_FUNNEL_COLUMNS.values(), *SALE_FUNNEL_COLUMNS.values(), 'comprou']
+    if column not in columns_to_hide_from_final_df_leads_appointments_sales
+] + ['intervalo da compra']
+
+
+
+def split_appointments(df_appointments):
+    """
+    Evaluation appointments split by status.
+
+    Returns:
+        tuple: (comparecimentos, agendamentos)
+    """
+    evaluations = df_appointments['Procedimento'].isin(aesthetic_procedures_aval)
+    comparecimentos = df_appointments[evaluations & df_appointments['Status'].isin(status_comparecimentos_marketing)]
+    agendamentos = df_appointments[evaluations & df_appointments['Status'].isin(status_agendamentos_marketing)]
+    return comparecimentos, agendamentos
+
+
+def build_funnel(df_leads, df_appointments, df_sales, progress=None, window_days=None):
+    """
+    Cross leads with the agenda and the sales into the final funnel table.
+
+    Args:
+        df_leads: Cleaned leads (lead_clean_columns plus 'Categoria')
+        df_appointments: Cleaned appointments
+        df_sales: Cleaned sales
+        progress: Optional callback for stage events (see frontend/marketing/progress.py)
+        window_days: Match the nearest appointment/sale after the lead entry (see temporal.py)
+
+    Returns:
+        pd.DataFrame: One row per lead with the lead, agenda and sale columns,
+        'comprou' and 'intervalo da compra'
+    """
+    # Duplicated lead IDs would only be dropped at the end; drop them before matching
+    leads = df_leads.loc[~df_leads['ID do lead'].duplicated(), list(LEAD_FUNNEL_COLUMNS)]
+    comparecimentos, agendamentos = split_appointments(df_appointments)
+
+    tracker = StageProgress(progress, 'atendidos', len(leads))
+    appointments = match_leads_to_appointments(leads, comparecimentos, window_days=window_days, tracker=tracker)
+    attended = appointments['status'].notna()
+    tracker.finish(matched=int(attended.sum()))
+
+    # Only leads without an 'Atendido' appointment look for other statuses
+    pending = leads[~attended.to_numpy()]
+    tracker = StageProgress(progress, 'outros_status', len(pending))
+    other = match_leads_to_appointments(pending, agendamentos, window_days=window_days, tracker=tracker)
+    tracker.finish(matched=int(other['status'].notna().sum()))
+    appointments = appointments.where(attended, other.reindex(leads.index))
+
+    tracker = StageProgress(progress, 'compras', len(leads))
+    purchases = match_leads_to_sales(leads, df_sales, window_days=window_days, tracker=tracker)
+    purchased = purchases['Unidade'].notna()
+    tracker.finish(matched=int(purchased.sum()))
+
+    tracker = StageProgress(progress, 'tabela', len(leads))
+    funnel = pd.concat([
+        leads.rename(columns=LEAD_FUNNEL_COLUMNS),
+        appointments.rename(columns=APPOINTMENT_FUNNEL_COLUMNS),
+        purchases[[column for column in SALE_FUNNEL_COLUMNS if column in purchases]].rename(columns=SALE_FUNNEL_COLUMNS),
+    ], axis=1)
+    funnel['Status Agenda'] = funnel['Status Agenda'].fillna(NOT_IN_AGENDA)
+    funnel['Unidade da Venda'] = funnel['Unidade da Venda'].fillna(NOT_PURCHASED)
+    funnel['comprou'] = purchased.to_numpy()
+
+    funnel = funnel.drop(columns=columns_to_hide_from_final_df_leads_appointments_sales, errors='ignore')
+    funnel['intervalo da compra'] = (
+        pd.to_datetime(funnel['Data Venda']) - pd.to_datetime(funnel['Dia da entrada'], errors='coerce')
+    ).dt.days
+    # Opt in to pandas' future fillna (no silent downcasting) and infer the dtypes explicitly
+    with pd.option_context('future.no_silent_downcasting', True):
+        funnel = funnel.fillna("").infer_objects(copy=False)
+    funnel['ID lead'] = pd.to_numeric(funnel['ID lead'], errors='coerce')
+    funnel['Valor primeiro orçamento'] = pd.to_numeric(funnel['Valor primeiro orçamento'], errors='coerce')
+    funnel = funnel.reset_index(drop=True)
+    tracker.finish(matched=len(funnel))
+    return funnel
+
+
+def funnel_summary(funnel):
+    """Lead counts per funnel step, from the table built by build_funnel."""
+    return {
+        'total': len(funnel),
+        'nao_encontrados': int((funnel['Status Agenda'] == NOT_IN_AGENDA).sum()),
+        'outros_status': int(funnel['Status Agenda'].isin(status_agendamentos_marketing).sum()),
+        'atendidos': int(funnel['Status Agenda'].isin(status_comparecimentos_marketing).sum()),
+        'compraram': int(funnel.loc[funnel['comprou'], 'ID lead'].nunique()),
+        'total_comprado': float(pd.to_numeric(funnel.loc[funnel['comprou'], 'Valor primeiro orçamento'], errors='coerce').sum()),
+    }
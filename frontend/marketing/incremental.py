@@ -0,0 +1,201 @@
+"""
+incremental.py
+responsible for re-running the marketing funnel only for leads whose evidence changed.
+
+The marketing team re-uploads growing exports (the whole month so far) every
+day. Each lead gets a fingerprint of everything its match depends on: its own
+phone, email and entry date, plus the appointments and sales filed under the
+same phone/email keys. The fingerprint is saved in MktLead.match_fingerprint;
+on the next run, leads whose fingerprint is unchanged reuse the stored agenda
+and sale columns and only the rest go through build_funnel.
+"""
+
+import hashlib
+import logging
+
+import numpy as np
+import pandas as pd
+from sqlalchemy.exc import SQLAlchemyError
+
+from backend.database import SessionLocal
+from backend.models.mkt_lead import MktLead
+from frontend.marketing.funnel import FUNNEL_COLUMNS, LEAD_FUNNEL_COLUMNS, build_funnel
+from helpers.cleaner import explode_telephones
+
+logger = logging.getLogger(__name__)
+
+# Bump when the matching rules change, so every stored result is recomputed
+FUNNEL_VERSION = 1
+STORED_QUERY_CHUNK = 1000
+
+APPOINTMENT_EVIDENCE_COLUMNS = ['Data', 'Procedimento', 'Status', 'Unidade do agendamento']
+SALE_EVIDENCE_COLUMNS = ['Data venda', 'Unidade', 'ID orçamento', 'Valor líquido',
+                         'Total comprado pelo cliente', 'Número de orçamentos do cliente']
+
+# MktLead attribute -> funnel column, for the columns reused from the database
+STORED_FUNNEL_COLUMNS = {
+    'appointment_date': 'Data Na Agenda',
+    'appointment_procedure': 'Procedimento',
+    'appointment_status': 'Status Agenda',
+    'appointment_store': 'Unidade da Agenda',
+    'sales_quote_id': 'ID orçamento',
+    'sales_date': 'Data Venda',
+    'sales_store': 'Unidade da Venda',
+    'sales_first_quote': 'Valor primeiro orçamento',
+    'sales_total_bought': 'Total comprado pelo cliente',
+    'sales_number_of_quotes': 'Número de orçamentos do cliente',
+    'sales_purchased': 'comprou',
+}
+
+
+def _row_hashes(df, columns):
+    return pd.util.hash_pandas_object(df[[column for column in columns if column in df]], index=False).to_numpy()
+
+
+def _evidence_by_key(keys, row_hashes):
+    """
+    Combine the row hashes filed under each key into one digest per key.
+    `keys` is indexed by row position (possibly repeated, for exploded phones).
+    Rows are weighted by their order within the key, since the first match depends on it.
+    """
+    keys = keys.fillna('').astype(str).str.strip()
+    keys = keys[keys != '']
+    if keys.empty:
+        return pd.Series(dtype='uint64')
+
+    key_values = keys.to_numpy()
+    order = np.argsort(key_values, kind='stable')
+    sorted_keys = key_values[order]
+    sorted_hashes = row_hashes[keys.index.to_numpy()[order]]
+
+    starts = np.flatnonzero(np.r_[True, sorted_keys[1:] != sorted_keys[:-1]])
+    rank = np.arange(len(sorted_keys)) - np.repeat(starts, np.diff(np.r_[starts, len(sorted_keys)]))
+    # uint64 arithmetic wraps around, which is what a digest wants
+    weighted = sorted_hashes * (2 * rank.astype(np.uint64) + 1)
+    return pd.Series(np.add.reduceat(weighted, starts), index=sorted_keys[starts])
+
+
+def _lookup(evidence, keys):
+    values = np.zeros(len(keys), dtype='uint64')
+    positions = evidence.index.get_indexer(keys.fillna('').astype(str).str.strip())
+    found = positions >= 0
+    values[found] = evidence.to_numpy(dtype='uint64')[positions[found]]
+    return values
+
+
+def evidence_fingerprints(df_leads, df_appointments, df_sales, window_days=None):
+    """
+    Fingerprint, per lead, of every input its funnel row depends on.
+
+    Returns:
+        pd.Series: 16-char hex digest aligned to df_leads.index
+    """
+    appointments = df_appointments.reset_index(drop=True)
+    appointment_hashes = _row_hashes(appointments, APPOINTMENT_EVIDENCE_COLUMNS)
+    appointment_phones = _evidence_by_key(explode_telephones(appointments['Telefones Limpos']), appointment_hashes)
+    appointment_emails = _evidence_by_key(appointments['Email'], appointment_hashes)
+
+    sales = df_sales.reset_index(drop=True)
+    sale_phones = _evidence_by_key(explode_telephones(sales['Telefones Limpos']), _row_hashes(sales, SALE_EVIDENCE_COLUMNS))
+
+    salt = int(hashlib.sha1(f"{FUNNEL_VERSION}:{window_days}".encode()).hexdigest()[:16], 16)
+    with np.errstate(over='ignore'):
+        digest = (
+            _row_hashes(df_leads, ['Telefone do lead', 'Email do lead', 'Dia da entrada'])
+            + np.uint64(3) * _lookup(appointment_phones, df_leads['Telefone do lead'])
+            + np.uint64(5) * _lookup(appointment_emails, df_leads['Email do lead'])
+            + np.uint64(7) * _lookup(sale_phones, df_leads['Telefone do lead'])
+            + np.uint64(salt)
+        )
+    return pd.Series([f"{value:016x}" for value in digest], index=df_leads.index)
+
+
+def lead_ids(series):
+    """Lead IDs as nullable integers, the type of MktLead.lead_id."""
+    return pd.to_numeric(series, errors='coerce').astype('Int64')
+
+
+def load_stored_results(ids):
+    """
+    Stored funnel results for the given lead IDs.
+
+    Returns:
+        pd.DataFrame indexed by lead_id with match_fingerprint and the STORED_FUNNEL_COLUMNS
+        (empty when the database cannot be read)
+    """
+    attributes = ['lead_id', 'match_fingerprint', *STORED_FUNNEL_COLUMNS]
+    ids = [int(lead_id) for lead_id in pd.unique(ids.dropna())]
+    rows = []
+
+    session = SessionLocal()
+    try:
+        for start in range(0, len(ids), STORED_QUERY_CHUNK):
+            chunk = ids[start:start + STORED_QUERY_CHUNK]
+            rows.extend(
+                session.query(*[getattr(MktLead, attribute) for attribute in attributes])
+                .filter(MktLead.lead_id.in_(chunk), MktLead.match_fingerprint.isnot(None))
+                .all()
+            )
+    except SQLAlchemyError as e:
+        logger.warning(f"Could not read stored funnel results, matching every lead: {str(e)}")
+        rows = []
+    finally:
+        session.close()
+
+    return pd.DataFrame(rows, columns=attributes).set_index('lead_id')
+
+
+def _restore(leads, stored):
+    """Funnel rows for reused leads: lead columns from the upload, agenda and sale columns from the database."""
+    funnel = leads.rename(columns=LEAD_FUNNEL_COLUMNS)
+    restored = stored.rename(columns=STORED_FUNNEL_COLUMNS)
+    for column in STORED_FUNNEL_COLUMNS.values():
+        funnel[column] = restored[column].to_numpy()
+
+    # Stored as text; the fresh funnel carries numbers and dates
+    for column in ['Valor primeiro orçamento', 'Total comprado pelo cliente', 'Número de orçamentos do cliente']:
+        funnel[column] = pd.to_numeric(funnel[column], errors='coerce')
+    funnel['comprou'] = funnel['comprou'].eq(True)
+    sale_dates = pd.to_datetime(funnel['Data Venda'], errors='coerce')
+    funnel['Dia'] = sale_dates.dt.day
+    funnel['Mês da Venda'] = sale_dates.dt.month
+    funnel['intervalo da compra'] = (sale_dates - pd.to_datetime(funnel['Dia da entrada'], errors='coerce')).dt.days
+
+    funnel = funnel[FUNNEL_COLUMNS].fillna("")
+    funnel['ID lead'] = pd.to_numeric(funnel['ID lead'], errors='coerce')
+    funnel['Valor primeiro orçamento'] = pd.to_numeric(funnel['Valor primeiro orçamento'], errors='coerce')
+    return funnel
+
+
+def build_incremental_funnel(df_leads, df_appointments, df_sales, progress=None, window_days=None, reuse_stored=True):
+    """
+    Same table as build_funnel, reusing the stored result of every lead whose fingerprint did not change.
+    With reuse_stored=False every lead is matched, but the fingerprints are still returned for saving.
+
+    Returns:
+        tuple: (funnel, fingerprints, stats)
+            - fingerprints (pd.Series): fingerprint per lead, aligned to funnel.index, to save with it
+            - stats (dict): {"reused": int, "matched": int}
+    """
+    leads = df_leads.loc[~df_leads['ID do lead'].duplicated(), list(LEAD_FUNNEL_COLUMNS)]
+    fingerprints = evidence_fingerprints(leads, df_appointments, df_sales, window_days)
+
+    ids = lead_ids(leads['ID do lead'])
+    stored = load_stored_results(ids) if reuse_stored else None
+    if stored is None or stored.empty:
+        reuse = np.zeros(len(leads), dtype=bool)
+    else:
+        reuse = ids.map(stored['match_fingerprint']).to_numpy(dtype=object) == fingerprints.to_numpy(dtype=object)
+
+    fresh = build_funnel(leads[~reuse], df_appointments, df_sales, progress=progress, window_days=window_days)
+    fresh.index = leads.index[~reuse]
+    reused = _restore(leads[reuse], stored.loc[ids[reuse].to_numpy()]) if reuse.any() else None
+    if reused is not None:
+        reused.index = leads.index[reuse]
+
+    parts = [part for part in [fresh, reused] if part is not None and not part.empty] or [fresh]
+    funnel = pd.concat(parts).loc[leads.index]
+
+    stats = {"reused": int(reuse.sum()), "matched": int((~reuse).sum())}
+    logger.info(f"Incremental funnel: {stats['reused']} leads reused, {stats['matched']} matched")
+    return funnel.reset_index(drop=True), fingerprints.reset_index(drop=True), stats
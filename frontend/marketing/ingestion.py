@@ -0,0 +1,178 @@
+"""
+ingestion.py
+responsible for turning the uploaded leads, appointments and sales spreadsheets into cleaned DataFrames.
+
+Uploaded files stay in the widget state, so Streamlit hands the same bytes back
+on every rerun. Each file is hashed and the cleaned DataFrame is kept in a
+columnar cache (Parquet on disk, plus a small in-memory layer) keyed by that
+hash, so a rerun or a re-upload of the same file skips parsing entirely.
+Files that are not cached yet are parsed in parallel, with the calamine Excel
+reader (python-calamine, several times faster than openpyxl). Both it and
+pyarrow, which the Parquet cache needs, are in requirements.txt; without them
+parsing falls back to openpyxl and only the in-memory cache survives.
+"""
+
+import hashlib
+import io
+import logging
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from frontend.marketing.apt_cleaner import stores_to_remove
+from frontend.marketing.worker import clean_agd_df, clean_sales_df
+from frontend.leads.lead_category import process_lead_categories
+from helpers.cleaner import normalize_phones
+from helpers.date import (transform_date_from_sales,
+                          transform_date_from_leads,
+                          transform_date_from_appointments)
+
+logger = logging.getLogger(__name__)
+
+# Bump when the cleaning steps below change, so stale cached files are ignored
+INGEST_VERSION = 2
+INGEST_CACHE_DIR = os.path.join(tempfile.gettempdir(), "dash_streamlit_ingest")
+MEMORY_CACHE_SIZE = 6
+
+_memory_cache = OrderedDict()
+_memory_lock = threading.Lock()
+
+
+def _excel_engine():
+    try:
+        import python_calamine  # noqa: F401
+        return "calamine"
+    except ImportError:
+        return "openpyxl"
+
+
+def read_excel(content):
+    """Parse XLSX bytes with the fastest available engine."""
+    return pd.read_excel(io.BytesIO(content), engine=_excel_engine())
+
+
+def clean_leads(df_leads):
+    df_leads = df_leads.loc[~df_leads['Unidade'].isin(stores_to_remove)]
+    df_leads = transform_date_from_leads(df_leads)
+    df_leads = process_lead_categories(df_leads)
+    # Canonical phone key, computed once here and reused by every match
+    df_leads['Telefone do lead'] = normalize_phones(df_leads['Telefone do lead'])
+    return df_leads
+
+
+def clean_appointments(df_appointments):
+    df_appointments = clean_agd_df(df_appointments)
+    df_appointments = transform_date_from_appointments(df_appointments)
+    return df_appointments
+
+
+def clean_sales(df_sales):
+    df_sales = clean_sales_df(df_sales)
+    df_sales = transform_date_from_sales(df_sales)
+    return df_sales
+
+
+CLEANERS = {
+    "leads": clean_leads,
+    "appointments": clean_appointments,
+    "sales": clean_sales,
+}
+
+
+def content_hash(content):
+    return hashlib.sha1(content).hexdigest()
+
+
+def ingest(kind, content):
+    """
+    Parse and clean one uploaded spreadsheet, reusing the cached result for identical content.
+
+    Args:
+        kind: "leads", "appointments" or "sales"
+        content: Raw bytes of the uploaded XLSX file
+
+    Returns:
+        pd.DataFrame: Cleaned DataFrame (a copy, safe to modify)
+    """
+    cache_key = f"{kind}_v{INGEST_VERSION}_{content_hash(content)}"
+
+    with _memory_lock:
+        df = _memory_cache.get(cache_key)
+        if df is not None:
+            _memory_cache.move_to_end(cache_key)
+            return df.copy()
+
+    df = _read_cached(cache_key)
+    if df is None:
+        started = time.monotonic()
+        df = CLEANERS[kind](read_excel(content))
+        logger.info(f"Parsed {kind} upload ({len(df)} rows) in {time.monotonic() - started:.2f}s")
+        _write_cached(cache_key, df)
+
+    with _memory_lock:
+        _memory_cache[cache_key] = df
+        while len(_memory_cache) > MEMORY_CACHE_SIZE:
+            _memory_cache.popitem(last=False)
+    return df.copy()
+
+
+def ingest_uploads(uploads):
+    """
+    Ingest several uploaded files in parallel.
+
+    Args:
+        uploads: dict kind -> uploaded file (or None when not uploaded yet)
+
+    Returns:
+        dict: kind -> cleaned DataFrame (None for files not uploaded)
+    """
+    contents = {kind: upload.getvalue() for kind, upload in uploads.items() if upload is not None}
+    results = {kind: None for kind in uploads}
+    if not contents:
+        return results
+
+    with ThreadPoolExecutor(max_workers=len(contents)) as executor:
+        futures = {kind: executor.submit(ingest, kind, content) for kind, content in contents.items()}
+        for kind, future in futures.items():
+            results[kind] = future.result()
+    return results
+
+
+def _cache_path(cache_key):
+    return os.path.join(INGEST_CACHE_DIR, f"{cache_key}.parquet")
+
+
+def _read_cached(cache_key):
+    path = _cache_path(cache_key)
+    if not os.path.exists(path):
+        return None
+    try:
+        df = pd.read_parquet(path)
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable ingest cache {path}: {str(e)}")
+        return None
+    # Parquet list columns come back as numpy arrays; the matchers expect lists
+    for column in df.columns:
+        if df[column].dtype == object and df[column].map(lambda value: isinstance(value, np.ndarray)).any():
+            df[column] = df[column].map(lambda value: value.tolist() if isinstance(value, np.ndarray) else value)
+    return df
+
+
+def _write_cached(cache_key, df):
+    path = _cache_path(cache_key)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(INGEST_CACHE_DIR, exist_ok=True)
+        df.to_parquet(tmp_path)
+        os.replace(tmp_path, path)
+    except Exception as e:
+        # Mixed-type object columns cannot be stored as Parquet; the memory cache still applies
+        logger.warning(f"Could not write ingest cache for {cache_key}: {str(e)}")
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
@@ -0,0 +1,120 @@
+"""
+parallel.py
+responsible for resolving very large lead uploads across several cores.
+
+The appointment index (phone -> position, email -> position and the columns
+copied to the leads) is built once in the Streamlit process and written to
+Arrow IPC files. Worker processes memory-map those files read-only instead of
+receiving a pickled copy each. Leads are partitioned by a hash of their phone
+key, every partition is resolved with worker.resolve_matches, and the results
+are put back in the original lead order, so the output is identical to the
+single-process path.
+
+Only used with match_leads_to_appointments(parallel=True): the lookup it spreads
+is already vectorized, and on 300k leads the pool (spawn start-up, Arrow writes,
+pickled partitions) is slower than resolving in-process.
+"""
+
+import logging
+import multiprocessing
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+except ImportError:
+    # Without pyarrow the index cannot be shared, so matching stays in-process
+    pa = None
+
+logger = logging.getLogger(__name__)
+
+MAX_WORKERS = max(1, min(8, (os.cpu_count() or 2) - 1))
+
+def _write_index(appointment_index, path):
+    phone_index, email_index, payload = appointment_index
+    # One Arrow IPC file per piece; workers memory-map them read-only
+    tables = [
+        pa.table({"key": phone_index.index.astype(str), "position": phone_index.to_numpy()}),
+        pa.table({"key": email_index.index.astype(str), "position": email_index.to_numpy()}),
+        pa.Table.from_pandas(payload, preserve_index=False),
+    ]
+    for i, table in enumerate(tables):
+        with pa.OSFile(f"{path}.{i}.arrow", "wb") as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+
+
+def _read_index(path):
+    tables = []
+    for i in range(3):
+        source = pa.memory_map(f"{path}.{i}.arrow", "r")
+        tables.append(pa.ipc.open_file(source).read_all())
+    phone_table, email_table, payload_table = tables
+    phone_index = pd.Series(phone_table.column("position").to_numpy(), index=phone_table.column("key").to_pandas())
+    email_index = pd.Series(email_table.column("position").to_numpy(), index=email_table.column("key").to_pandas())
+    return phone_index, email_index, payload_table.to_pandas()
+
+
+_worker_index = None
+
+
+def _init_worker(path):
+    global _worker_index
+    _worker_index = _read_index(path)
+
+
+def _resolve_partition(df_partition):
+    from frontend.marketing.worker import resolve_matches
+    return resolve_matches(df_partition, _worker_index)
+
+
+def partition_leads(df_leads, partitions):
+    """Split leads into partitions by a hash of their phone key (stable across runs)."""
+    phones = df_leads['Telefone do lead'].fillna('').astype(str)
+    buckets = pd.util.hash_pandas_object(phones, index=False).to_numpy() % partitions
+    return [df_leads[buckets == bucket] for bucket in range(partitions)]
+
+
+def resolve_matches_in_pool(df_leads, appointment_index, workers=MAX_WORKERS):
+    """
+    Resolve leads against an appointment index in a process pool.
+
+    Returns:
+        DataFrame aligned to df_leads.index, identical to worker.resolve_matches
+    """
+    from frontend.marketing.worker import resolve_matches
+
+    if df_leads.empty:
+        return resolve_matches(df_leads, appointment_index)
+    if pa is None:
+        logger.warning("pyarrow is not installed, falling back to single-process matching")
+        return resolve_matches(df_leads, appointment_index)
+
+    started = time.monotonic()
+    # Workers only need the match keys; positions keep the original order
+    positioned = df_leads[['Telefone do lead', 'Email do lead']].reset_index(drop=True)
+
+    with tempfile.TemporaryDirectory(prefix="dash_match_") as tmp_dir:
+        path = os.path.join(tmp_dir, "appointment_index")
+        try:
+            _write_index(appointment_index, path)
+        except pa.ArrowException as e:
+            # Mixed-type appointment columns cannot be stored as Arrow
+            logger.warning(f"Falling back to single-process matching: {str(e)}")
+            return resolve_matches(df_leads, appointment_index)
+
+        # spawn: forking the multi-threaded Streamlit server is not safe
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                                 initializer=_init_worker, initargs=(path,)) as executor:
+            parts = [part for part in partition_leads(positioned, workers) if not part.empty]
+            results = list(executor.map(_resolve_partition, parts))
+
+    result = pd.concat(results).sort_index()
+    result.index = df_leads.index
+    logger.info(f"Matched {len(df_leads)} leads on {workers} processes in {time.monotonic() - started:.2f}s")
+    return result
@@ -0,0 +1,90 @@
+"""
+progress.py
+responsible for reporting progress of the marketing matching stages.
+
+The matching functions accept an optional `progress` callback. They create a
+StageProgress for their stage and the index lookups advance it once per chunk
+of CHUNK_ROWS leads (resolve_in_chunks); the callback receives a plain dict event:
+
+    {"stage": "atendidos", "done": 1200, "total": 5000, "matched": 310, "elapsed": 0.8, "finished": False}
+
+The UI decides how to render it (see components/progress_bar.py).
+"""
+
+import time
+
+import pandas as pd
+
+REPORT_EVERY = 250  # rows between progress events
+CHUNK_ROWS = 50_000  # leads resolved between advance() calls
+
+
+class StageProgress:
+    """Progress of one matching stage, emitted to an optional callback."""
+
+    def __init__(self, callback, stage, total):
+        self.callback = callback
+        self.stage = stage
+        self.total = total
+        self.done = 0
+        self.matched = 0
+        self.started = time.perf_counter()
+        self._last_reported = 0
+        self._emit(finished=False)
+
+    def advance(self, rows=1, matched=0):
+        self.done += rows
+        self.matched += matched
+        if self.done - self._last_reported >= REPORT_EVERY:
+            self._last_reported = self.done
+            self._emit(finished=False)
+
+    def finish(self, matched=None):
+        if matched is not None:
+            self.matched = matched
+        self.done = self.total
+        self._emit(finished=True)
+
+    def _emit(self, finished):
+        if self.callback is None:
+            return
+        self.callback({
+            "stage": self.stage,
+            "done": self.done,
+            "total": self.total,
+            "matched": self.matched,
+            "elapsed": time.perf_counter() - self.started,
+            "finished": finished,
+        })
+
+
+def resolve_in_chunks(df, resolve, tracker=None, matched=None, chunked=True):
+    """
+    Run a row-independent resolver over df in CHUNK_ROWS slices, advancing the
+    tracker after each one, so a stage reports progress while it runs.
+
+    Args:
+        df: Leads to resolve
+        resolve: Function of a slice of df returning rows aligned to that slice
+        tracker: StageProgress of the stage (None: a single call, no events)
+        matched: Function of a resolved slice returning a boolean Series of matched rows
+        chunked: False resolves everything in one call, for resolvers that would
+            redo their setup for every slice
+
+    Returns:
+        Concatenated results, aligned to df.index
+    """
+    if tracker is None or not chunked or len(df) <= CHUNK_ROWS:
+        result = resolve(df)
+        if tracker is not None:
+            tracker.advance(len(df), matched=int(matched(result).sum()) if matched else 0)
+        return result
+
+    parts = []
+    for start in range(0, len(df), CHUNK_ROWS):
+        part = resolve(df.iloc[start:start + CHUNK_ROWS])
+        tracker.advance(len(part), matched=int(matched(part).sum()) if matched else 0)
+        parts.append(part)
+    # A slice without any match has all-None columns: concatenate as object and
+    # infer the dtypes once, as a single call would have
+    return pd.concat([part.astype(object) for part in parts]).infer_objects()
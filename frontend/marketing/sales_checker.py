@@ -1,10 +1,15 @@
 import pandas as pd
 import re
 from datetime import datetime
-from helpers.cleaner import clean_telephone
+from helpers.cleaner import explode_telephones
+from frontend.marketing.progress import StageProgress, resolve_in_chunks
+from frontend.marketing.temporal import nearest_after
 
-def check_if_lead_has_purchased(df_leads_cleaned_final, df_sales):
+def check_if_lead_has_purchased(df_leads_cleaned_final, df_sales, progress=None, window_days=None):
     """
+    With window_days, each lead gets the nearest sale on or after 'Dia da entrada'
+    (within that many days) instead of the first sale of its phone.
+
     # Merge the exploded DataFrame with df_leads
     df_leads_compras = pd.merge(
         df_leads_copy,
@@ -22,23 +27,16 @@ def check_if_lead_has_purchased(df_leads_cleaned_final, df_sales):
     df_leads_compras = df_leads_compras.drop_duplicates(subset='Email do lead', keep='first')
     df_leads_compras['Valor líquido'].sum()
     """
-    leads = df_leads_cleaned_final.copy()
-    sales = df_sales.copy()
-    
-    leads['Telefone do lead'] = leads['Telefone do lead'].fillna('Cliente sem telefone')
-    leads['Telefone do lead'] = leads['Telefone do lead'].astype(str)
-    leads['Telefone do lead'] = leads['Telefone do lead'].apply(clean_telephone)
-    
-    sales['Telefones Limpos'] = sales['Telefones Limpos'].fillna('Cliente sem telefone')
-    sales['Telefones Limpos'] = sales['Telefones Limpos'].astype(str)
-    sales['Telefones Limpos'] = sales['Telefones Limpos'].apply(clean_telephone)
-    
-    # Merge the exploded DataFrame with df_leads
+    tracker = StageProgress(progress, 'compras', len(df_leads_cleaned_final))
+    leads = df_leads_cleaned_final.reset_index(drop=True)
+    purchases = match_leads_to_sales(leads, df_sales, window_days=window_days, tracker=tracker)
+
+    # Merge the matched sale of each lead with df_leads
     df_leads_compras = pd.merge(
         leads,
-        sales,
-        left_on='Telefone do lead',
-        right_on='Telefones Limpos',
+        purchases,
+        left_index=True,
+        right_index=True,
         how='left'
     )
 
@@ -50,6 +48,56 @@ def check_if_lead_has_purchased(df_leads_cleaned_final, df_sales):
     df_leads_compras = df_leads_compras.drop_duplicates(subset='ID do lead', keep='first')
     # df_leads_compras = df_leads_compras.drop_duplicates(subset='Email do lead', keep='first')
     # df_leads_compras['Valor líquido'].sum()
-    
+
+    tracker.finish(matched=int(df_leads_compras['comprou'].sum()))
     return df_leads_compras
-    
\ No newline at end of file
+
+def match_leads_to_sales(df_leads, df_sales, window_days=None, tracker=None):
+    """
+    Find the sale of each lead by its canonical phone: the first sale of that number
+    or, with window_days, the nearest sale on or after 'Dia da entrada'.
+
+    Sales are exploded to one row per customer telephone, so 'Telefones Limpos'
+    of the returned row is the number that matched.
+
+    Args:
+        tracker: StageProgress advanced as chunks of leads are resolved (progress.resolve_in_chunks);
+            the temporal mode advances it once
+
+    Returns:
+        DataFrame with the sales columns aligned to df_leads.index (all NaN when the lead did not buy)
+    """
+    sales = df_sales.reset_index(drop=True)
+    sales_phones = explode_telephones(sales['Telefones Limpos'])
+    sales = sales.loc[sales_phones.index].assign(**{'Telefones Limpos': sales_phones.to_numpy()})
+    sales = sales.reset_index(drop=True)
+
+    if window_days is None:
+        # Position of the first sale of each number: an exact many-to-one hash join
+        first_sale = sales['Telefones Limpos'].drop_duplicates(keep='first')
+        first_sale = pd.Series(first_sale.index, index=first_sale.to_numpy())
+
+        def resolve(leads):
+            # Lead phones are canonical keys from ingest; only missing values need filling
+            positions = leads['Telefone do lead'].fillna('').astype(str).map(first_sale).to_numpy(dtype=float)
+            return _purchases_from_positions(leads, sales, positions)
+
+        return resolve_in_chunks(df_leads, resolve, tracker, matched=_matched_sale)
+
+    def resolve_temporal(leads):
+        positions, _ = nearest_after(
+            leads['Telefone do lead'].fillna('').astype(str), leads['Dia da entrada'],
+            sales['Telefones Limpos'], sales['Data venda'], window_days
+        )
+        return _purchases_from_positions(leads, sales, positions)
+
+    # The as-of join sorts all sales on every call, so it is not chunked
+    return resolve_in_chunks(df_leads, resolve_temporal, tracker, matched=_matched_sale, chunked=False)
+
+def _purchases_from_positions(df_leads, sales, positions):
+    purchases = sales.reindex(pd.Index(positions))
+    purchases.index = df_leads.index
+    return purchases
+
+def _matched_sale(purchases):
+    return purchases['Unidade'].notna()
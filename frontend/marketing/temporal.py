@@ -0,0 +1,90 @@
+"""
+temporal.py
+responsible for time-aware matching: the nearest record on or after the lead entry.
+
+Instead of the first appointment/sale in file order, each lead gets the one
+with the earliest date on or after its 'Dia da entrada' (same day included),
+within a window of days. Implemented as a sorted as-of join (pd.merge_asof,
+direction='forward') grouped by the match key.
+"""
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_MATCH_WINDOW_DAYS = 90
+
+
+def nearest_after(lead_keys, lead_times, record_keys, record_times, window_days=DEFAULT_MATCH_WINDOW_DAYS):
+    """
+    For each lead, find the position of the earliest record with the same key
+    dated on or after the lead, at most `window_days` later.
+
+    Args:
+        lead_keys: Series of keys, one per lead (in lead order)
+        lead_times: Series of lead entry datetimes, aligned with lead_keys
+        record_keys: Series of keys whose index is the record position (may repeat, e.g. exploded phones)
+        record_times: Series of record datetimes indexed by record position
+        window_days: Maximum days between the lead entry and the record
+
+    Returns:
+        tuple of numpy arrays: (position, time) per lead; NaN / NaT when nothing matched
+    """
+    n_leads = len(lead_keys)
+    positions = np.full(n_leads, np.nan)
+    times = np.full(n_leads, np.datetime64('NaT'), dtype='datetime64[ns]')
+
+    left = pd.DataFrame({
+        'key': lead_keys.fillna('').astype(str).str.strip().to_numpy(),
+        # Appointments and sales carry dates only, so compare whole days
+        'when': pd.to_datetime(lead_times, errors='coerce').dt.normalize().to_numpy(),
+        'lead': np.arange(n_leads),
+    })
+    left = left[(left['key'] != '') & left['when'].notna()]
+
+    record_keys = record_keys.fillna('').astype(str).str.strip()
+    record_keys = record_keys[record_keys != '']
+    right = pd.DataFrame({
+        'key': record_keys.to_numpy(),
+        'when': pd.to_datetime(record_times, errors='coerce').dt.normalize().reindex(record_keys.index).to_numpy(),
+        'position': record_keys.index.to_numpy(),
+    })
+    right = right[right['when'].notna()]
+
+    if left.empty or right.empty:
+        return positions, times
+
+    # merge_asof needs both sides sorted on the time column; position breaks ties deterministically
+    left = left.sort_values('when', kind='stable')
+    right = right.sort_values(['when', 'position'], kind='stable')
+    right['matched_when'] = right['when']
+
+    matched = pd.merge_asof(
+        left, right,
+        on='when', by='key',
+        direction='forward',
+        tolerance=pd.Timedelta(days=window_days),
+        allow_exact_matches=True
+    )
+    matched = matched[matched['position'].notna()]
+
+    positions[matched['lead'].to_numpy()] = matched['position'].to_numpy(dtype=float)
+    times[matched['lead'].to_numpy()] = matched['matched_when'].to_numpy()
+    return positions, times
+
+
+def earliest(candidates):
+    """
+    Combine several (position, time) candidates per lead, keeping the earliest
+    time and, on ties, the lowest position.
+    """
+    best_positions, best_times = candidates[0]
+    best_positions, best_times = best_positions.copy(), best_times.copy()
+    for positions, times in candidates[1:]:
+        better = ~np.isnat(times) & (
+            np.isnat(best_times)
+            | (times < best_times)
+            | ((times == best_times) & (positions < best_positions))
+        )
+        best_positions[better] = positions[better]
+        best_times[better] = times[better]
+    return best_positions, best_times
@@ -4,10 +4,11 @@ responsible for doing the hard work of checking if leads are appointments and if
 """
 
 import re
+import numpy as np
 import pandas as pd
 from datetime import datetime
 
-from helpers.cleaner import clean_telephone
+from helpers.cleaner import explode_telephones
 from frontend.appointments.appointment_cleaner import ( 
     filter_relevant_appointments_to_mkt,
     filter_appointments_aval_comparecimentos, 
@@ -15,6 +16,8 @@ from frontend.appointments.appointment_cleaner import (
 from frontend.sales.sale_columns import colunas_reduzido
 from frontend.sales.sales_cleaner import filter_relevant_sales_to_mkt
 from frontend.leads.leads_cleaner import filter_relevant_leads_to_mkt
+from frontend.marketing.progress import StageProgress, resolve_in_chunks
+from frontend.marketing.temporal import DEFAULT_MATCH_WINDOW_DAYS, nearest_after, earliest
 
 def clean_lead_df(df_leads):
 
@@ -34,82 +37,159 @@ def clean_sales_df(df_sales):
 
     return df_sales
 
-def check_if_lead_has_atendido_status(df_leads_cleaned, df_appointments_comparecimentos):
+APPOINTMENT_MATCH_COLUMNS = {
+    'data_agenda': 'Data',
+    'procedimento': 'Procedimento',
+    'status': 'Status',
+    'unidade': 'Unidade do agendamento',
+}
+
+def _first_position_by_key(keys):
+    """
+    Hash index from a key (phone or email) to the position of its first row.
+    `keys` is indexed by row position (possibly repeated, for exploded phones).
+    Empty keys are left out so leads without phone/email never match.
+    """
+    keys = keys.fillna('').astype(str).str.strip()
+    keys = keys[keys != '']
+    positions = pd.Series(keys.index.to_numpy(), index=keys.to_numpy())
+    return positions[~positions.index.duplicated(keep='first')]
+
+def build_appointment_index(df_appointments):
+    """
+    Index appointments once: canonical phone -> first position, email -> first position,
+    plus the appointment columns copied to the matched leads.
+
+    Returns:
+        tuple: (phone_index, email_index, payload)
+    """
+    df_appointments = df_appointments.reset_index(drop=True)
+    # 'Telefones Limpos' holds the canonical keys of every customer number, computed at ingest
+    phone_index = _first_position_by_key(explode_telephones(df_appointments['Telefones Limpos']))
+    email_index = _first_position_by_key(df_appointments['Email'])
+    payload = df_appointments[list(APPOINTMENT_MATCH_COLUMNS.values())]
+    return phone_index, email_index, payload
+
+def resolve_matches(df_leads, appointment_index):
+    """
+    Resolve every lead against an appointment index with vectorized lookups.
+
+    Returns:
+        DataFrame aligned to df_leads.index with columns data_agenda, procedimento,
+        status and unidade (None when the lead has no appointment)
+    """
+    phone_index, email_index, payload = appointment_index
+
+    lead_phones = df_leads['Telefone do lead'].fillna('').astype(str).str.strip()
+    lead_emails = df_leads['Email do lead'].fillna('').astype(str).str.strip()
+
+    # First match in appointment order, whichever key found it
+    positions = np.fmin(
+        lead_phones.map(phone_index).to_numpy(dtype=float),
+        lead_emails.map(email_index).to_numpy(dtype=float)
+    )
+    return _matches_from_positions(df_leads, payload, positions)
+
+def resolve_matches_temporal(df_leads, df_appointments, window_days=DEFAULT_MATCH_WINDOW_DAYS):
+    """
+    Match each lead to its nearest appointment on or after 'Dia da entrada', within window_days,
+    by phone or email (as-of joins, see frontend/marketing/temporal.py).
+
+    Returns:
+        DataFrame aligned to df_leads.index (see resolve_matches)
+    """
+    df_appointments = df_appointments.reset_index(drop=True)
+    appointment_dates = df_appointments['Data']
+    candidates = [
+        nearest_after(df_leads['Telefone do lead'], df_leads['Dia da entrada'],
+                      explode_telephones(df_appointments['Telefones Limpos']), appointment_dates, window_days),
+        nearest_after(df_leads['Email do lead'], df_leads['Dia da entrada'],
+                      df_appointments['Email'], appointment_dates, window_days),
+    ]
+    positions, _ = earliest(candidates)
+    return _matches_from_positions(df_leads, df_appointments[list(APPOINTMENT_MATCH_COLUMNS.values())], positions)
+
+def _matches_from_positions(df_leads, payload, positions):
+    matched = ~np.isnan(positions)
+    matched_positions = positions[matched].astype(int)
+
+    result = pd.DataFrame(index=df_leads.index, columns=list(APPOINTMENT_MATCH_COLUMNS), dtype=object)
+    for column, source in APPOINTMENT_MATCH_COLUMNS.items():
+        values = np.full(len(df_leads), None, dtype=object)
+        # Take the matched rows before converting: payload may be much larger than df_leads
+        values[matched] = payload[source].take(matched_positions).to_numpy(dtype=object)
+        result[column] = values
+
+    return result.infer_objects()
+
+def _matched_appointment(matches):
+    return matches['status'].notna()
+
+def match_leads_to_appointments(df_leads, df_appointments, parallel=False, window_days=None, tracker=None):
+    """
+    Find, for each lead, the first appointment with the same cleaned phone or the same email.
+
+    Appointments are indexed once (key -> first appointment position) and every
+    lead is resolved with vectorized lookups, instead of scanning all
+    appointments for each lead. Customers with several telephones get one
+    index entry per number, so each of them matches exactly.
+
+    Args:
+        parallel: Resolve leads in a process pool (frontend/marketing/parallel.py). Opt-in: the lookup
+            is already vectorized, so the pool's start-up and IPC cost more than it saves
+        window_days: When set, use the temporal mode instead: the nearest appointment on or after
+            the lead entry within this many days (resolve_matches_temporal)
+        tracker: StageProgress advanced as chunks of leads are resolved (progress.resolve_in_chunks);
+            the temporal mode and the process pool advance it once
+
+    Returns:
+        DataFrame aligned to df_leads.index (see resolve_matches)
+    """
+    if window_days is not None:
+        # The as-of join sorts all appointments on every call, so it is not chunked
+        return resolve_in_chunks(df_leads, lambda leads: resolve_matches_temporal(leads, df_appointments, window_days),
+                                 tracker, matched=_matched_appointment, chunked=False)
+
+    appointment_index = build_appointment_index(df_appointments)
+
+    if parallel:
+        from frontend.marketing.parallel import resolve_matches_in_pool
+        return resolve_in_chunks(df_leads, lambda leads: resolve_matches_in_pool(leads, appointment_index),
+                                 tracker, matched=_matched_appointment, chunked=False)
+
+    return resolve_in_chunks(df_leads, lambda leads: resolve_matches(leads, appointment_index),
+                             tracker, matched=_matched_appointment)
+
+def check_if_lead_has_atendido_status(df_leads_cleaned, df_appointments_comparecimentos, progress=None, window_days=None):
     """
     Function to check if a lead has an appointment with a status of 'Atendido'
-    and add new columns in the df_leads coming from df_appointments_comparecimentos
+    and add new columns in the df_leads coming from df_appointments_comparecimentos.
+    With window_days, the nearest appointment after the lead entry is used instead of the first one.
     """
     # Create copies to avoid modifying original dataframes
     df_leads_cleaned = df_leads_cleaned.copy()
-    df_appointments_comparecimentos = df_appointments_comparecimentos.copy()
+    tracker = StageProgress(progress, 'atendidos', len(df_leads_cleaned))
 
     # Since Leads and Appointments are cleaned, we can check which leads are appointments_comparecimentos
-    def eh_comparecimento(row):
-        telefone = row['Telefone do lead']
-        email = row['Email do lead']
-
-        # Find matches in df_appointments_comparecimentos
-        match = df_appointments_comparecimentos[
-            (df_appointments_comparecimentos['Telefones Limpos'].apply(lambda x: telefone in x)) |
-            (df_appointments_comparecimentos['Email'] == email)
-        ]
-
-        if not match.empty:
-            data = match.iloc[0]['Data']
-            procedimento = match.iloc[0]['Procedimento']
-            status = match.iloc[0]['Status']
-            unidade = match.iloc[0]['Unidade do agendamento']
-
-            return pd.Series({
-                'data_agenda': data,
-                'procedimento': procedimento,
-                'status': status,
-                'unidade': unidade
-            })
-
-        return pd.Series({'data_agenda': None, 'procedimento': None, 'status': None, 'unidade': None})
-
-    # Apply function to df_leads_cleaned
-    df_leads_cleaned[['data_agenda', 'procedimento', 'status', 'unidade']] = df_leads_cleaned.apply(eh_comparecimento, axis=1)
+    matches = match_leads_to_appointments(df_leads_cleaned, df_appointments_comparecimentos, window_days=window_days, tracker=tracker)
+    df_leads_cleaned[list(APPOINTMENT_MATCH_COLUMNS)] = matches
 
+    tracker.finish(matched=int(matches['status'].notna().sum()))
     return df_leads_cleaned
     
-def check_if_lead_has_other_status(df_leads_nao_atendidos, df_appointments_agendamentos):
+def check_if_lead_has_other_status(df_leads_nao_atendidos, df_appointments_agendamentos, progress=None, window_days=None):
     """
-    Function to check if a lead has an appointment with a status of 'Agendado'
+    Function to check if a lead has an appointment with a status of 'Agendado'.
+    With window_days, the nearest appointment after the lead entry is used instead of the first one.
     """
     # Create copies to avoid modifying original dataframes
     df_leads_nao_atendidos = df_leads_nao_atendidos.copy()
-    df_appointments_agendamentos = df_appointments_agendamentos.copy()
-
-    def eh_agendamento(row):
-        telefone = row['Telefone do lead']
-        email = row['Email do lead']
-
-        # Find matches in df_appointments_agendamentos
-        match = df_appointments_agendamentos[
-            (df_appointments_agendamentos['Telefones Limpos'].apply(lambda x: telefone in x)) |
-            (df_appointments_agendamentos['Email'] == email)
-        ]
-
-        if not match.empty:
-            data = match.iloc[0]['Data']
-            procedimento = match.iloc[0]['Procedimento']
-            status = match.iloc[0]['Status']
-            unidade = match.iloc[0]['Unidade do agendamento']
-
-            return pd.Series({
-                'data_agenda': data,
-                'procedimento': procedimento,
-                'status': status,
-                'unidade': unidade
-            })
-
-        return pd.Series({'data_agenda': None, 'procedimento': None, 'status': None, 'unidade': None})
+    tracker = StageProgress(progress, 'outros_status', len(df_leads_nao_atendidos))
 
-    # Apply function to df_leads_nao_atendidos
-    df_leads_nao_atendidos[['data_agenda', 'procedimento', 'status', 'unidade']] = df_leads_nao_atendidos.apply(eh_agendamento, axis=1)
+    matches = match_leads_to_appointments(df_leads_nao_atendidos, df_appointments_agendamentos, window_days=window_days, tracker=tracker)
+    df_leads_nao_atendidos[list(APPOINTMENT_MATCH_COLUMNS)] = matches
 
+    tracker.finish(matched=int(matches['status'].notna().sum()))
     return df_leads_nao_atendidos
 
 # tetntar concecntrar em um unico arquivo
@@ -3,6 +3,7 @@ import pandas as pd
 from google.oauth2.service_account import Credentials
 from helpers.gsheet import get_gspread_client, get_ss_url
 from helpers.discord import send_discord_message
+from frontend.coc import roster
 from frontend.st_coc.adminLojas import load_page_adminLojas
 from frontend.st_coc.adminConsultoras import load_page_adminConsultoras
 from frontend.st_coc.adminAtendentes import load_page_adminAtendentes
@@ -18,6 +19,13 @@ def load_page_admin():
     st.markdown("---")
     st.subheader("Selecione uma opção abaixo 👇")
 
+    # Edições feitas direto na planilha só aparecem nos relatórios após o cache expirar
+    if st.button("🔄 Atualizar dados da planilha", key="roster_refresh"):
+        roster.invalidate()
+        for key in ["df_lojas", "df_consultoras", "df_atendentes"]:
+            st.session_state.pop(key, None)
+        st.success("Cache da planilha limpo. Os relatórios usarão os dados atualizados.")
+
     with st.expander("Clique para analisar e gerenciar Lojas 🏬"):
         load_page_adminLojas()
     
@@ -1,7 +1,8 @@
 import streamlit as st
 import pandas as pd
 from google.oauth2.service_account import Credentials
-from helpers.gsheet import get_gspread_client, get_ss_url
+from helpers.gsheet import get_ss_url
+from frontend.coc import roster
 from helpers.discord import send_discord_message
 
 def load_page_adminConsultoras():
@@ -22,7 +23,7 @@ def load_page_adminConsultoras():
             with st.spinner("Carregando dados..."):
                 try:
                     spreadsheet_url = get_ss_url()
-                    client = get_gspread_client()
+                    client = roster.get_client()
 
                     # Consultoras
                     sheet_name = client.open_by_url(spreadsheet_url)
@@ -71,6 +72,7 @@ def load_page_adminConsultoras():
                 if submit:
                     try:
                         st.session_state["sheet_consultoras"].append_row([consultora, unidade, turno, tam])
+                        roster.invalidate()
                         st.success(f"Consultora {consultora} inserida com sucesso!")
                         st.warning("Recarregue a página para atualizar os dados.")
 
@@ -1,7 +1,8 @@
 import streamlit as st
 import pandas as pd
 from google.oauth2.service_account import Credentials
-from helpers.gsheet import get_gspread_client, get_ss_url
+from helpers.gsheet import get_ss_url
+from frontend.coc import roster
 from helpers.discord import send_discord_message
 
 def load_page_adminLojas():
@@ -21,7 +22,7 @@ def load_page_adminLojas():
             with st.spinner("Carregando dados..."):
                 try:
                     spreadsheet_url = get_ss_url()
-                    client = get_gspread_client()
+                    client = roster.get_client()
                     sheet = client.open_by_url(spreadsheet_url).worksheet("lojas")
                     dados_lojas = sheet.get_all_values()
 
@@ -62,6 +63,7 @@ def load_page_adminLojas():
                 if submit:
                     try:
                         st.session_state["sheet_lojas"].append_row([loja, tamanho])
+                        roster.invalidate()
                         st.success(f"Loja {loja} inserida com sucesso!")
                         st.warning("Recarregue a página para atualizar os dados.")
 
@@ -2,7 +2,7 @@ import streamlit as st
 import pandas as pd
 from pathlib import Path
 from datetime import datetime, timedelta
-import asyncio
+from helpers import runtime
 from apiCrm.resolvers.coc.fetch_appointmentsByUserReport import fetch_and_process_appointmentsByUserReport 
 from components.date_input import date_input
 
@@ -22,7 +22,7 @@ def load_data(start_date=None, end_date=None, use_api=True):
     if start_date and end_date:
         try:
             # Run the async function using asyncio
-            appointments_data = asyncio.run(fetch_and_process_appointmentsByUserReport(start_date, end_date))
+            appointments_data = runtime.run(fetch_and_process_appointmentsByUserReport(start_date, end_date), key="appointmentByUser_view")
 
             if not appointments_data:
                 st.error("Não foi possível obter dados da API.")
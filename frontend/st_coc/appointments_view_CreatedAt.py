@@ -2,7 +2,7 @@ import streamlit as st
 import pandas as pd
 import plotly.express as px
 from datetime import datetime, timedelta
-import asyncio
+from helpers import runtime
 from apiCrm.resolvers.dashboard.fetch_appointmentReport import fetch_and_process_appointment_report_created_at 
 from frontend.appointments.appointment_columns import appointments_api_clean_columns
 from frontend.appointments.appointment_cleaner import appointment_crm_columns_reorganizer
@@ -25,7 +25,7 @@ def load_data(start_date=None, end_date=None, use_api=False):
     if start_date and end_date:
         try:
             # Run the async function using asyncio
-            appointments_data = asyncio.run(fetch_and_process_appointment_report_created_at(start_date, end_date))
+            appointments_data = runtime.run(fetch_and_process_appointment_report_created_at(start_date, end_date), key="appointments_view_CreatedAt")
 
             if not appointments_data:
                 st.error("Não foi possível obter dados da API.")
@@ -1,4 +1,5 @@
 import asyncio
+from helpers import runtime
 import pandas as pd
 import streamlit as st
 from datetime import datetime, timedelta
@@ -15,7 +16,7 @@ from frontend.coc.columns import (
 )
 from helpers.data_wrestler import highlight_total_row, append_totals_row, enrich_consultora_df
 from frontend.coc.consultoras import get_consultora_from_spreadsheet
-from helpers.coc_worker import normalize_name, apply_formatting_followUpReport
+from helpers.coc_worker import normalize_names, apply_formatting_followUpReport
 from helpers.discord import send_discord_message
 
 
@@ -32,8 +33,8 @@ async def fetch_all_data(start_date, end_date):
 def load_data(start_date=None, end_date=None):
     if start_date and end_date:
         try:
-            # Run both queries concurrently with a single asyncio.run call
-            entries_data, comments_data, gross_sales_data = asyncio.run(fetch_all_data(start_date, end_date))
+            # Run all queries concurrently on the shared async runtime
+            entries_data, comments_data, gross_sales_data = runtime.run(fetch_all_data(start_date, end_date), key="followUpReport_view")
             return pd.DataFrame(entries_data), pd.DataFrame(comments_data), pd.DataFrame(gross_sales_data)
         except Exception as e:
             st.error(f"Erro ao carregar dados: {str(e)}")
@@ -80,11 +81,11 @@ def load_page_followUpReport_and_followUpCommentsReport():
 
             # Add location and shift info
             consultoras_manha,consultoras_tarde = get_consultora_from_spreadsheet()
-            consultoras_manha['Consultora'] = consultoras_manha['Consultora'].apply(normalize_name)
-            consultoras_tarde['Consultora'] = consultoras_tarde['Consultora'].apply(normalize_name)
-            df_entries['Consultora de Vendas'] = df_entries['Consultora de Vendas'].apply(normalize_name)
-            df_comments['name'] = df_comments['name'].apply(normalize_name)
-            df_gross_sales['createdBy'] = df_gross_sales['createdBy'].apply(normalize_name)
+            consultoras_manha['Consultora'] = normalize_names(consultoras_manha['Consultora'])
+            consultoras_tarde['Consultora'] = normalize_names(consultoras_tarde['Consultora'])
+            df_entries['Consultora de Vendas'] = normalize_names(df_entries['Consultora de Vendas'])
+            df_comments['name'] = normalize_names(df_comments['name'])
+            df_gross_sales['createdBy'] = normalize_names(df_gross_sales['createdBy'])
 
             # Step 1: Filter entries where 'Consultora de Vendas' matches the 'Consultora' in consultoras_manha && consultoras_tarde
             df_entries_consultoras_manha = df_entries[df_entries['Consultora de Vendas'].isin(consultoras_manha['Consultora'])]
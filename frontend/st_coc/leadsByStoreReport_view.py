@@ -1,4 +1,5 @@
 import asyncio
+from helpers import runtime
 import pandas as pd
 import streamlit as st
 from datetime import datetime
@@ -7,7 +8,7 @@ from frontend.coc.atendentes import get_atendente_from_spreadsheet
 from frontend.coc.stores import get_stores_from_spreadsheet, get_days_from_dashboard
 from apiCrm.resolvers.coc.fetch_leadsByUserReport import fetch_and_process_leadsByUserReport
 from apiCrm.resolvers.dashboard.fetch_appointmentReport import fetch_and_process_appointment_report_created_at
-from helpers.coc_worker import normalize_name, apply_formatting_leadsByStore
+from helpers.coc_worker import normalize_names, apply_formatting_leadsByStore
 from helpers.data_wrestler import (
     extract_agendamentos,
     append_total_rows_leadsByStore,
@@ -15,6 +16,7 @@ from helpers.data_wrestler import (
 from frontend.coc.columns import leadsByUserColumns, leadsByUser_display_columns
 from frontend.appointments.appointment_types import procedimento_avaliacao, agendamento_status_por_atendente
 from helpers.discord import send_discord_message
+from helpers.live_board import get_live_board, DEFAULT_REFRESH_INTERVAL
 
 async def fetch_leads_and_appointments(start_date, end_date):
     """
@@ -44,7 +46,7 @@ async def fetch_leads_and_appointments(start_date, end_date):
 def load_data(start_date=None, end_date=None):
     if start_date and end_date:
         try:
-            leads_data, appointments_data, leads_data_complete_month = asyncio.run(fetch_leads_and_appointments(start_date, end_date))
+            leads_data, appointments_data, leads_data_complete_month = runtime.run(fetch_leads_and_appointments(start_date, end_date), key="leadsByStoreReport_view")
             return pd.DataFrame(leads_data), pd.DataFrame(appointments_data), pd.DataFrame(leads_data_complete_month)
         except Exception as e:
             st.error(f"Erro ao carregar dados: {str(e)}")
@@ -61,6 +63,10 @@ def load_page_leadsByStore():
     st.subheader("Selecione o intervalo de datas para o relatório:")
     
     start_date, end_date = date_input()
+
+    if st.toggle("Modo ao vivo", key="live_leadsByStore", help=f"Atualiza automaticamente a cada {DEFAULT_REFRESH_INTERVAL} segundos"):
+        live_leadsByStore(start_date, end_date)
+        return
     
     if st.button("Carregar"):
         send_discord_message(f"Loading data in page leadsByStoreReport_view")
@@ -71,169 +77,192 @@ def load_page_leadsByStore():
                 st.warning("Não foram encontrados dados para o período selecionado.")
 
             else:
-                df_leadsByUser = df_leadsByUser[leadsByUserColumns]
-                df_leadsByUser['agendamentos_por_lead'] = 0
-                df_leadsByUser['agendamentos_por_lead'] = df_leadsByUser['messages_count_by_status'].apply(extract_agendamentos)
-                df_leadsByUser = df_leadsByUser.rename(columns={ 
-                    'name': 'Atendente',
-                    'messages_count': 'Leads Puxados',
-                    'unique_messages_count': 'Leads Puxados (únicos)',
-                    'agendamentos_por_lead': 'Agendamentos por lead',
-                    'local': 'Unidade',
-                    'Tam': 'Tam',
-                    'turno': 'Turno',
-                    'success_rate': 'Conversão'
-                })
-                df_leadsByUser = df_leadsByUser.reset_index(drop=True)
-                df_leadsByUser = df_leadsByUser.sort_values(by='Leads Puxados', ascending=False)
-                
-                pro_corpo_stores = get_stores_from_spreadsheet()
-                pro_corpo_stores['Unidade'] = pro_corpo_stores['Unidade'].apply(normalize_name)
-                
-                atendentes_puxadas_manha, atendentes_puxadas_tarde = get_atendente_from_spreadsheet()
-                atendentes_puxadas_total = pd.concat([atendentes_puxadas_manha, atendentes_puxadas_tarde])
-
-                atendentes_puxadas_total['Atendente'] = atendentes_puxadas_total['Atendente'].apply(normalize_name)
-                atendentes_puxadas_total['Unidade'] = atendentes_puxadas_total['Unidade'].apply(normalize_name)
-                df_leadsByUser['Atendente'] = df_leadsByUser['Atendente'].apply(normalize_name)
-
-                # Step 1: filter leadsByUser where 'Atendente' matches the 'Atendente' in atendentes_puxadas_total 
-                df_leadsByUser_total = df_leadsByUser[df_leadsByUser['Atendente'].isin(atendentes_puxadas_total['Atendente'])]
-
-                # Step 2: merge to enrich with additional info (like Unidade, Turno, Tam)
-                df_leadsByUser_total = df_leadsByUser_total.merge(
-                    atendentes_puxadas_total,
-                    how='left',
-                    left_on='Atendente',
-                    right_on='Atendente'
-                )
-                # Extract Attendants from the pre-defined lists
-                df_leadsByUser_total = df_leadsByUser_total[leadsByUser_display_columns]
-                                
-                # COC rules:
-                # 1) Status = agendamento_status_por_atendente
-                # 2) Procedimento = procedimento_avaliacao
-                df_appointments_agendamentos = df_appointments[
-                                            (df_appointments['Status'].isin(agendamento_status_por_atendente)) 
-                                            & (df_appointments['Procedimento'].isin(procedimento_avaliacao))]
-                
-                # 3) Data primeira atendente = start_date
-                df_appointments_agendamentos['Data primeira atendente'] = pd.to_datetime(
-                    df_appointments_agendamentos['Data primeira atendente'],
-                    dayfirst=True,
-                    errors='coerce'
-                )
-                
-                start_date = pd.to_datetime(start_date).date()
-                df_appointments_agendamentos['data_primeira_atendente_is_start_date?'] = df_appointments_agendamentos['Data primeira atendente'].dt.date == start_date
-                
-                # filtered = agendamentos that match start_date - rule #3
-                df_appointments_agendamentos_filtered_coc_rules = df_appointments_agendamentos[df_appointments_agendamentos['data_primeira_atendente_is_start_date?'] == True]
-                
-                df_appointments_atendentes = df_appointments_agendamentos_filtered_coc_rules[
-                    df_appointments_agendamentos_filtered_coc_rules['Nome da primeira atendente']
-                    .isin(atendentes_puxadas_total['Atendente'])]
-                df_appointments_atendentes_grouped = df_appointments_atendentes.groupby('Nome da primeira atendente').agg({'ID agendamento': 'nunique'}).reset_index()
-                
-                # Merging Puxadas with Appointments + Final Touch
-                df_leadsByUser_and_appointments = pd.merge(
-                    df_leadsByUser_total,
-                    df_appointments_atendentes_grouped,
-                    left_on='Atendente',
-                    right_on='Nome da primeira atendente',
-                    how='left'
-                )
-                df_leadsByUser_and_appointments = df_leadsByUser_and_appointments.drop(columns=['Nome da primeira atendente'])
-                df_leadsByUser_and_appointments = df_leadsByUser_and_appointments.fillna(0)
-                df_leadsByUser_and_appointments = df_leadsByUser_and_appointments.rename(columns={'ID agendamento': 'Agendamentos na Agenda'})
-
-                df_leadsByUser_and_appointments_totals = append_total_rows_leadsByStore(df_leadsByUser_and_appointments)
-                
-                # Grouping by "Unidade"
-                df_leadsByStore_and_appointments_totals = df_leadsByUser_and_appointments_totals.groupby('Unidade').agg({
-                    'Leads Puxados': 'sum',
-                    'Agendamentos por lead': 'sum',
-                    'Agendamentos na Agenda': 'sum',
-                    'Atendente': 'count',
-                    'Tam': 'first'
-                }).reset_index()
-                
-                df_leadsByUser_complete_month = df_leadsByUser_complete_month[leadsByUserColumns]
-                df_leadsByUser_complete_month['agendamentos_por_lead'] = 0
-                df_leadsByUser_complete_month['agendamentos_por_lead'] = df_leadsByUser_complete_month['messages_count_by_status'].apply(extract_agendamentos)
-                df_leadsByUser_complete_month = df_leadsByUser_complete_month.rename(columns={ 
-                    'name': 'AtendenteCRM',
-                    'messages_count': 'Leads Puxados',
-                    'unique_messages_count': 'Leads Puxados (únicos)',
-                    'agendamentos_por_lead': 'Agendamentos por lead',
-                    'local': 'UnidadeCRM',
-                    'Tam': 'Tam',
-                    'turno': 'Turno',
-                    'success_rate': 'Conversão'
-                })
-                df_leadsByUser_complete_month = df_leadsByUser_complete_month.reset_index(drop=True)
-                df_leadsByUser_complete_month = df_leadsByUser_complete_month.sort_values(by='Leads Puxados', ascending=False)
-                df_leadsByUser_complete_month['AtendenteCRM'] = df_leadsByUser_complete_month['AtendenteCRM'].apply(normalize_name)
-
-                # (store_info = Unidade, Turno, Tam)
-                df_leadsByUser_complete_month_with_store_info = pd.merge(
-                    df_leadsByUser_complete_month,
-                    atendentes_puxadas_total,
-                    left_on='AtendenteCRM',
-                    right_on='Atendente',
-                    how='left'
-                ) # extra merge to deal with other users COC wants to track which are not "Atendente"
-                
-                desired_columns = ['Unidade', 'Leads Puxados', 'Agendamentos por lead', 'Tam']
-                df_leadsByUser_complete_month_with_appointments_reduced = df_leadsByUser_complete_month_with_store_info[desired_columns]
-                
-                count_of_days = get_days_from_dashboard()
-                active_days = int(count_of_days.iloc[0, 0])
-                st.write(f"Dias Passados do Dashboard: {active_days}")
-
-                df_leadsByUser_complete_month_with_appointments_groupedByStore = df_leadsByUser_complete_month_with_appointments_reduced.groupby('Unidade').agg({
-                    'Leads Puxados': lambda x: int(x.sum() / active_days),
-                    'Agendamentos por lead': lambda x: int(x.sum() / active_days) 
-                }).reset_index()
-
-                df_leadsByUser_complete_month_with_appointments_groupedByStore = df_leadsByUser_complete_month_with_appointments_groupedByStore.rename(columns={
-                    'Leads Puxados': 'Leads Puxados (média do mês)',
-                    'Agendamentos por lead': 'Agendamentos por lead (média do mês)'
-                })
-
-                df_leadsByStore_and_appointments_totals = pd.merge(
-                    df_leadsByStore_and_appointments_totals,
-                    df_leadsByUser_complete_month_with_appointments_groupedByStore,
-                    on='Unidade',
-                    how='left'
-                )                
-                df_leadsByStore_and_appointments_totals = df_leadsByStore_and_appointments_totals.rename(columns={
-                    'Atendente' : 'Recepcionistas'
-                })
-                df_leadsByStore_and_appointments_totals = df_leadsByStore_and_appointments_totals[
-                    [
-                        'Unidade',
-                        'Leads Puxados',
-                        'Leads Puxados (média do mês)',
-                        'Agendamentos por lead',
-                        'Agendamentos por lead (média do mês)',
-                        'Recepcionistas',
-                        'Tam'
-                    ]
-                ]
-
-                df_leadsByStore_and_appointments_totals_stores_p = df_leadsByStore_and_appointments_totals[df_leadsByStore_and_appointments_totals['Tam'] == 'P']
-                df_leadsByStore_and_appointments_totals_stores_m = df_leadsByStore_and_appointments_totals[df_leadsByStore_and_appointments_totals['Tam'] == 'M']
-                df_leadsByStore_and_appointments_totals_stores_g = df_leadsByStore_and_appointments_totals[df_leadsByStore_and_appointments_totals['Tam'] == 'G']
-
-                st.subheader("Unidades P")
-                df_leadsByStore_and_appointments_totals_stores_p = df_leadsByStore_and_appointments_totals_stores_p.drop(columns=['Tam'])
-                st.dataframe(df_leadsByStore_and_appointments_totals_stores_p, hide_index=True, height=len(df_leadsByStore_and_appointments_totals_stores_p)* 38)
-
-                st.subheader("Unidades M")
-                df_leadsByStore_and_appointments_totals_stores_m = df_leadsByStore_and_appointments_totals_stores_m.drop(columns=['Tam'])
-                st.dataframe(df_leadsByStore_and_appointments_totals_stores_m, hide_index=True)
-
-                st.subheader("Unidades G")
-                df_leadsByStore_and_appointments_totals_stores_g = df_leadsByStore_and_appointments_totals_stores_g.drop(columns=['Tam'])
-                st.dataframe(df_leadsByStore_and_appointments_totals_stores_g, hide_index=True)
\ No newline at end of file
+                render_leadsByStore(df_leadsByUser, df_appointments, df_leadsByUser_complete_month, start_date)
+
+@st.fragment(run_every=DEFAULT_REFRESH_INTERVAL)
+def live_leadsByStore(start_date, end_date):
+    """Render the shared live board. Reruns on its own and never fetches per session."""
+    board = get_live_board(start_date, end_date)
+    board.track_month()
+    version, df_leadsByUser, df_appointments, df_leadsByUser_complete_month = board.snapshot()
+
+    if version == 0 or df_leadsByUser_complete_month.empty:
+        st.info("Carregando dados ao vivo... a tabela aparece na próxima atualização.")
+        return
+
+    st.caption(f"Última atualização: {board.last_refresh:%H:%M:%S}")
+    if df_leadsByUser.empty or df_appointments.empty:
+        st.warning("Não foram encontrados dados para o período selecionado.")
+        return
+
+    render_leadsByStore(df_leadsByUser, df_appointments, df_leadsByUser_complete_month, start_date)
+
+def render_leadsByStore(df_leadsByUser, df_appointments, df_leadsByUser_complete_month, start_date):
+    """Build and display the P, M and G store tables from the raw API data."""
+
+    df_leadsByUser = df_leadsByUser[leadsByUserColumns]
+    df_leadsByUser['agendamentos_por_lead'] = 0
+    df_leadsByUser['agendamentos_por_lead'] = df_leadsByUser['messages_count_by_status'].apply(extract_agendamentos)
+    df_leadsByUser = df_leadsByUser.rename(columns={ 
+        'name': 'Atendente',
+        'messages_count': 'Leads Puxados',
+        'unique_messages_count': 'Leads Puxados (únicos)',
+        'agendamentos_por_lead': 'Agendamentos por lead',
+        'local': 'Unidade',
+        'Tam': 'Tam',
+        'turno': 'Turno',
+        'success_rate': 'Conversão'
+    })
+    df_leadsByUser = df_leadsByUser.reset_index(drop=True)
+    df_leadsByUser = df_leadsByUser.sort_values(by='Leads Puxados', ascending=False)
+
+    pro_corpo_stores = get_stores_from_spreadsheet()
+    pro_corpo_stores['Unidade'] = normalize_names(pro_corpo_stores['Unidade'])
+
+    atendentes_puxadas_manha, atendentes_puxadas_tarde = get_atendente_from_spreadsheet()
+    atendentes_puxadas_total = pd.concat([atendentes_puxadas_manha, atendentes_puxadas_tarde])
+
+    atendentes_puxadas_total['Atendente'] = normalize_names(atendentes_puxadas_total['Atendente'])
+    atendentes_puxadas_total['Unidade'] = normalize_names(atendentes_puxadas_total['Unidade'])
+    df_leadsByUser['Atendente'] = normalize_names(df_leadsByUser['Atendente'])
+
+    # Step 1: filter leadsByUser where 'Atendente' matches the 'Atendente' in atendentes_puxadas_total 
+    df_leadsByUser_total = df_leadsByUser[df_leadsByUser['Atendente'].isin(atendentes_puxadas_total['Atendente'])]
+
+    # Step 2: merge to enrich with additional info (like Unidade, Turno, Tam)
+    df_leadsByUser_total = df_leadsByUser_total.merge(
+        atendentes_puxadas_total,
+        how='left',
+        left_on='Atendente',
+        right_on='Atendente'
+    )
+    # Extract Attendants from the pre-defined lists
+    df_leadsByUser_total = df_leadsByUser_total[leadsByUser_display_columns]
+
+    # COC rules:
+    # 1) Status = agendamento_status_por_atendente
+    # 2) Procedimento = procedimento_avaliacao
+    df_appointments_agendamentos = df_appointments[
+                                (df_appointments['Status'].isin(agendamento_status_por_atendente)) 
+                                & (df_appointments['Procedimento'].isin(procedimento_avaliacao))]
+
+    # 3) Data primeira atendente = start_date
+    df_appointments_agendamentos['Data primeira atendente'] = pd.to_datetime(
+        df_appointments_agendamentos['Data primeira atendente'],
+        dayfirst=True,
+        errors='coerce'
+    )
+
+    start_date = pd.to_datetime(start_date).date()
+    df_appointments_agendamentos['data_primeira_atendente_is_start_date?'] = df_appointments_agendamentos['Data primeira atendente'].dt.date == start_date
+
+    # filtered = agendamentos that match start_date - rule #3
+    df_appointments_agendamentos_filtered_coc_rules = df_appointments_agendamentos[df_appointments_agendamentos['data_primeira_atendente_is_start_date?'] == True]
+
+    df_appointments_atendentes = df_appointments_agendamentos_filtered_coc_rules[
+        df_appointments_agendamentos_filtered_coc_rules['Nome da primeira atendente']
+        .isin(atendentes_puxadas_total['Atendente'])]
+    df_appointments_atendentes_grouped = df_appointments_atendentes.groupby('Nome da primeira atendente').agg({'ID agendamento': 'nunique'}).reset_index()
+
+    # Merging Puxadas with Appointments + Final Touch
+    df_leadsByUser_and_appointments = pd.merge(
+        df_leadsByUser_total,
+        df_appointments_atendentes_grouped,
+        left_on='Atendente',
+        right_on='Nome da primeira atendente',
+        how='left'
+    )
+    df_leadsByUser_and_appointments = df_leadsByUser_and_appointments.drop(columns=['Nome da primeira atendente'])
+    df_leadsByUser_and_appointments = df_leadsByUser_and_appointments.fillna(0)
+    df_leadsByUser_and_appointments = df_leadsByUser_and_appointments.rename(columns={'ID agendamento': 'Agendamentos na Agenda'})
+
+    df_leadsByUser_and_appointments_totals = append_total_rows_leadsByStore(df_leadsByUser_and_appointments)
+
+    # Grouping by "Unidade"
+    df_leadsByStore_and_appointments_totals = df_leadsByUser_and_appointments_totals.groupby('Unidade').agg({
+        'Leads Puxados': 'sum',
+        'Agendamentos por lead': 'sum',
+        'Agendamentos na Agenda': 'sum',
+        'Atendente': 'count',
+        'Tam': 'first'
+    }).reset_index()
+
+    df_leadsByUser_complete_month = df_leadsByUser_complete_month[leadsByUserColumns]
+    df_leadsByUser_complete_month['agendamentos_por_lead'] = 0
+    df_leadsByUser_complete_month['agendamentos_por_lead'] = df_leadsByUser_complete_month['messages_count_by_status'].apply(extract_agendamentos)
+    df_leadsByUser_complete_month = df_leadsByUser_complete_month.rename(columns={ 
+        'name': 'AtendenteCRM',
+        'messages_count': 'Leads Puxados',
+        'unique_messages_count': 'Leads Puxados (únicos)',
+        'agendamentos_por_lead': 'Agendamentos por lead',
+        'local': 'UnidadeCRM',
+        'Tam': 'Tam',
+        'turno': 'Turno',
+        'success_rate': 'Conversão'
+    })
+    df_leadsByUser_complete_month = df_leadsByUser_complete_month.reset_index(drop=True)
+    df_leadsByUser_complete_month = df_leadsByUser_complete_month.sort_values(by='Leads Puxados', ascending=False)
+    df_leadsByUser_complete_month['AtendenteCRM'] = normalize_names(df_leadsByUser_complete_month['AtendenteCRM'])
+
+    # (store_info = Unidade, Turno, Tam)
+    df_leadsByUser_complete_month_with_store_info = pd.merge(
+        df_leadsByUser_complete_month,
+        atendentes_puxadas_total,
+        left_on='AtendenteCRM',
+        right_on='Atendente',
+        how='left'
+    ) # extra merge to deal with other users COC wants to track which are not "Atendente"
+
+    desired_columns = ['Unidade', 'Leads Puxados', 'Agendamentos por lead', 'Tam']
+    df_leadsByUser_complete_month_with_appointments_reduced = df_leadsByUser_complete_month_with_store_info[desired_columns]
+
+    count_of_days = get_days_from_dashboard()
+    active_days = int(count_of_days.iloc[0, 0])
+    st.write(f"Dias Passados do Dashboard: {active_days}")
+
+    df_leadsByUser_complete_month_with_appointments_groupedByStore = df_leadsByUser_complete_month_with_appointments_reduced.groupby('Unidade').agg({
+        'Leads Puxados': lambda x: int(x.sum() / active_days),
+        'Agendamentos por lead': lambda x: int(x.sum() / active_days) 
+    }).reset_index()
+
+    df_leadsByUser_complete_month_with_appointments_groupedByStore = df_leadsByUser_complete_month_with_appointments_groupedByStore.rename(columns={
+        'Leads Puxados': 'Leads Puxados (média do mês)',
+        'Agendamentos por lead': 'Agendamentos por lead (média do mês)'
+    })
+
+    df_leadsByStore_and_appointments_totals = pd.merge(
+        df_leadsByStore_and_appointments_totals,
+        df_leadsByUser_complete_month_with_appointments_groupedByStore,
+        on='Unidade',
+        how='left'
+    )                
+    df_leadsByStore_and_appointments_totals = df_leadsByStore_and_appointments_totals.rename(columns={
+        'Atendente' : 'Recepcionistas'
+    })
+    df_leadsByStore_and_appointments_totals = df_leadsByStore_and_appointments_totals[
+        [
+            'Unidade',
+            'Leads Puxados',
+            'Leads Puxados (média do mês)',
+            'Agendamentos por lead',
+            'Agendamentos por lead (média do mês)',
+            'Recepcionistas',
+            'Tam'
+        ]
+    ]
+
+    df_leadsByStore_and_appointments_totals_stores_p = df_leadsByStore_and_appointments_totals[df_leadsByStore_and_appointments_totals['Tam'] == 'P']
+    df_leadsByStore_and_appointments_totals_stores_m = df_leadsByStore_and_appointments_totals[df_leadsByStore_and_appointments_totals['Tam'] == 'M']
+    df_leadsByStore_and_appointments_totals_stores_g = df_leadsByStore_and_appointments_totals[df_leadsByStore_and_appointments_totals['Tam'] == 'G']
+
+    st.subheader("Unidades P")
+    df_leadsByStore_and_appointments_totals_stores_p = df_leadsByStore_and_appointments_totals_stores_p.drop(columns=['Tam'])
+    st.dataframe(df_leadsByStore_and_appointments_totals_stores_p, hide_index=True, height=len(df_leadsByStore_and_appointments_totals_stores_p)* 38)
+
+    st.subheader("Unidades M")
+    df_leadsByStore_and_appointments_totals_stores_m = df_leadsByStore_and_appointments_totals_stores_m.drop(columns=['Tam'])
+    st.dataframe(df_leadsByStore_and_appointments_totals_stores_m, hide_index=True)
+
+    st.subheader("Unidades G")
+    df_leadsByStore_and_appointments_totals_stores_g = df_leadsByStore_and_appointments_totals_stores_g.drop(columns=['Tam'])
+    st.dataframe(df_leadsByStore_and_appointments_totals_stores_g, hide_index=True)
\ No newline at end of file
@@ -1,7 +1,7 @@
 import streamlit as st
 import pandas as pd
 import plotly.express as px
-import asyncio
+from helpers import runtime
 import plotly.graph_objects as go
 from apiCrm.resolvers.dashboard.fetch_grossSalesReport import fetch_and_process_grossSales_report 
 from frontend.sales.sales_grouper import (
@@ -29,7 +29,7 @@ def load_data(start_date=None, end_date=None, use_api=False):
     if start_date and end_date:
         try:
             # Run the async function using asyncio
-            sales_data = asyncio.run(fetch_and_process_grossSales_report(start_date, end_date))
+            sales_data = runtime.run(fetch_and_process_grossSales_report(start_date, end_date), key="salesByDay_view")
 
             if not sales_data:
                 st.error("Não foi possível obter dados da API. Usando dados locais.")
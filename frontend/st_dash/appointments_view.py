@@ -3,7 +3,7 @@ import pandas as pd
 import plotly.express as px
 from pathlib import Path
 from datetime import datetime, timedelta
-import asyncio
+from helpers import runtime
 from components.headers import header_appointments
 from apiCrm.resolvers.dashboard.fetch_appointmentReport import fetch_and_process_appointment_report 
 from frontend.appointments.appointment_columns import appointments_api_clean_columns
@@ -39,7 +39,7 @@ def load_data(start_date=None, end_date=None, use_api=False):
     if start_date and end_date:
         try:
             # Run the async function using asyncio
-            appointments_data = asyncio.run(fetch_and_process_appointment_report(start_date, end_date))
+            appointments_data = runtime.run(fetch_and_process_appointment_report(start_date, end_date), key="appointments_view")
 
             if not appointments_data:
                 st.error("Não foi possível obter dados da API. Usando dados locais.")
@@ -3,7 +3,7 @@ import pandas as pd
 import plotly.express as px
 from pathlib import Path
 from datetime import datetime, timedelta
-import asyncio
+from helpers import runtime
 from frontend.marketing.leads_cleaner import (
                     paid_sources, 
                     organic_sources, 
@@ -31,7 +31,7 @@ def load_data(start_date=None, end_date=None, use_api=False):
     if start_date and end_date:
         try:
             # Run the async function using asyncio
-            leads_data = asyncio.run(fetch_and_process_lead_report(start_date, end_date))
+            leads_data = runtime.run(fetch_and_process_lead_report(start_date, end_date), key="funil")
             
             if not leads_data:
                 st.error("Não foi possível obter dados da API. Usando dados locais.")
@@ -3,7 +3,7 @@ import pandas as pd
 import plotly.express as px
 from pathlib import Path
 from datetime import datetime, timedelta
-import asyncio
+from helpers import runtime
 from frontend.marketing.leads_cleaner import (
                     paid_sources, 
                     organic_sources, 
@@ -21,6 +21,7 @@ from frontend.leads.leads_grouper import (
                                     )
 from apiCrm.resolvers.dashboard.fetch_leadReport import fetch_and_process_lead_report
 from components.date_input import date_input
+from components.download_button import download_button
 from helpers.discord import send_discord_message
 
 def load_data(start_date=None, end_date=None, use_api=False):
@@ -38,7 +39,7 @@ def load_data(start_date=None, end_date=None, use_api=False):
     if start_date and end_date:
         try:
             # Run the async function using asyncio
-            leads_data = asyncio.run(fetch_and_process_lead_report(start_date, end_date))
+            leads_data = runtime.run(fetch_and_process_lead_report(start_date, end_date), key="lead_view")
             
             if not leads_data:
                 st.error("Não foi possível obter dados da API. Usando dados locais.")
@@ -106,6 +107,8 @@ def load_page_leads():
         send_discord_message(f"Loading data in page leads_view")
         with st.spinner("Carregando dados..."):
             df_leads = load_data(start_date, end_date)
+            # Kept across reruns so the export below survives its own button clicks
+            st.session_state['leads_page_data'] = df_leads
     
             ########
             # Header
@@ -301,14 +304,10 @@ def load_page_leads():
 
             st.dataframe(pivot_store_leads_by_day)
 
-            st.header("Download dos Dados")
-            if st.download_button(
-                label="Download dados completos (CSV)",
-                data=df_leads.to_csv(index=False).encode('utf-8'),
-                file_name='leads_analysis.csv',
-                mime='text/csv'
-            ):
-                st.success('Download iniciado!')
+    # Outside the "Carregar" gate: generating the file reruns the page with that button off
+    if 'leads_page_data' in st.session_state:
+        st.header("Download dos Dados")
+        download_button(st.session_state['leads_page_data'], 'leads_analysis', key="leads_export")
 
 if __name__ == "__main__":
     load_page_leads()
@@ -3,7 +3,7 @@ import pandas as pd
 import plotly.express as px
 from pathlib import Path
 from datetime import datetime, timedelta
-import asyncio
+from helpers import runtime
 from components.headers import header_sales
 from apiCrm.resolvers.dashboard.fetch_grossSalesReport import fetch_and_process_grossSales_report 
 from frontend.sales.sales_grouper import (
@@ -31,7 +31,7 @@ def load_data(start_date=None, end_date=None, use_api=False):
     if start_date and end_date:
         try:
             # Run the async function using asyncio
-            sales_data = asyncio.run(fetch_and_process_grossSales_report(start_date, end_date))
+            sales_data = runtime.run(fetch_and_process_grossSales_report(start_date, end_date), key="sales_view")
 
             if not sales_data:
                 st.error("Não foi possível obter dados da API. Usando dados locais.")
@@ -3,11 +3,9 @@ import pandas as pd
 import plotly.express as px
 from pathlib import Path
 from datetime import datetime, timedelta
-import time
 import requests
 import json
 from typing import List, Dict, Any, Optional
-import io
 import sys
 import logging
 
@@ -15,10 +13,7 @@ import logging
 from frontend.marketing.apt_cleaner import aesthetic_procedures_aval, stores_to_remove, status_agendamentos_marketing, status_comparecimentos_marketing
 from frontend.appointments.appointment_columns import appointments_clean_columns
 from frontend.sales.sale_columns import sales_clean_columns
-from frontend.marketing.marketing_columns import marketing_clean_columns
 from frontend.leads.lead_columns import lead_clean_columns
-from frontend.leads.lead_category import process_lead_categories
-from helpers.cleaner import clean_telephone, rename_columns_df_leads_with_purchases
 from helpers.date import (transform_date_from_sales,
                          transform_date_from_leads,
                          transform_date_from_appointments)
@@ -30,9 +25,13 @@ from frontend.marketing.marketing_grouper import ( groupby_marketing_by_category
                                                 pivot_table_marketing_by_source_and_comprou
                                             )
 from frontend.marketing.worker import *
-from frontend.marketing.sales_checker import check_if_lead_has_purchased
-from helpers.cleaner import columns_to_hide_from_final_df_leads_appointments_sales
+from frontend.marketing.funnel import FUNNEL_STAGES, NOT_IN_AGENDA, funnel_summary
+from frontend.marketing.incremental import build_incremental_funnel
+from frontend.marketing.ingestion import ingest_uploads
+from frontend.marketing.temporal import DEFAULT_MATCH_WINDOW_DAYS
 from helpers.discord import send_discord_message
+from components.download_button import download_button
+from components.progress_bar import ProgressBar
 
 logging.basicConfig(level=logging.INFO)
 
@@ -75,38 +74,27 @@ def load_page_marketing():
 
     st.title("📊 1 - Funil de Leads ")
 
-    df_leads, df_appointments, df_sales = None, None, None  # Initialize variables
     col1, col2, col3 = st.columns(3)    
 
     with col1:
         upload_leads_file = st.file_uploader("Upload Leads File", type=["xlsx"])
-        if upload_leads_file is not None:
-            df_leads = pd.read_excel(upload_leads_file)
-            df_leads = df_leads.loc[~df_leads['Unidade'].isin(stores_to_remove)]
-            df_leads = transform_date_from_leads(df_leads)
-            df_leads = process_lead_categories(df_leads)
-    
     with col2:
         upload_appointments_file = st.file_uploader("Upload Appointments File", type=["xlsx"])
-        if upload_appointments_file is not None:
-            df_appointments = pd.read_excel(upload_appointments_file)
-            df_appointments = clean_agd_df(df_appointments)
-            df_appointments = transform_date_from_appointments(df_appointments)
-
-            # Filter appointments for comparecimentos and agendamentos
-            df_appointments_comparecimentos = df_appointments[df_appointments['Status'].isin(status_comparecimentos_marketing)]
-            df_appointments_comparecimentos = df_appointments_comparecimentos[df_appointments_comparecimentos['Procedimento'].isin(aesthetic_procedures_aval)]
-            
-            df_appointments_agendamentos = df_appointments[df_appointments['Status'].isin(status_agendamentos_marketing)]
-            df_appointments_agendamentos = df_appointments_agendamentos[df_appointments_agendamentos['Procedimento'].isin(aesthetic_procedures_aval)]
-
     with col3:
         upload_sales_file = st.file_uploader("Upload Sales File", type=["xlsx"])
-        if upload_sales_file is not None:
-            df_sales = pd.read_excel(upload_sales_file)
-            df_sales = clean_sales_df(df_sales)
-            df_sales = transform_date_from_sales(df_sales)
-    
+
+    # Parsed once per file content, in parallel; reruns hit the ingest cache
+    try:
+        uploads = ingest_uploads({
+            "leads": upload_leads_file,
+            "appointments": upload_appointments_file,
+            "sales": upload_sales_file,
+        })
+    except Exception as e:
+        st.error(f"Erro ao ler arquivos: {str(e)}")
+        return
+    df_leads, df_appointments, df_sales = uploads["leads"], uploads["appointments"], uploads["sales"]
+
     if df_leads is None or df_appointments is None or df_sales is None:
         st.warning("⚠️  Faça upload dos 3 arquivos para começar a análise!")
         return
@@ -123,7 +111,6 @@ def load_page_marketing():
             
                 with col1:
                     df_leads_google = df_leads[df_leads['Fonte'] == 'Google Pesquisa']
-                    df_leads_google = process_lead_categories(df_leads_google)
 
                     groupby_leads_por_mes = df_leads_google.groupby(['Mês']).size().reset_index(name='ID do lead')
                     st.write("Leads Google Pesquisa")
@@ -131,7 +118,6 @@ def load_page_marketing():
                     
                 with col2:
                     df_leads_facebook = df_leads[df_leads['Fonte'] == 'Facebook Leads']
-                    df_leads_facebook = process_lead_categories(df_leads_facebook)
 
                     groupby_leads_por_mes = df_leads_facebook.groupby(['Mês']).size().reset_index(name='ID do lead')
                     st.write("Leads Facebook Leads")
@@ -139,7 +125,6 @@ def load_page_marketing():
                 
                 with col3:
                     df_leads_google_and_facebook = df_leads[df_leads['Fonte'].isin(['Google Pesquisa', 'Facebook Leads'])]
-                    df_leads_google_and_facebook = process_lead_categories(df_leads_google_and_facebook)
 
                     groupby_leads_por_mes = df_leads_google_and_facebook.groupby(['Mês']).size().reset_index(name='ID do lead')
                     st.write("Leads Google e Facebook Leads")
@@ -149,13 +134,12 @@ def load_page_marketing():
                 ###### df_marketing_data
                 # Cleaning data
                 # df_leads_cleaned = df_leads_google_and_facebook[lead_clean_columns]
-                df_leads_cleaned = df_leads[lead_clean_columns]
-                df_leads_cleaned['Telefone do lead'] = df_leads_cleaned['Telefone do lead'].astype(str)
-                df_leads_cleaned['Telefone do lead'] = df_leads_cleaned['Telefone do lead'].apply(clean_telephone)
+                # 'Telefone do lead' already holds the canonical phone key (see frontend/marketing/ingestion.py)
+                # 'Categoria' is computed once at ingest too (process_lead_categories)
+                df_leads_cleaned = df_leads[lead_clean_columns + ['Categoria']]
                 
                 st.markdown("---")
                 st.write("Leads que vamos conferir:")
-                df_leads_cleaned = process_lead_categories(df_leads_cleaned)
                 st.dataframe(df_leads_cleaned.sample(n=5, random_state=123))
 
                 st.markdown("---")
@@ -171,6 +155,17 @@ def load_page_marketing():
                     Está tudo certo com os dados? \n
                     Se sim, clique no botão abaixo para cruzar os dados!!
                 """)
+        match_by_date = st.toggle(
+            "Cruzar pelo agendamento/venda mais próximo após a entrada do lead",
+            help="Desligado: usa o primeiro agendamento/venda encontrado para o telefone ou email do lead."
+        )
+        match_window_days = None
+        if match_by_date:
+            match_window_days = st.number_input("Janela (dias)", min_value=1, max_value=365, value=DEFAULT_MATCH_WINDOW_DAYS)
+        incremental = st.toggle(
+            "Modo incremental: reaproveitar leads já salvos no banco",
+            help="Só cruza os leads novos ou cujos agendamentos/vendas mudaram desde o último salvamento."
+        )
         if st.button(
                     "Play",
                     icon="🎲", 
@@ -180,82 +175,43 @@ def load_page_marketing():
 
             st.markdown("---")
 
-            progress_bar = st.progress(0)
-            spinner_container = st.empty()
-
-            with spinner_container.container():
-                # Simulating progress (0-60%):
-                for i in range (0, 61, 20):
-                    progress_bar.progress(i)
-                    time.sleep(0.5)
-
-                # First check: All leads for 'Atendido' status
-                df_leads_cleaned = check_if_lead_has_atendido_status(
-                    df_leads_cleaned,
-                    df_appointments_comparecimentos
-                )
-
-                for i in range(60, 91, 10):
-                    progress_bar.progress(i)
-                    time.sleep(0.3)
-                
-                # Final progress update to 100%
-                progress_bar.progress(100)
-                time.sleep(3)
-            
-            # Clear spinner and display results
-            spinner_container.empty()
+            progress_bar = ProgressBar(FUNNEL_STAGES)
+
+            # Leads x Agenda x Vendas in one pipeline (see frontend/marketing/funnel.py)
+            # Fingerprints are always computed, so the next run can reuse what is saved now
+            df_leads_with_purchases, fingerprints, incremental_stats = build_incremental_funnel(
+                df_leads_cleaned,
+                df_appointments,
+                df_sales,
+                progress=progress_bar,
+                window_days=match_window_days,
+                reuse_stored=incremental
+            )
+            if incremental:
+                st.info(f"♻️ {incremental_stats['reused']} leads reaproveitados do banco, {incremental_stats['matched']} cruzados agora.")
+            st.session_state['leads_fingerprints'] = fingerprints
+            progress_bar.complete()
+            with st.expander("⏱️ Tempo por etapa"):
+                st.dataframe(progress_bar.summary(), hide_index=True)
 
             st.write("### Cruzamento Leads x Agenda:")
             with st.expander("🔧 Dados em processamento... Clique se quiser conferir os detalhes 👇"):
 
                 st.write("### 1. Leads Atendidos:")
-                df_atendidos = df_leads_cleaned[df_leads_cleaned['status'] == 'Atendido'].copy()
-
-                st.dataframe(df_atendidos)
+                st.dataframe(df_leads_with_purchases[df_leads_with_purchases['Status Agenda'] == 'Atendido'])
 
                 st.write("### 2. Leads na Agenda, com outros status:")
-                df_leads_nao_atendidos = df_leads_cleaned[df_leads_cleaned['procedimento'].isna()].copy()
-                
-                df_leads_nao_atendidos = check_if_lead_has_other_status(
-                    df_leads_nao_atendidos,
-                    df_appointments_agendamentos
-            )    
-                # Identify which rows were processed (by index)
-                processed_indices = df_leads_nao_atendidos.index
-                # Update just those rows in the original DataFrame
-                df_leads_cleaned.loc[processed_indices] = df_leads_nao_atendidos
-                df_outros_status = df_leads_cleaned[df_leads_cleaned['status'].isin(status_agendamentos_marketing)]
-                
-                st.dataframe(df_outros_status)
-                
+                st.dataframe(df_leads_with_purchases[df_leads_with_purchases['Status Agenda'].isin(status_agendamentos_marketing)])
+
                 # Display leads not found in any check
                 st.write("### 3. Leads não encontrados na Agenda:")
-                df_nao_encontrados = df_leads_cleaned[df_leads_cleaned['status'].isna()].copy()
-
-                st.dataframe(df_nao_encontrados)
+                st.dataframe(df_leads_with_purchases[df_leads_with_purchases['Status Agenda'] == NOT_IN_AGENDA])
 
-            df_leads_cleaned['status'] = df_leads_cleaned['status'].fillna('Não está na agenda')
-            df_leads_cleaned_final = df_leads_cleaned[marketing_clean_columns]
-            df_leads_cleaned_final = df_leads_cleaned_final.fillna('')
-            
             st.markdown("---")
 
-            df_leads_with_purchases = check_if_lead_has_purchased(
-                                        df_leads_cleaned_final, 
-                                        df_sales
-                                    )
-            
-            df_leads_with_purchases['Valor líquido'] = pd.to_numeric(
-                                                            df_leads_with_purchases['Valor líquido']
-                                                            .astype(str).str.replace(',', '.'), 
-                                                            errors='coerce'
-                                                        )
-            
             # PREP COOL STATISTICS:
-            total_leads_compraram = df_leads_with_purchases[df_leads_with_purchases['comprou'] == True]['ID do lead'].nunique()
-            total_comprado = df_leads_with_purchases[df_leads_with_purchases['comprou'] == True]['Valor líquido'].sum()
-            total_leads = len(df_leads_with_purchases)
+            summary = funnel_summary(df_leads_with_purchases)
+            total_leads = summary['total']
 
             with st.container(border=True):
                 st.write("### Resumo da Análise:")
@@ -268,11 +224,11 @@ def load_page_marketing():
                                  "💰 -> Total comprado pelos leads"],
                     "Valor": [
                         f"{total_leads}",
-                        f"{len(df_nao_encontrados)} ({(len(df_nao_encontrados)/total_leads*100):.1f}%)",
-                        f"{len(df_outros_status)} ({(len(df_outros_status)/total_leads*100):.1f}%)",
-                        f"{len(df_atendidos)} ({(len(df_atendidos)/total_leads*100):.1f}%)",
-                        f"{total_leads_compraram} ({(total_leads_compraram/total_leads*100):.1f}%)",
-                        f"R$ {total_comprado:,.2f}".replace(',', 'X').replace('.', ',').replace('X', '.')
+                        f"{summary['nao_encontrados']} ({(summary['nao_encontrados']/total_leads*100):.1f}%)",
+                        f"{summary['outros_status']} ({(summary['outros_status']/total_leads*100):.1f}%)",
+                        f"{summary['atendidos']} ({(summary['atendidos']/total_leads*100):.1f}%)",
+                        f"{summary['compraram']} ({(summary['compraram']/total_leads*100):.1f}%)",
+                        f"R$ {summary['total_comprado']:,.2f}".replace(',', 'X').replace('.', ',').replace('X', '.')
                     ]
                 }
                 
@@ -285,33 +241,11 @@ def load_page_marketing():
 
             with st.container(border=True):
                 st.write("### Tabela: Leads x Agenda x Vendas") 
-        
-                # Special treatments before showing data
-                df_leads_with_purchases = rename_columns_df_leads_with_purchases(df_leads_with_purchases)
-                df_leads_with_purchases = df_leads_with_purchases.drop(columns=columns_to_hide_from_final_df_leads_appointments_sales)
-                df_leads_with_purchases['intervalo da compra'] = (df_leads_with_purchases['Data Venda'] - df_leads_with_purchases['Dia da entrada']).dt.days
-                df_leads_with_purchases = df_leads_with_purchases.fillna("")
-                df_leads_with_purchases['ID lead'] = pd.to_numeric(df_leads_with_purchases['ID lead'], errors='coerce')
-                df_leads_with_purchases['Valor primeiro orçamento'] = pd.to_numeric(df_leads_with_purchases['Valor primeiro orçamento'], errors='coerce')
 
                 # Problem of duplicate leads... Valor primeiro orçamento will also be duplicate... need to think about this.
 
                 st.session_state['leads_data'] = df_leads_with_purchases
                 st.dataframe(df_leads_with_purchases, hide_index=True)
-
-                # Create a download button for the Excel file
-                buffer = io.BytesIO()
-                with pd.ExcelWriter(buffer, engine='openpyxl') as writer:
-                    df_leads_with_purchases.to_excel(writer, index=False, sheet_name='Leads')
-                    
-                excel_data = buffer.getvalue()
-                yesterday = (datetime.now() - timedelta(days=1)).strftime("%d-%m-%Y")
-                st.download_button(
-                    label="Baixar Excel",
-                    data=excel_data,
-                    file_name=f"df_mkt_{yesterday}.xlsx",
-                    mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-                )
             
             with st.expander("🔍 Detalhes Dinâmica Marketing:"):
                 tab1, tab2 = st.tabs(["Visão por Categoria", "Visão por Fonte"])
@@ -376,6 +310,13 @@ def load_page_marketing():
                     icon="✅"
                 )
 
+        # Outside the "Play" gate: generating the file reruns the page with that button off
+        if 'leads_data' in st.session_state and not st.session_state['leads_data'].empty:
+            with st.container(border=True):
+                st.write("### Exportar: Leads x Agenda x Vendas")
+                yesterday = (datetime.now() - timedelta(days=1)).strftime("%d-%m-%Y")
+                download_button(st.session_state['leads_data'], f"df_mkt_{yesterday}", key="mkt_export")
+
     except Exception as e:
         st.error(f"An error occurred: {str(e)}")
 
@@ -390,9 +331,15 @@ def save_data():
         if 'leads_data' in st.session_state and not st.session_state['leads_data'].empty:
             from helpers.data_wrestler import save_data_to_db, save_data_to_db_batch
             
-            success, message = save_data_to_db_batch(st.session_state['leads_data'])
+            success, message = save_data_to_db_batch(
+                st.session_state['leads_data'],
+                fingerprints=st.session_state.get('leads_fingerprints')
+            )
             
             if success:
+                # The saved leads page would otherwise show stale totals for COUNT_CACHE_TTL
+                from frontend.st_mkt.mkt_leads_view import invalidate_counts
+                invalidate_counts()
                 st.success(message)
             else:
                 st.error(message)
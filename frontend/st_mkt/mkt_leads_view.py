@@ -4,7 +4,7 @@ import logging
 from sqlalchemy import func, desc, asc
 from datetime import datetime, timedelta
 import sys
-import io
+import time
 
 # Add backend to path if needed
 sys.path.append('/Users/luisfaria/Desktop/sEngineer/dash')
@@ -23,95 +23,123 @@ from frontend.marketing.marketing_grouper import (
     pivot_table_marketing_by_source_and_comprou
 )
 from helpers.cleaner import columns_to_hide_from_final_df_leads_appointments_sales
+from components.download_button import download_button
 
-def load_data_from_db(
-    limit=1000, 
-    offset=0, 
-    source_filter=None, 
-    store_filter=None, 
-    date_from=None, 
+# Columns shown in the table, read as plain tuples instead of ORM entities
+LEAD_COLUMNS = {
+    "ID": MktLead.lead_id,
+    "Email": MktLead.lead_email,
+    "Telefone": MktLead.lead_phone,
+    "Mensagem": MktLead.lead_message,
+    "Unidade": MktLead.lead_store,
+    "Fonte": MktLead.lead_source,
+    "Categoria": MktLead.lead_category,
+    "Data Agendamento": MktLead.appointment_date,
+    "Status Agendamento": MktLead.appointment_status,
+    "Comprou": MktLead.sales_purchased,
+    "Data de Compra": MktLead.sales_date,
+    "Valor": MktLead.sales_total_bought,
+}
+
+COUNT_CACHE_TTL = 5 * 60  # seconds
+_count_cache = {}
+
+def apply_filters(
+    query,
+    source_filter=None,
+    store_filter=None,
+    date_from=None,
     date_to=None,
     category_filter=None,
     purchased_filter=None
 ):
     """
-    Load data from MktLead table with various filtering options
+    Apply the sidebar filters to a MktLead query
+    """
+    if source_filter:
+        query = query.filter(MktLead.lead_source == source_filter)
+
+    if store_filter:
+        query = query.filter(MktLead.lead_store == store_filter)
+
+    if date_from:
+        query = query.filter(MktLead.lead_entry_day >= date_from.day)
+
+    if date_to:
+        query = query.filter(MktLead.lead_entry_day <= date_to.day)
+
+    if category_filter:
+        query = query.filter(MktLead.lead_category == category_filter)
+
+    if purchased_filter is not None:
+        query = query.filter(MktLead.sales_purchased == purchased_filter)
+
+    return query
+
+def invalidate_counts():
+    """
+    Drop the cached counts, after this process wrote to the mkt_leads table
+    """
+    _count_cache.clear()
+
+def count_leads(**filters):
+    """
+    Count MktLead rows matching the filters, cached for COUNT_CACHE_TTL seconds
     """
+    cache_key = tuple(sorted((name, str(value)) for name, value in filters.items()))
+    cached = _count_cache.get(cache_key)
+    if cached is not None and time.monotonic() - cached[1] < COUNT_CACHE_TTL:
+        return cached[0]
+
     session = SessionLocal()
     try:
-        # Start building the query
-        query = session.query(MktLead)
-        
-        # Add debug logging
-        logging.info(f"Querying MktLead table with filters: source={source_filter}, store={store_filter}, category={category_filter}, purchased={purchased_filter}")
-        
-        # Get total count before any filters to verify data exists
-        total_before_filter = query.count()
-        logging.info(f"Total records in MktLead table before filtering: {total_before_filter}")
-        
-        # Apply filters if provided
-        if source_filter:
-            query = query.filter(MktLead.lead_source == source_filter)
-        
-        if store_filter:
-            query = query.filter(MktLead.lead_store == store_filter)
-        
-        if date_from:
-            # Use the correct field name for date filtering
-            query = query.filter(MktLead.lead_entry_day >= date_from.day if hasattr(MktLead, 'lead_entry_day') else True)
-            logging.info(f"Date filter from: {date_from}")
-            
-        if date_to:
-            # Use the correct field name for date filtering
-            query = query.filter(MktLead.lead_entry_day <= date_to.day if hasattr(MktLead, 'lead_entry_day') else True)
-            logging.info(f"Date filter to: {date_to}")
-            
-        if category_filter:
-            query = query.filter(MktLead.lead_category == category_filter)
-            
-        if purchased_filter is not None:
-            query = query.filter(MktLead.sales_purchased == purchased_filter)
-        
-        # Get total count for pagination
-        total_count = query.count()
-        logging.info(f"Total records after filtering: {total_count}")
-        
-        # Order by most recent leads first
-        query = query.order_by(desc(MktLead.lead_id))
-        
-        # Apply pagination
-        query = query.limit(limit).offset(offset)
-        
-        # Execute query and fetch results
-        results = query.all()
-        logging.info(f"Retrieved {len(results)} records after pagination")
-        
-        # Convert to DataFrame
-        data = []
-        for lead in results:
-            data.append({
-                "ID": lead.lead_id,
-                "Email": lead.lead_email,
-                "Telefone": lead.lead_phone,
-                "Mensagem": lead.lead_message,
-                "Unidade": lead.lead_store,
-                "Fonte": lead.lead_source,
-                "Data de Entrada": None,  # Adjust based on what's available
-                "Categoria": lead.lead_category,
-                "Data Agendamento": lead.appointment_date,
-                "Status Agendamento": lead.appointment_status,
-                "Comprou": "Sim" if lead.sales_purchased else "Não",
-                "Data de Compra": lead.sales_date,
-                "Valor": lead.sales_total_bought
-            })
-        
-        df = pd.DataFrame(data)
-        
-        return df, total_count
-        
+        total_count = apply_filters(session.query(func.count(MktLead.lead_id)), **filters).scalar()
+        _count_cache[cache_key] = (total_count, time.monotonic())
+        return total_count
+    except Exception as e:
+        logging.error(f"Error counting leads in database: {str(e)}")
+        return 0
+    finally:
+        session.close()
+
+def load_data_from_db(limit=1000, after_id=None, **filters):
+    """
+    Load one page of MktLead rows, most recent first.
+
+    Uses keyset pagination on lead_id: the next page starts after the last ID
+    of the previous one, so every page costs the same regardless of depth.
+
+    Args:
+        limit: Rows per page
+        after_id: Last lead_id of the previous page (None for the first page)
+        **filters: Filters accepted by apply_filters
+
+    Returns:
+        tuple: (df, next_after_id) - next_after_id is None on the last page
+    """
+    session = SessionLocal()
+    try:
+        logging.info(f"Querying MktLead page after {after_id} with filters: {filters}")
+
+        query = apply_filters(session.query(*LEAD_COLUMNS.values()), **filters)
+        if after_id is not None:
+            query = query.filter(MktLead.lead_id < after_id)
+
+        # Fetch one extra row to know whether there is a next page
+        rows = query.order_by(desc(MktLead.lead_id)).limit(limit + 1).all()
+        has_next = len(rows) > limit
+        rows = rows[:limit]
+        logging.info(f"Retrieved {len(rows)} records")
+
+        df = pd.DataFrame.from_records(rows, columns=list(LEAD_COLUMNS.keys()))
+        df["Comprou"] = df["Comprou"].map({True: "Sim"}).fillna("Não")
+
+        next_after_id = int(df["ID"].iloc[-1]) if has_next else None
+        return df, next_after_id
+
     except Exception as e:
         logging.error(f"Error loading data from database: {str(e)}")
-        return pd.DataFrame(), 0
+        return pd.DataFrame(columns=list(LEAD_COLUMNS.keys())), None
     finally:
         session.close()
 
@@ -205,64 +233,53 @@ def load_page_mkt_leads():
         "Itens por página",
         [10, 20, 50, 100, 30000]
     )
-    
+
+    filters = dict(
+        source_filter=source_filter,
+        store_filter=store_filter,
+        date_from=date_from,
+        date_to=date_to,
+        category_filter=category_filter,
+        purchased_filter=purchased_filter
+    )
+
+    # Keyset cursors of the pages visited so far; reset when filters change
+    page_signature = (str(filters), items_per_page)
+    if st.session_state.get("mkt_leads_signature") != page_signature:
+        st.session_state["mkt_leads_signature"] = page_signature
+        st.session_state["mkt_leads_cursors"] = [None]
+    cursors = st.session_state["mkt_leads_cursors"]
+
     # Load data
     with st.spinner("Carregando dados..."):
-        df, total_count = load_data_from_db(
-            limit=items_per_page,
-            offset=0,
-            source_filter=source_filter,
-            store_filter=store_filter,
-            date_from=date_from,
-            date_to=date_to,
-            category_filter=category_filter,
-            purchased_filter=purchased_filter
-        )
-    
+        total_count = count_leads(**filters)
+        df, next_after_id = load_data_from_db(limit=items_per_page, after_id=cursors[-1], **filters)
+
     # Display data
     if not df.empty:
+        page = len(cursors)
+        page_count = max((total_count + items_per_page - 1) // items_per_page, page)
         st.write(f"Mostrando {len(df)} de {total_count} registros")
-        
-        # Add pagination controls
-        page_count = (total_count + items_per_page - 1) // items_per_page
-        
+
         if page_count > 1:
             cols = st.columns([1, 3, 1])
+            with cols[0]:
+                if st.button("◀ Anterior", disabled=page == 1):
+                    cursors.pop()
+                    st.rerun()
             with cols[1]:
-                page = st.number_input("Página", min_value=1, max_value=page_count, value=1)
-                
-                offset = (page - 1) * items_per_page
-                
-                # If page changed, reload data with new offset
-                if offset > 0:
-                    df, _ = load_data_from_db(
-                        limit=items_per_page,
-                        offset=offset,
-                        source_filter=source_filter,
-                        store_filter=store_filter,
-                        date_from=date_from,
-                        date_to=date_to,
-                        category_filter=category_filter,
-                        purchased_filter=purchased_filter
-                    )
-        
+                st.markdown(f"Página {page} de {page_count}")
+            with cols[2]:
+                if st.button("Próxima ▶", disabled=next_after_id is None):
+                    cursors.append(next_after_id)
+                    st.rerun()
+
         # Show data table
         st.dataframe(df)
         
         # Add export button
-        if st.button("Exportar para Excel"):
-            # Create a download link
-            excel_data = io.BytesIO()
-            with pd.ExcelWriter(excel_data, engine='openpyxl') as writer:
-                df.to_excel(writer, index=False, sheet_name='Leads')
-            
-            current_date = datetime.now().strftime("%Y%m%d")
-            st.download_button(
-                label="Download Excel",
-                data=excel_data.getvalue(),
-                file_name=f"marketing_leads_{current_date}.xlsx",
-                mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-            )
+        current_date = datetime.now().strftime("%Y%m%d")
+        download_button(df, f"marketing_leads_{current_date}", key="mkt_leads_export")
         
         # COOL STATISTICS section with expander
         with st.container(border=True):
@@ -1,4 +1,8 @@
 import re
+from functools import lru_cache
+import numpy as np
+import pandas as pd
+from helpers.distinct import DistinctCache, map_distinct
 
 # Função para limpar telefones
 def clean_telephone(telefone):
@@ -9,6 +13,90 @@ def clean_telephone(telefone):
         telefone = telefone[2:]
     return telefone
 
+# Separadores usados quando o cliente tem mais de um telefone ("11 9999-0001, 11 8888-0002")
+PHONE_SEPARATORS = r'[,/;|]'
+
+def normalize_phones(phones):
+    """
+    Chave canônica de telefone, vetorizada com os kernels de string do pandas.
+
+    - remove tudo que não é dígito e zeros à esquerda (prefixo de discagem);
+    - remove o código do país 55 quando o número tem 12 ou 13 dígitos;
+    - celulares antigos com DDD e 8 dígitos (10 no total, começando em 6-9)
+      ganham o nono dígito: 11 8888-0002 -> 11988880002.
+
+    A normalização é calculada uma vez por valor distinto (ver helpers/distinct.py),
+    com cache entre execuções. Valores vazios ou sem dígitos viram ''.
+    """
+    return map_distinct(phones, _canonical_phones, vectorized=True, cache=_phone_cache)
+
+# Os mesmos números voltam a cada upload e a cada rerun
+_phone_cache = DistinctCache(maxsize=500_000)
+
+def _canonical_phones(values):
+    digits = values.astype('string').str.replace(r'\D', '', regex=True).str.lstrip('0')
+    has_country_code = digits.str.len().isin([12, 13]) & digits.str.startswith('55')
+    digits = digits.mask(has_country_code, digits.str[2:])
+    old_mobile = (digits.str.len() == 10) & digits.str[2].isin(list('6789'))
+    digits = digits.mask(old_mobile, digits.str[:2] + '9' + digits.str[2:])
+    return digits.fillna('').astype(object)
+
+@lru_cache(maxsize=100_000)
+def normalize_phone(telefone):
+    """
+    Versão escalar (memoizada) de normalize_phones, com as mesmas regras em Python puro:
+    chamar os kernels do pandas para um único valor custa milissegundos.
+    """
+    if telefone is None or (isinstance(telefone, float) and telefone != telefone):
+        return ''
+    digits = re.sub(r'\D', '', str(telefone)).lstrip('0')
+    if len(digits) in (12, 13) and digits.startswith('55'):
+        digits = digits[2:]
+    if len(digits) == 10 and digits[2] in '6789':
+        digits = digits[:2] + '9' + digits[2:]
+    return digits
+
+def split_telephones(telefones):
+    """
+    Separa um campo com vários telefones e normaliza cada número individualmente.
+    Aceita uma string ("a, b" ou "a / b") ou uma lista já separada.
+    Retorna a lista de chaves canônicas, sem vazios e sem repetidos.
+    """
+    if telefones is None or (not isinstance(telefones, (list, tuple, np.ndarray)) and pd.isna(telefones)):
+        return []
+    partes = telefones if isinstance(telefones, (list, tuple, np.ndarray)) else [telefones]
+
+    numeros = []
+    for parte in partes:
+        for numero in re.split(PHONE_SEPARATORS, str(parte)):
+            numero = normalize_phone(numero)
+            if numero and numero not in numeros:
+                numeros.append(numero)
+    return numeros
+
+def explode_telephones(phones):
+    """
+    Índice invertido de telefones: uma linha por número, mantendo o índice original.
+    Recebe uma Series com campos de vários telefones (strings ou listas) e
+    retorna uma Series de chaves canônicas.
+    """
+    parts = phones.map(lambda v: list(v) if isinstance(v, (list, tuple, np.ndarray)) else v).explode()
+    parts = parts.dropna().astype(str).str.split(PHONE_SEPARATORS, regex=True).explode()
+
+    keys = normalize_phones(parts)
+    pairs = pd.DataFrame({'row': keys.index, 'key': keys.to_numpy()})
+    pairs = pairs[pairs['key'] != ''].drop_duplicates()
+    return pd.Series(pairs['key'].to_numpy(), index=pairs['row'].to_numpy())
+
+def phone_keys(phones):
+    """
+    Coluna de chaves canônicas por linha, separadas por ', ', calculada uma vez no ingest
+    e reaproveitada pelos cruzamentos (ver explode_telephones).
+    """
+    exploded = explode_telephones(phones.reset_index(drop=True))
+    joined = exploded.groupby(level=0, sort=False).agg(', '.join)
+    return pd.Series(joined.reindex(range(len(phones))).fillna('').to_numpy(), index=phones.index)
+
 columns_to_hide_from_final_df_leads_appointments_sales = [
                     "Telefones Limpos", 
                     "Telefone(s) do cliente",
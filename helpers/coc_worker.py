@@ -1,5 +1,6 @@
 import unicodedata
 import pandas as pd
+from .distinct import DistinctCache, map_distinct
 from .data_wrestler import highlight_total_row_leadsByUser, highlight_total_row_leadsByStore, highlight_total_row
 import streamlit as st
 from datetime import time
@@ -15,6 +16,13 @@ def normalize_name(name: str) -> str:
     name = name.title()                       # capitaliza cada palavra
     return name
 
+# Os mesmos nomes de atendentes/consultoras se repetem em milhares de linhas
+_name_cache = DistinctCache(maxsize=50_000)
+
+def normalize_names(names: pd.Series) -> pd.Series:
+    """normalize_name aplicado a uma coluna, uma vez por nome distinto."""
+    return map_distinct(names, normalize_name, cache=_name_cache)
+
 def apply_formatting_leadsByUser_manha(df, hora_atual):
     def get_threshold(hora):
         if time(11, 0, 0) <= hora <= time(14, 59, 0): # 11:00 até 14:59
@@ -4,9 +4,12 @@ Responsible for getting the data from views/marketing_view.py
 and push it to the database when click on the button is clicked.
 """
 
+import csv
+import io
 import pandas as pd
 import logging
 from datetime import datetime
+from sqlalchemy import column, func, select, table, text
 from sqlalchemy.exc import SQLAlchemyError
 from backend.database import SessionLocal, engine
 from backend.models.mkt_lead import MktLead
@@ -36,6 +39,209 @@ def clean_datetime(value):
     
     return value
 
+# Funnel column -> MktLead text column; missing columns and empty cells are saved as ""
+LEAD_TEXT_COLUMNS = {
+    "Email do lead": "lead_email",
+    "Telefone do lead": "lead_phone",
+    "Mensagem": "lead_message",
+    "Unidade do lead": "lead_store",
+    "Fonte": "lead_source",
+    "Source": "lead_mkt_source",
+    "Medium": "lead_mkt_medium",
+    "Term": "lead_mkt_term",
+    "Content": "lead_mkt_content",
+    "Campaign": "lead_mkt_campaign",
+    "Mês do lead": "lead_month",
+    "Categoria": "lead_category",
+    "Procedimento": "appointment_procedure",
+    "Status Agenda": "appointment_status",
+    "Unidade da Agenda": "appointment_store",
+    "Telefones Limpos": "sale_cleaned_phone",
+    "Telefone(s) do cliente": "sales_phone",
+    "ID orçamento": "sales_quote_id",
+    "Unidade da Venda": "sales_store",
+    "Valor primeiro orçamento": "sales_first_quote",
+    "Total comprado pelo cliente": "sales_total_bought",
+    "Número de orçamentos do cliente": "sales_number_of_quotes",
+    "Mês da Venda": "sales_month",
+    "Dia da Semana": "sales_day_of_week",
+}
+
+LEAD_DATETIME_COLUMNS = {
+    "Data Na Agenda": "appointment_date",
+    "Data Venda": "sales_date",
+}
+
+LEAD_INTEGER_COLUMNS = {
+    "Dia": "sales_day",
+    "intervalo da compra": "sales_interval",
+}
+
+UPSERT_BATCH_SIZE = 5000
+# COPY has no parameter limit: a full month goes in a few statements
+COPY_BATCH_SIZE = 200_000
+COPY_NULL = "\\N"
+
+
+def _column(df, column):
+    if column in df:
+        return df[column]
+    return pd.Series(None, index=df.index, dtype=object)
+
+
+def _to_python(values):
+    """Column values as Python objects, with every missing value as None (what the DB drivers accept)."""
+    return values.astype(object).where(values.notna(), None).tolist()
+
+
+def lead_records(df_leads_with_purchases, fingerprints=None):
+    """
+    MktLead rows built column by column from the funnel table.
+    Rows without a numeric 'ID lead' are skipped; when an ID repeats, the last row wins.
+    
+    Args:
+        df_leads_with_purchases (pd.DataFrame): Funnel table (see frontend/marketing/funnel.py)
+        fingerprints (pd.Series, optional): Match fingerprint per row, aligned to the DataFrame
+        
+    Returns:
+        tuple: (records, skipped)
+            - records (list[dict]): One dict of MktLead columns per lead
+            - skipped (int): Rows without a lead ID
+    """
+    df = df_leads_with_purchases
+    lead_ids = pd.to_numeric(_column(df, "ID lead").replace("", None), errors="coerce")
+    valid = (lead_ids.notna() & (lead_ids % 1 == 0)).to_numpy()
+    skipped = int((~valid).sum())
+    if skipped:
+        logging.warning(f"Skipping {skipped} records with missing lead ID")
+
+    df = df[valid]
+    columns = {"lead_id": lead_ids[valid].astype("int64").tolist()}
+    for source, target in LEAD_TEXT_COLUMNS.items():
+        columns[target] = _column(df, source).fillna("").astype(str).tolist()
+    for source, target in LEAD_DATETIME_COLUMNS.items():
+        columns[target] = _to_python(pd.to_datetime(_column(df, source), errors="coerce"))
+    for source, target in LEAD_INTEGER_COLUMNS.items():
+        columns[target] = _to_python(pd.to_numeric(_column(df, source), errors="coerce").round().astype("Int64"))
+    columns["lead_entry_day"] = _to_python(pd.to_datetime(_column(df, "Dia da entrada"), errors="coerce").dt.day.astype("Int64"))
+    columns["sales_purchased"] = _column(df, "comprou").fillna(False).astype(bool).tolist()
+    columns["match_fingerprint"] = (
+        _to_python(fingerprints.reindex(df.index)) if fingerprints is not None else [None] * len(df)
+    )
+
+    names = list(columns)
+    records = {}
+    for values in zip(*columns.values()):
+        records[values[0]] = dict(zip(names, values))
+    return list(records.values()), skipped
+
+
+def upsert_leads(session, records):
+    """
+    Insert or update MktLead rows with the dialect's native INSERT ... ON CONFLICT (lead_id) DO UPDATE
+    (PostgreSQL and SQLite), executed as one executemany.
+    
+    Returns:
+        tuple: (inserted, updated)
+    """
+    if not records:
+        return 0, 0
+
+    dialect = session.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        raise ValueError(f"Upsert not supported for the {dialect} dialect")
+
+    lead_ids = [record["lead_id"] for record in records]
+    existing = session.scalar(select(func.count()).where(MktLead.lead_id.in_(lead_ids)))
+
+    statement = insert(MktLead.__table__)
+    statement = statement.on_conflict_do_update(
+        index_elements=[MktLead.lead_id],
+        set_={column.name: statement.excluded[column.name] for column in MktLead.__table__.columns if column.name != "lead_id"},
+    )
+    session.execute(statement, records)
+    return len(records) - existing, existing
+
+
+def _copy_buffer(records, columns):
+    """CSV for COPY FROM STDIN: None is written as COPY_NULL, so empty strings stay empty strings."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    for record in records:
+        writer.writerow([COPY_NULL if record[name] is None else record[name] for name in columns])
+    buffer.seek(0)
+    return buffer
+
+
+def copy_merge(session, target, records, key_columns):
+    """
+    PostgreSQL bulk write: stream the records with COPY into a temporary staging table
+    shaped like `target`, then merge it with one INSERT ... SELECT ... ON CONFLICT DO UPDATE.
+    Works for any table (mkt_leads, report snapshots) given its conflict key.
+    
+    Args:
+        session: Session bound to a PostgreSQL (psycopg2) engine
+        target (sqlalchemy.Table): Table to write to
+        records (list[dict]): Rows, every dict with every column of `target`
+        key_columns (list[str]): Columns of the unique constraint to merge on
+        
+    Returns:
+        tuple: (inserted, updated)
+    """
+    if not records:
+        return 0, 0
+    from sqlalchemy.dialects.postgresql import insert
+
+    names = [target_column.name for target_column in target.columns]
+    staging_name = f"staging_{target.name}"
+    staging = table(staging_name, *[column(name) for name in names])
+    preparer = session.get_bind().dialect.identifier_preparer
+
+    session.execute(text(
+        f"CREATE TEMP TABLE {preparer.quote(staging_name)} "
+        f"(LIKE {preparer.format_table(target)} INCLUDING DEFAULTS) ON COMMIT DROP"
+    ))
+    cursor = session.connection().connection.cursor()
+    try:
+        cursor.copy_expert(
+            f"COPY {preparer.quote(staging_name)} ({', '.join(preparer.quote(name) for name in names)}) "
+            f"FROM STDIN WITH (FORMAT csv, NULL '{COPY_NULL}')",
+            _copy_buffer(records, names),
+        )
+    finally:
+        cursor.close()
+
+    existing = session.scalar(
+        select(func.count()).select_from(staging).join(
+            target, *[staging.c[name] == target.c[name] for name in key_columns]
+        )
+    )
+    statement = insert(target).from_select(names, select(*staging.c))
+    statement = statement.on_conflict_do_update(
+        index_elements=key_columns,
+        set_={name: statement.excluded[name] for name in names if name not in key_columns},
+    )
+    session.execute(statement)
+    return len(records) - existing, existing
+
+
+def write_leads(session, records):
+    """
+    Fastest write path for the session's database: COPY + merge on PostgreSQL,
+    executemany ON CONFLICT upsert elsewhere (SQLite).
+    
+    Returns:
+        tuple: (inserted, updated)
+    """
+    if session.get_bind().dialect.name == "postgresql":
+        return copy_merge(session, MktLead.__table__, records, ["lead_id"])
+    return upsert_leads(session, records)
+
+
 def push_data_to_db(df_leads_with_purchases):
     """
     Process and push leads data to the database.
@@ -50,114 +256,14 @@ def push_data_to_db(df_leads_with_purchases):
             - stats (dict): Statistics about the operation (records processed, inserted, updated)
     """
     session = SessionLocal()
-    stats = {"processed": 0, "inserted": 0, "updated": 0, "errors": 0}
+    stats = {"processed": len(df_leads_with_purchases), "inserted": 0, "updated": 0, "errors": 0}
     
     try:
         logging.info(f"Starting database push operation for {len(df_leads_with_purchases)} records")
-        
-        # Begin a transaction
-        for _, row in df_leads_with_purchases.iterrows():
-            stats["processed"] += 1
-            
-            try:
-                # Check if lead already exists in database
-                lead_id = str(row.get("ID lead", ""))
-                if not lead_id:
-                    logging.warning(f"Skipping record with missing lead ID")
-                    stats["errors"] += 1
-                    continue
-                    
-                existing_lead = session.query(MktLead).filter_by(lead_id=lead_id).first()
-                
-                if existing_lead:
-                    logging.info(f"Updating existing lead with ID: {lead_id}")
-                    # Update existing lead
-                    existing_lead.lead_email = str(row.get("Email do lead", ""))
-                    existing_lead.lead_phone = str(row.get("Telefone do lead", ""))
-                    existing_lead.lead_message = str(row.get("Mensagem", ""))
-                    existing_lead.lead_store = str(row.get("Unidade do lead", ""))
-                    existing_lead.lead_source = str(row.get("Fonte", ""))
-                    existing_lead.lead_entry_day = row.get("Dia da entrada").day if row.get("Dia da entrada") else None
-                    existing_lead.lead_mkt_source = str(row.get("Source", ""))
-                    existing_lead.lead_mkt_medium = str(row.get("Medium", ""))
-                    existing_lead.lead_mkt_term = str(row.get("Term", ""))
-                    existing_lead.lead_mkt_content = str(row.get("Content", ""))
-                    existing_lead.lead_mkt_campaign = str(row.get("Campaign", ""))
-                    existing_lead.lead_month = str(row.get("Mês do lead", ""))
-                    existing_lead.lead_category = str(row.get("Categoria", ""))
-                    
-                    # Appointment data
-                    existing_lead.appointment_date = clean_datetime(row.get("Data Na Agenda"))
-                    existing_lead.appointment_procedure = str(row.get("Procedimento", ""))
-                    existing_lead.appointment_status = str(row.get("Status Agenda", ""))
-                    existing_lead.appointment_store = str(row.get("Unidade da Agenda", ""))
-                    
-                    # Sales data
-                    existing_lead.sale_cleaned_phone = str(row.get("Telefones Limpos", ""))
-                    existing_lead.sales_phone = str(row.get("Telefone(s) do cliente", ""))
-                    existing_lead.sales_quote_id = str(row.get("ID orçamento", ""))
-                    existing_lead.sales_date = clean_datetime(row.get("Data Venda"))
-                    existing_lead.sales_store = str(row.get("Unidade da Venda", ""))
-                    existing_lead.sales_first_quote = str(row.get("Valor primeiro orçamento", ""))
-                    existing_lead.sales_total_bought = str(row.get("Total comprado pelo cliente", ""))
-                    existing_lead.sales_number_of_quotes = str(row.get("Número de orçamentos do cliente", ""))
-                    existing_lead.sales_day = row.get("Dia") if isinstance(row.get("Dia"), int) else None
-                    existing_lead.sales_month = str(row.get("Mês da Venda", ""))
-                    existing_lead.sales_day_of_week = str(row.get("Dia da Semana", ""))
-                    existing_lead.sales_purchased = bool(row.get("comprou", False))
-                    existing_lead.sales_interval = row.get("intervalo da compra") if row.get("intervalo da compra") else None
-                    
-                    stats["updated"] += 1
-                else:
-                    logging.info(f"Creating new lead with ID: {lead_id}")
-                    # Create new lead record
-                    new_lead = MktLead(
-                        lead_id=lead_id,
-                        lead_email=str(row.get("Email do lead", "")),
-                        lead_phone=str(row.get("Telefone do lead", "")),
-                        lead_message=str(row.get("Mensagem", "")),
-                        lead_store=str(row.get("Unidade do lead", "")),
-                        lead_source=str(row.get("Fonte", "")),
-                        lead_entry_day=row.get("Dia da entrada").day if row.get("Dia da entrada") else None,
-                        lead_mkt_source=str(row.get("Source", "")),
-                        lead_mkt_medium=str(row.get("Medium", "")),
-                        lead_mkt_term=str(row.get("Term", "")),
-                        lead_mkt_content=str(row.get("Content", "")),
-                        lead_mkt_campaign=str(row.get("Campaign", "")),
-                        lead_month=str(row.get("Mês do lead", "")),
-                        lead_category=str(row.get("Categoria", "")),
-                        
-                        # Appointment data
-                        appointment_date=clean_datetime(row.get("Data Na Agenda")),
-                        appointment_procedure=str(row.get("Procedimento", "")),
-                        appointment_status=str(row.get("Status Agenda", "")),
-                        appointment_store=str(row.get("Unidade da Agenda", "")),
-                        
-                        # Sales data
-                        sale_cleaned_phone=str(row.get("Telefones Limpos", "")),
-                        sales_phone=str(row.get("Telefone(s) do cliente", "")),
-                        sales_quote_id=str(row.get("ID orçamento", "")),
-                        sales_date=clean_datetime(row.get("Data Venda")),
-                        sales_store=str(row.get("Unidade da Venda", "")),
-                        sales_first_quote=str(row.get("Valor primeiro orçamento", "")),
-                        sales_total_bought=str(row.get("Total comprado pelo cliente", "")),
-                        sales_number_of_quotes=str(row.get("Número de orçamentos do cliente", "")),
-                        sales_day=row.get("Dia") if isinstance(row.get("Dia"), int) else None,
-                        sales_month=str(row.get("Mês da Venda", "")),
-                        sales_day_of_week=str(row.get("Dia da Semana", "")),
-                        sales_purchased=bool(row.get("comprou", False)),
-                        sales_interval=row.get("intervalo da compra") if row.get("intervalo da compra") else None
-                    )
-                    session.add(new_lead)
-                    stats["inserted"] += 1
-                    logging.info(f"Count updated: {stats['processed']}")
-                    
-            except Exception as e:
-                logging.error(f"Error processing record {stats['processed']}: {str(e)}")
-                stats["errors"] += 1
-                continue
-                
-        # Commit the transaction
+        records, stats["errors"] = lead_records(df_leads_with_purchases)
+        inserted, updated = write_leads(session, records)
+        stats["inserted"] += inserted
+        stats["updated"] += updated
         session.commit()
         success = True
         message = f"Successfully processed {stats['processed']} records: {stats['inserted']} inserted, {stats['updated']} updated, {stats['errors']} errors"
@@ -220,13 +326,16 @@ def save_data_to_db(df_leads_with_purchases):
     
     return success, user_message
 
-def save_data_to_db_batch(df_leads_with_purchases):
+def save_data_to_db_batch(df_leads_with_purchases, fingerprints=None):
     """
     Batch processing version that handles large datasets more efficiently.
-    Processes records in chunks rather than one by one, significantly improving performance.
+    Builds the rows column by column (lead_records) and writes each batch with
+    write_leads: COPY + merge on PostgreSQL, ON CONFLICT upsert on SQLite.
     
     Args:
         df_leads_with_purchases (pd.DataFrame): DataFrame containing leads, appointments, and sales data
+        fingerprints (pd.Series, optional): Match fingerprint per row, aligned to the DataFrame
+            (see frontend/marketing/incremental.py)
         
     Returns:
         tuple: (success_flag, user_message)
@@ -234,155 +343,27 @@ def save_data_to_db_batch(df_leads_with_purchases):
     if df_leads_with_purchases is None or df_leads_with_purchases.empty:
         return False, "No data to save. Please process the data first."
     
-    batch_size = 2000
     total_records = len(df_leads_with_purchases)
-    total_batches = (total_records + batch_size - 1) // batch_size
 
-    stats = {"processed": 0, "inserted": 0, "updated": 0, "errors": 0}
+    stats = {"processed": total_records, "inserted": 0, "updated": 0, "errors": 0}
     overall_success = True
     error_messages = []
 
-    logging.info(f"Start batch processing: {total_records} records, {total_batches} batches with {batch_size} records per batch")
-
     session = SessionLocal()
+    batch_size = COPY_BATCH_SIZE if session.get_bind().dialect.name == "postgresql" else UPSERT_BATCH_SIZE
+    records, stats["errors"] = lead_records(df_leads_with_purchases, fingerprints)
+    total_batches = max((len(records) + batch_size - 1) // batch_size, 1)
+    logging.info(f"Start batch processing: {total_records} records, {total_batches} batches with {batch_size} records per batch")
 
     try:
-        # Process data in batches
         for batch_num in range(total_batches):
-            start_idx = batch_num * batch_size
-            end_idx = min(start_idx + batch_size, total_records)
-            current_batch = df_leads_with_purchases.iloc[start_idx:end_idx]
-
-            logging.info(f"Processing batch {batch_num + 1} of {total_batches}")
-
-            to_insert = []
-            to_update = []
-            
-            lead_ids = [str(row.get("ID lead", "")) for _, row in current_batch.iterrows() if row.get("ID lead", "")]
-            existing_leads = {lead.lead_id: lead for lead in session.query(MktLead).filter(MktLead.lead_id.in_(lead_ids)).all()}
-
-            for _, row in current_batch.iterrows():
-                stats["processed"] += 1
-
-                try:
-                    lead_id = str(row.get("ID lead", ""))
-                    if not lead_id:
-                        logging.warning(f"Skipping record with missing lead ID")
-                        stats["errors"] += 1
-                        continue
-
-                     # Check if lead exists
-                    if lead_id in existing_leads:
-                        # Update existing lead
-                        existing_lead = existing_leads[lead_id]
-                        logging.info(f"Updating existing lead with ID: {lead_id}")
-                        
-                        # Update fields
-                        existing_lead.lead_email = str(row.get("Email do lead", ""))
-                        existing_lead.lead_phone = str(row.get("Telefone do lead", ""))
-                        existing_lead.lead_message = str(row.get("Mensagem", ""))
-                        existing_lead.lead_store = str(row.get("Unidade do lead", ""))
-                        existing_lead.lead_source = str(row.get("Fonte", ""))
-                        existing_lead.lead_entry_day = row.get("Dia da entrada").day if row.get("Dia da entrada") else None
-                        existing_lead.lead_mkt_source = str(row.get("Source", ""))
-                        existing_lead.lead_mkt_medium = str(row.get("Medium", ""))
-                        existing_lead.lead_mkt_term = str(row.get("Term", ""))
-                        existing_lead.lead_mkt_content = str(row.get("Content", ""))
-                        existing_lead.lead_mkt_campaign = str(row.get("Campaign", ""))
-                        existing_lead.lead_month = str(row.get("Mês do lead", ""))
-                        existing_lead.lead_category = str(row.get("Categoria", ""))
-                        
-                        # Appointment data
-                        existing_lead.appointment_date = clean_datetime(row.get("Data Na Agenda"))
-                        existing_lead.appointment_procedure = str(row.get("Procedimento", ""))
-                        existing_lead.appointment_status = str(row.get("Status Agenda", ""))
-                        existing_lead.appointment_store = str(row.get("Unidade da Agenda", ""))
-                        
-                        # Sales data
-                        existing_lead.sale_cleaned_phone = str(row.get("Telefones Limpos", ""))
-                        existing_lead.sales_phone = str(row.get("Telefone(s) do cliente", ""))
-                        existing_lead.sales_quote_id = str(row.get("ID orçamento", ""))
-                        existing_lead.sales_date = clean_datetime(row.get("Data Venda"))
-                        existing_lead.sales_store = str(row.get("Unidade da Venda", ""))
-                        existing_lead.sales_first_quote = str(row.get("Valor primeiro orçamento", ""))
-                        existing_lead.sales_total_bought = str(row.get("Total comprado pelo cliente", ""))
-                        existing_lead.sales_number_of_quotes = str(row.get("Número de orçamentos do cliente", ""))
-                        existing_lead.sales_day = row.get("Dia") if isinstance(row.get("Dia"), int) else None
-                        existing_lead.sales_month = str(row.get("Mês da Venda", ""))
-                        existing_lead.sales_day_of_week = str(row.get("Dia da Semana", ""))
-                        existing_lead.sales_purchased = bool(row.get("comprou", False))
-                        existing_lead.sales_interval = row.get("intervalo da compra") if row.get("intervalo da compra") else None
-                        
-                        to_update.append(existing_lead)
-                        stats["updated"] += 1
-                    else:
-                        # Create new lead
-                        logging.info(f"Creating new lead with ID: {lead_id}")
-                        new_lead = MktLead(
-                            lead_id=lead_id,
-                            lead_email=str(row.get("Email do lead", "")),
-                            lead_phone=str(row.get("Telefone do lead", "")),
-                            lead_message=str(row.get("Mensagem", "")),
-                            lead_store=str(row.get("Unidade do lead", "")),
-                            lead_source=str(row.get("Fonte", "")),
-                            lead_entry_day=row.get("Dia da entrada").day if row.get("Dia da entrada") else None,
-                            lead_mkt_source=str(row.get("Source", "")),
-                            lead_mkt_medium=str(row.get("Medium", "")),
-                            lead_mkt_term=str(row.get("Term", "")),
-                            lead_mkt_content=str(row.get("Content", "")),
-                            lead_mkt_campaign=str(row.get("Campaign", "")),
-                            lead_month=str(row.get("Mês do lead", "")),
-                            lead_category=str(row.get("Categoria", "")),
-                            
-                            # Appointment data
-                            appointment_date=clean_datetime(row.get("Data Na Agenda")),
-                            appointment_procedure=str(row.get("Procedimento", "")),
-                            appointment_status=str(row.get("Status Agenda", "")),
-                            appointment_store=str(row.get("Unidade da Agenda", "")),
-                            
-                            # Sales data
-                            sale_cleaned_phone=str(row.get("Telefones Limpos", "")),
-                            sales_phone=str(row.get("Telefone(s) do cliente", "")),
-                            sales_quote_id=str(row.get("ID orçamento", "")),
-                            sales_date=clean_datetime(row.get("Data Venda")),
-                            sales_store=str(row.get("Unidade da Venda", "")),
-                            sales_first_quote=str(row.get("Valor primeiro orçamento", "")),
-                            sales_total_bought=str(row.get("Total comprado pelo cliente", "")),
-                            sales_number_of_quotes=str(row.get("Número de orçamentos do cliente", "")),
-                            sales_day=row.get("Dia") if isinstance(row.get("Dia"), int) else None,
-                            sales_month=str(row.get("Mês da Venda", "")),
-                            sales_day_of_week=str(row.get("Dia da Semana", "")),
-                            sales_purchased=bool(row.get("comprou", False)),
-                            sales_interval=row.get("intervalo da compra") if row.get("intervalo da compra") else None
-                        )
-                        to_insert.append(new_lead)
-                        stats["inserted"] += 1
-                        logging.info(f"Count updated: {stats['processed']}")
-                
-                except Exception as e:
-                    logging.error(f"Error processing record {stats['processed']} in batch {batch_num+1}: {str(e)}")
-                    stats["errors"] += 1
-                    continue
+            batch = records[batch_num * batch_size:(batch_num + 1) * batch_size]
             try:
-                # Bulk insert new records
-                if to_insert:
-                    logging.info(f"Preparing {len(to_insert)} records for bulk insert in batch {batch_num+1}")
-                    # Clean all datetime fields before bulk insert
-                    for obj in to_insert:
-                        obj.appointment_date = clean_datetime(obj.appointment_date)
-                        obj.sales_date = clean_datetime(obj.sales_date)
-                    
-                    # Now perform the bulk insert with clean datetime values
-                    session.bulk_save_objects(to_insert)
-                    logging.info(f"Bulk inserted {len(to_insert)} new records in batch {batch_num+1}")
-                
-                # For updates, we've already modified the objects in the session
-                if to_update:
-                    logging.info(f"Updated {len(to_update)} existing records in batch {batch_num+1}")
-                
-                # Commit batch
+                inserted, updated = write_leads(session, batch)
                 session.commit()
-                logging.info(f"Committed batch {batch_num+1}/{total_batches}")
+                stats["inserted"] += inserted
+                stats["updated"] += updated
+                logging.info(f"Committed batch {batch_num+1}/{total_batches}: {inserted} inserted, {updated} updated")
                 
             except SQLAlchemyError as e:
                 session.rollback()
@@ -1,14 +1,137 @@
+"""
+Usage notifications to Discord.
+
+send_discord_message() never touches the network: it drops the message in an
+in-process queue and returns. A daemon worker drains the queue, joins up to
+BATCH_SIZE messages into one post and sends it to the configured sink with a
+timeout. When the queue is full (webhook down or slow) new messages are dropped
+instead of blocking the page.
+
+Tests and local runs can swap the webhook for a file:
+
+    from helpers import discord
+    discord.set_sink(discord.FileSink("telemetry.log"))
+"""
+
+import logging
+import os
+import queue
+import threading
+import time
+from datetime import datetime
+
 import requests
 from dotenv import load_dotenv
-import os
-import streamlit as st
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 WEBHOOK_DISCORD = os.getenv('WEBHOOK_DISCORD')
 
+MAX_QUEUE_SIZE = 500
+BATCH_SIZE = 20
+FLUSH_INTERVAL = 2        # seconds the worker waits for more messages before posting
+REQUEST_TIMEOUT = 5       # seconds
+DISCORD_MAX_LENGTH = 2000  # Discord rejects longer message content
+
+stats = {"queued": 0, "sent": 0, "dropped": 0, "failed": 0}
+
+
+class WebhookSink:
+    """Posts batches to a Discord webhook."""
+
+    def __init__(self, url, timeout=REQUEST_TIMEOUT):
+        self.url = url
+        self.timeout = timeout
+
+    def send(self, messages):
+        if not self.url:
+            return
+        content = "\n".join(messages)[:DISCORD_MAX_LENGTH]
+        response = requests.post(self.url, json={"content": content}, timeout=self.timeout)
+        response.raise_for_status()
+
+
+class FileSink:
+    """Appends batches to a local file, one timestamped line per message."""
+
+    def __init__(self, path):
+        self.path = path
+
+    def send(self, messages):
+        timestamp = datetime.now().isoformat(timespec="seconds")
+        with open(self.path, "a", encoding="utf-8") as f:
+            for message in messages:
+                f.write(f"{timestamp} {message}\n")
+
+
+_sink = WebhookSink(WEBHOOK_DISCORD)
+_queue = queue.Queue(maxsize=MAX_QUEUE_SIZE)
+_worker = None
+_worker_lock = threading.Lock()
+
+
+def set_sink(sink):
+    """Replace the destination of notifications (any object with send(messages))."""
+    global _sink
+    _sink = sink
+
+
 def send_discord_message(message):
-    url = WEBHOOK_DISCORD
-    data = {"content": message}
-    response = requests.post(url, json=data)
-    return response.status_code
\ No newline at end of file
+    """
+    Queue a notification without blocking.
+
+    Returns:
+        bool: False if the message was dropped because the queue is full
+    """
+    _ensure_worker()
+    try:
+        _queue.put_nowait(message)
+    except queue.Full:
+        stats["dropped"] += 1
+        return False
+    stats["queued"] += 1
+    return True
+
+
+def flush(timeout=REQUEST_TIMEOUT):
+    """Block until every queued message was handed to the sink (or timeout)."""
+    deadline = time.monotonic() + timeout
+    while _queue.unfinished_tasks and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return _queue.unfinished_tasks == 0
+
+
+def _ensure_worker():
+    global _worker
+    if _worker is not None and _worker.is_alive():
+        return
+    with _worker_lock:
+        if _worker is None or not _worker.is_alive():
+            _worker = threading.Thread(target=_drain, name="discord-notifications", daemon=True)
+            _worker.start()
+
+
+def _drain():
+    while True:
+        batch = [_queue.get()]
+        deadline = time.monotonic() + FLUSH_INTERVAL
+        while len(batch) < BATCH_SIZE:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(_queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+
+        try:
+            _sink.send(batch)
+            stats["sent"] += len(batch)
+        except Exception as e:
+            stats["failed"] += len(batch)
+            logger.warning(f"Failed to send {len(batch)} notifications: {str(e)}")
+        finally:
+            for _ in batch:
+                _queue.task_done()
@@ -0,0 +1,106 @@
+"""
+distinct.py
+responsible for computing per-value transformations once per distinct value.
+
+Columns such as lead Content/Mensagem, attendant names and phone numbers
+repeat heavily across rows. map_distinct factorizes the column, applies the
+function to the distinct values only and broadcasts the results back through
+the codes. An optional DistinctCache keeps results across calls, so Streamlit
+reruns over the same data skip the work entirely.
+"""
+
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+
+def _is_missing(key):
+    # NaN never matches itself as a dict key, and pd.NA cannot be compared
+    return key is pd.NA or key is pd.NaT or (isinstance(key, float) and key != key)
+
+
+class DistinctCache:
+    """Thread-safe LRU of value -> result, kept at module level so it survives reruns."""
+
+    def __init__(self, maxsize=100_000):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def lookup(self, keys):
+        """
+        Returns:
+            tuple: (results object array, boolean mask of the keys not cached)
+        """
+        results = np.empty(len(keys), dtype=object)
+        missing = np.ones(len(keys), dtype=bool)
+        with self._lock:
+            for i, key in enumerate(keys):
+                if _is_missing(key):
+                    continue
+                try:
+                    results[i] = self._data[key]
+                except (KeyError, TypeError):
+                    continue
+                self._data.move_to_end(key)
+                missing[i] = False
+        return results, missing
+
+    def store(self, keys, results):
+        with self._lock:
+            for key, result in zip(keys, results):
+                if _is_missing(key):
+                    continue
+                try:
+                    self._data[key] = result
+                except TypeError:
+                    continue
+                self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+def map_distinct(values, func, vectorized=False, cache=None):
+    """
+    Apply `func` once per distinct value of `values` and broadcast the results.
+
+    Args:
+        values: pd.Series to transform (missing values, None or NaN, are one more distinct value)
+        func: Scalar function, or with vectorized=True a function from a Series of
+            distinct values to a Series/array of results of the same length
+        vectorized: Whether func takes the whole Series of distinct values
+        cache: Optional DistinctCache shared across calls
+
+    Returns:
+        pd.Series: object Series with the same index and name as values
+    """
+    codes, uniques = pd.factorize(values.to_numpy(dtype=object), use_na_sentinel=False)
+    uniques = np.asarray(uniques, dtype=object)
+
+    if cache is not None:
+        results, missing = cache.lookup(uniques)
+    else:
+        results, missing = np.empty(len(uniques), dtype=object), np.ones(len(uniques), dtype=bool)
+
+    pending = uniques[missing]
+    if len(pending):
+        if vectorized:
+            computed = np.asarray(func(pd.Series(pending, dtype=object)), dtype=object)
+        else:
+            computed = np.empty(len(pending), dtype=object)
+            for i, value in enumerate(pending):
+                computed[i] = func(value)
+        results[missing] = computed
+        if cache is not None:
+            cache.store(pending, computed)
+
+    return pd.Series(results.take(codes), index=values.index, name=values.name, dtype=object)
@@ -0,0 +1,155 @@
+# helpers/export.py
+"""
+File exports for report downloads.
+
+Artifacts are only produced when a download is requested, written to disk in
+chunks of EXPORT_CHUNK_SIZE rows (CSV, XLSX through openpyxl's write-only
+workbook, Parquet through pyarrow's ParquetWriter) and cached by dataset hash,
+so exporting the same table twice reuses the file already on disk.
+"""
+
+import hashlib
+import logging
+import os
+import tempfile
+import time
+
+import pandas as pd
+from openpyxl import Workbook
+
+logger = logging.getLogger(__name__)
+
+EXPORT_DIR = os.path.join(tempfile.gettempdir(), "dash_streamlit_exports")
+EXPORT_CHUNK_SIZE = 10_000
+MAX_CACHED_EXPORTS = 20
+
+EXPORT_FORMATS = {
+    "xlsx": ("Excel", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+    "csv": ("CSV", "text/csv"),
+    "parquet": ("Parquet", "application/vnd.apache.parquet"),
+}
+
+
+def available_formats():
+    """Export formats usable in this environment (Parquet needs pyarrow)."""
+    formats = ["xlsx", "csv"]
+    try:
+        import pyarrow  # noqa: F401
+        formats.append("parquet")
+    except ImportError:
+        pass
+    return formats
+
+
+def dataset_hash(df):
+    """Content hash of a DataFrame (columns and values)."""
+    digest = hashlib.sha1("|".join(map(str, df.columns)).encode("utf-8"))
+    try:
+        digest.update(pd.util.hash_pandas_object(df, index=False).values.tobytes())
+    except TypeError:
+        # Unhashable cells (lists, dicts): fall back to their text representation
+        digest.update(pd.util.hash_pandas_object(df.astype(str), index=False).values.tobytes())
+    return digest.hexdigest()
+
+
+def export_dataframe(df, fmt, sheet_name="Leads", digest=None):
+    """
+    Write a DataFrame to an export file, reusing a cached one for identical data.
+
+    Args:
+        df: DataFrame to export
+        fmt: One of EXPORT_FORMATS
+        sheet_name: Worksheet name for XLSX exports
+        digest: Precomputed dataset_hash(df), if the caller already has it
+
+    Returns:
+        str: Path of the export file
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported export format: {fmt}")
+
+    os.makedirs(EXPORT_DIR, exist_ok=True)
+    path = os.path.join(EXPORT_DIR, f"{digest or dataset_hash(df)}.{fmt}")
+    if os.path.exists(path):
+        os.utime(path)
+        return path
+
+    started = time.monotonic()
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        if fmt == "csv":
+            _write_csv(df, tmp_path)
+        elif fmt == "xlsx":
+            _write_xlsx(df, tmp_path, sheet_name)
+        else:
+            _write_parquet(df, tmp_path)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+    logger.info(f"Exported {len(df)} rows to {fmt} in {time.monotonic() - started:.2f}s")
+    _evict_old_exports()
+    return path
+
+
+def _chunks(df):
+    for start in range(0, len(df), EXPORT_CHUNK_SIZE):
+        yield df.iloc[start:start + EXPORT_CHUNK_SIZE]
+
+
+def _write_csv(df, path):
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        df.iloc[:0].to_csv(f, index=False)
+        for chunk in _chunks(df):
+            chunk.to_csv(f, index=False, header=False)
+
+
+def _write_xlsx(df, path, sheet_name):
+    workbook = Workbook(write_only=True)
+    worksheet = workbook.create_sheet(sheet_name)
+    worksheet.append([str(column) for column in df.columns])
+
+    for chunk in _chunks(df):
+        chunk = chunk.astype(object).where(chunk.notna(), None)
+        for row in chunk.itertuples(index=False, name=None):
+            worksheet.append([_excel_value(value) for value in row])
+
+    workbook.save(path)
+
+
+def _excel_value(value):
+    if isinstance(value, pd.Timestamp):
+        # Excel has no timezone support
+        return value.tz_localize(None).to_pydatetime() if value.tzinfo else value.to_pydatetime()
+    if isinstance(value, (list, dict, set, tuple)):
+        return str(value)
+    return value
+
+
+def _write_parquet(df, path):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    object_columns = [column for column in df.columns if df[column].dtype == object]
+    schema = pa.Schema.from_pandas(df.iloc[:0], preserve_index=False)
+    for column in object_columns:
+        # Object columns mix strings, numbers and timestamps after fillna(""); store them as text
+        schema = schema.set(schema.get_field_index(str(column)), pa.field(str(column), pa.string()))
+
+    with pq.ParquetWriter(path, schema) as writer:
+        for chunk in _chunks(df):
+            chunk = chunk.copy()
+            for column in object_columns:
+                chunk[column] = chunk[column].where(chunk[column].isna(), chunk[column].astype(str))
+            writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+
+
+def _evict_old_exports():
+    files = [os.path.join(EXPORT_DIR, name) for name in os.listdir(EXPORT_DIR) if not name.endswith(".tmp")]
+    files.sort(key=os.path.getmtime, reverse=True)
+    for old_file in files[MAX_CACHED_EXPORTS:]:
+        try:
+            os.remove(old_file)
+        except OSError:
+            pass
@@ -0,0 +1,237 @@
+# helpers/live_board.py
+"""
+Shared, auto-refreshing snapshot of the COC leads-by-user and appointment tables.
+
+One LiveBoard exists per (start_date, end_date) in the process. A task on the
+shared async runtime (helpers/runtime.py) refreshes it on an interval and
+every open session reads the same in-memory tables, so a wallboard left open all day costs one refresh per
+interval instead of one full fetch per "Carregar" click per user.
+
+Refreshes are incremental:
+- leads by user is a small aggregated report (one row per attendant) and is
+  re-fetched every tick;
+- appointments are probed with a single `meta.total` request and only fully
+  re-fetched when the total changed, or every FULL_RECONCILE_EVERY ticks to
+  pick up status changes. Rows are upserted by 'ID agendamento', and only from
+  a complete fetch: a failed probe, a failed fetch or one that returned fewer
+  rows than the probed total leaves the board as it was;
+- a failed leads fetch keeps the previous table, an empty one clears it;
+- ranges that ended before today are fetched once and never refreshed again.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from datetime import date, datetime
+
+import aiohttp
+import pandas as pd
+
+from helpers import runtime
+from apiCrm.resolvers.coc.fetch_leadsByUserReport import fetch_leadsByUserReport
+from apiCrm.resolvers.dashboard.fetch_appointmentReport import (
+    fetch_appointmentReportCreatedAt,
+    fetch_appointmentReportCreatedAt_total
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_REFRESH_INTERVAL = 60   # seconds between background refreshes
+FULL_RECONCILE_EVERY = 5        # ticks between forced full appointment fetches
+IDLE_TIMEOUT = 15 * 60          # stop refreshing when nobody read the board for this long
+
+
+def _month_range(start_date):
+    start_date_custom = pd.to_datetime(start_date)
+    first_day = start_date_custom.replace(day=1)
+    last_day = first_day + pd.offsets.MonthEnd(0)
+    return first_day.strftime('%Y-%m-%d'), last_day.strftime('%Y-%m-%d')
+
+
+class LiveBoard:
+    """
+    In-memory leads-by-user and appointment tables for one date range,
+    kept fresh by a background task on the async runtime.
+    """
+
+    def __init__(self, start_date, end_date, refresh_interval=DEFAULT_REFRESH_INTERVAL):
+        self.start_date = start_date
+        self.end_date = end_date
+        self.refresh_interval = refresh_interval
+
+        self.version = 0
+        self.last_refresh = None
+        self.stats = {"ticks": 0, "probes": 0, "full_fetches": 0, "skipped_fetches": 0, "failed_fetches": 0}
+
+        self._lock = threading.Lock()
+        self._future = None
+        self._last_read = time.monotonic()
+
+        self._leads = []
+        self._appointments = {}
+        self._appointments_total = None
+        self._month_leads = []
+        self._track_month = False
+        self._month_pending = False
+
+    @property
+    def is_closed(self):
+        """True when the range ended before today, so its data can no longer change."""
+        return pd.to_datetime(self.end_date).date() < date.today()
+
+    @property
+    def is_running(self):
+        return self._future is not None and not self._future.done()
+
+    def track_month(self):
+        """Also keep the leads-by-user report for the whole month of start_date."""
+        with self._lock:
+            if not self._track_month:
+                self._track_month = True
+                self._month_pending = True
+
+    def snapshot(self):
+        """
+        Returns:
+            tuple: (version, df_leads, df_appointments, df_month_leads)
+        """
+        with self._lock:
+            self._last_read = time.monotonic()
+            return (
+                self.version,
+                pd.DataFrame(self._leads),
+                pd.DataFrame(list(self._appointments.values())),
+                pd.DataFrame(self._month_leads)
+            )
+
+    def start(self):
+        if self.is_running:
+            return
+        self._future = runtime.submit(self._run())
+
+    def stop(self):
+        if self._future is not None:
+            self._future.cancel()
+
+    async def _run(self):
+        while True:
+            if time.monotonic() - self._last_read > IDLE_TIMEOUT:
+                logger.info(f"Live board {self.start_date}..{self.end_date} idle, stopping refresh")
+                break
+
+            try:
+                await self.refresh()
+            except Exception as e:
+                logger.error(f"Live board refresh failed: {str(e)}")
+
+            if self.is_closed and self.version > 0:
+                logger.info(f"Live board {self.start_date}..{self.end_date} is closed, no further refreshes")
+                break
+
+            await asyncio.sleep(self.refresh_interval)
+
+    async def refresh(self):
+        """Fetch what changed since the last refresh and apply it to the shared tables."""
+        with self._lock:
+            tick = self.stats["ticks"]
+            known_total = self._appointments_total
+            reconcile = known_total is None or tick % FULL_RECONCILE_EVERY == 0
+            fetch_month = self._track_month and (self._month_pending or reconcile)
+
+        async with aiohttp.ClientSession() as session:
+            leads = await fetch_leadsByUserReport(session, self.start_date, self.end_date)
+
+            total = await fetch_appointmentReportCreatedAt_total(session, self.start_date, self.end_date)
+
+            # Without a total there is no way to tell a complete fetch from a partial one
+            fetched = False
+            appointments = None
+            if total is not None and (reconcile or total != known_total):
+                fetched = True
+                appointments = await fetch_appointmentReportCreatedAt(session, self.start_date, self.end_date)
+
+            month_leads = None
+            if fetch_month:
+                month_start_date, month_end_date = _month_range(self.start_date)
+                month_leads = await fetch_leadsByUserReport(session, month_start_date, month_end_date)
+
+        self._apply(leads, fetched, appointments, total, month_leads)
+
+    def _apply(self, leads, fetched, appointments, total, month_leads):
+        """
+        Apply one refresh. The resolvers return None when a request failed, and
+        a failed or incomplete fetch never replaces what the board already has.
+        """
+        with self._lock:
+            changed = False
+            self.stats["probes"] += 1
+
+            if leads is not None and _strip_timestamps(leads) != _strip_timestamps(self._leads):
+                self._leads = leads
+                changed = True
+
+            if not fetched:
+                self.stats["skipped_fetches"] += 1
+            elif appointments is None or len(appointments) < total:
+                self.stats["failed_fetches"] += 1
+                logger.warning(
+                    f"Live board {self.start_date}..{self.end_date}: incomplete appointment fetch "
+                    f"({'failed' if appointments is None else len(appointments)} of {total}), keeping previous rows"
+                )
+            else:
+                self.stats["full_fetches"] += 1
+                changed |= self._upsert_appointments(appointments)
+                self._appointments_total = total
+
+            if month_leads is not None:
+                self._month_leads = month_leads
+                self._month_pending = False
+                changed = True
+
+            if changed or self.last_refresh is None:
+                self.version += 1
+            self.stats["ticks"] += 1
+            self.last_refresh = datetime.now()
+
+    def _upsert_appointments(self, appointments):
+        incoming = {appointment['ID agendamento']: appointment for appointment in appointments}
+
+        removed = [appointment_id for appointment_id in self._appointments if appointment_id not in incoming]
+        upserted = [
+            appointment_id for appointment_id, appointment in incoming.items()
+            if self._appointments.get(appointment_id) != appointment
+        ]
+
+        for appointment_id in removed:
+            del self._appointments[appointment_id]
+        for appointment_id in upserted:
+            self._appointments[appointment_id] = incoming[appointment_id]
+
+        if removed or upserted:
+            logger.info(f"Live board {self.start_date}..{self.end_date}: {len(upserted)} appointments upserted, {len(removed)} removed")
+        return bool(removed or upserted)
+
+
+def _strip_timestamps(leads):
+    # process_leads_data stamps every row with created_at, which changes on every fetch
+    return [{k: v for k, v in lead.items() if k != 'created_at'} for lead in leads]
+
+
+_boards = {}
+_boards_lock = threading.Lock()
+
+
+def get_live_board(start_date, end_date, refresh_interval=DEFAULT_REFRESH_INTERVAL):
+    """
+    Return the shared LiveBoard for a date range, starting its background refresh if needed.
+    """
+    key = (start_date, end_date)
+    with _boards_lock:
+        board = _boards.get(key)
+        if board is None:
+            board = LiveBoard(start_date, end_date, refresh_interval=refresh_interval)
+            _boards[key] = board
+        if not board.is_running and not (board.is_closed and board.version > 0):
+            board.start()
+    return board
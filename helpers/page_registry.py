@@ -0,0 +1,60 @@
+# helpers/page_registry.py
+"""
+Lazy loading of page modules.
+
+The menu in app.py refers to pages by import path ("package.module:function").
+A page module, and everything it pulls in (Plotly, gspread, the database
+engine, resolvers...), is only imported the first time that page is selected.
+Import times are recorded in `import_timings` and logged, so cold start and
+first-visit cost of each page can be tracked; `render_timings` keeps the last
+render time of each page to track per-rerun overhead.
+"""
+
+import importlib
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+import_timings = {}  # page path -> seconds spent importing its module
+render_timings = {}  # page path -> seconds spent in the last render
+
+_pages = {}
+_lock = threading.Lock()
+
+
+def load_page(path):
+    """
+    Resolve a "module:function" path to the page function, importing the module on first use.
+
+    Args:
+        path: Import path, e.g. "frontend.st_dash.lead_view:load_page_leads"
+
+    Returns:
+        callable: The page function
+    """
+    page = _pages.get(path)
+    if page is not None:
+        return page
+
+    with _lock:
+        if path not in _pages:
+            module_name, function_name = path.split(":")
+            started = time.perf_counter()
+            module = importlib.import_module(module_name)
+            import_timings[path] = time.perf_counter() - started
+            logger.info(f"Imported page {path} in {import_timings[path]:.3f}s")
+            _pages[path] = getattr(module, function_name)
+        return _pages[path]
+
+
+def run_page(path):
+    """Load a page by import path and render it, recording how long the render took."""
+    page = load_page(path)
+    started = time.perf_counter()
+    try:
+        return page()
+    finally:
+        render_timings[path] = time.perf_counter() - started
+        logger.debug(f"Rendered page {path} in {render_timings[path]:.3f}s")
@@ -0,0 +1,123 @@
+# helpers/runtime.py
+"""
+Process-wide asyncio runtime.
+
+Streamlit runs each page in a script thread that has no event loop, so the
+views used to call asyncio.run(...) on every click: a new loop per request,
+torn down at the end, and nothing async could outlive a rerun. This module
+owns a single long-lived event loop running in a daemon thread and lets any
+thread hand coroutines to it.
+
+    from helpers import runtime
+    leads = runtime.run(fetch_and_process_lead_report(start, end), key="lead_view")
+
+`key` makes a request replaceable: submitting a new coroutine with the same
+key (scoped to the current Streamlit session) cancels the previous one, so a
+user clicking "Carregar" twice does not keep two fetches running.
+"""
+
+import asyncio
+import logging
+import threading
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TIMEOUT = 300  # seconds
+
+_loop = None
+_thread = None
+_loop_lock = threading.Lock()
+
+_pending = {}
+_pending_lock = threading.Lock()
+
+
+def get_loop() -> asyncio.AbstractEventLoop:
+    """Return the runtime event loop, starting its thread on first use."""
+    global _loop, _thread
+    with _loop_lock:
+        if _loop is None or _loop.is_closed() or not _thread.is_alive():
+            _loop = asyncio.new_event_loop()
+            _thread = threading.Thread(target=_run_loop, args=(_loop,), name="async-runtime", daemon=True)
+            _thread.start()
+            logger.info("Started async runtime event loop")
+        return _loop
+
+
+def _run_loop(loop):
+    asyncio.set_event_loop(loop)
+    loop.run_forever()
+
+
+def _session_scoped(key):
+    """Prefix a request key with the Streamlit session id, when running inside a session."""
+    try:
+        from streamlit.runtime.scriptrunner import get_script_run_ctx
+        ctx = get_script_run_ctx(suppress_warning=True)
+    except Exception:
+        ctx = None
+    return f"{ctx.session_id}:{key}" if ctx else key
+
+
+async def _with_timeout(coro, timeout):
+    if timeout is None:
+        return await coro
+    return await asyncio.wait_for(coro, timeout)
+
+
+def submit(coro, timeout=None, key=None) -> Future:
+    """
+    Schedule a coroutine on the runtime loop from any thread.
+
+    Args:
+        coro: Coroutine to run
+        timeout: Seconds after which the coroutine is cancelled (None = no limit)
+        key: Optional request key; a previous pending request with the same key is cancelled
+
+    Returns:
+        concurrent.futures.Future with the coroutine result
+    """
+    future = asyncio.run_coroutine_threadsafe(_with_timeout(coro, timeout), get_loop())
+
+    if key is not None:
+        scoped_key = _session_scoped(key)
+        with _pending_lock:
+            previous = _pending.get(scoped_key)
+            _pending[scoped_key] = future
+        if previous is not None and not previous.done():
+            logger.info(f"Cancelling stale request '{key}'")
+            previous.cancel()
+        future.add_done_callback(lambda f: _forget(scoped_key, f))
+
+    return future
+
+
+def _forget(scoped_key, future):
+    with _pending_lock:
+        if _pending.get(scoped_key) is future:
+            del _pending[scoped_key]
+
+
+def run(coro, timeout=DEFAULT_TIMEOUT, key=None):
+    """
+    Run a coroutine on the runtime loop and block until it finishes.
+
+    Drop-in replacement for asyncio.run() in Streamlit script threads.
+
+    Raises:
+        TimeoutError: If the coroutine did not finish within `timeout` seconds
+        concurrent.futures.CancelledError: If a newer request with the same key replaced it
+    """
+    future = submit(coro, timeout=timeout, key=key)
+    try:
+        return future.result()
+    except (asyncio.TimeoutError, FutureTimeoutError):
+        raise TimeoutError(f"Request timed out after {timeout} seconds")
+
+
+def cancel(key) -> bool:
+    """Cancel the pending request registered under `key` for the current session."""
+    with _pending_lock:
+        future = _pending.get(_session_scoped(key))
+    return future.cancel() if future is not None else False
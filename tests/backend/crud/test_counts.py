@@ -0,0 +1,31 @@
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent.parent))
+
+import pytest
+from backend.crud import lead as lead_crud
+from backend.crud.counts import resolve_total
+from backend.models.lead import Lead
+from backend.schemas.lead import LeadCreate
+
+@pytest.mark.asyncio
+async def test_totals_are_cached_per_filter_set_until_a_write(db):
+    calls = []
+    async def count(**filters):
+        calls.append(filters)
+        return await lead_crud.get_leads_count(db, **filters)
+
+    await lead_crud.create_lead(db, LeadCreate(name='Ana', unit='MOEMA'))
+    filters = {"unit": "MOEMA", "status": None, "source": None}
+    assert await resolve_total(db, Lead.__table__, filters, lambda: count(**filters)) == (1, False)
+    assert await resolve_total(db, Lead.__table__, dict(filters), lambda: count(**filters)) == (1, False)
+    assert len(calls) == 1
+
+    await lead_crud.create_lead(db, LeadCreate(name='Bia', unit='MOEMA'))
+    assert await resolve_total(db, Lead.__table__, filters, lambda: count(**filters)) == (2, False)
+    assert len(calls) == 2
+
+    assert await resolve_total(db, Lead.__table__, filters, lambda: count(**filters), include_total=False) == (None, False)
+    # SQLite has no planner statistics: estimates fall back to the exact count
+    unfiltered = {"unit": None, "status": None, "source": None}
+    assert await resolve_total(db, Lead.__table__, unfiltered, lambda: count(**unfiltered), estimate=True) == (2, False)
@@ -0,0 +1,23 @@
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent.parent))
+
+import pytest
+from backend.crud import lead as lead_crud
+from backend.schemas.lead import LeadCreate, LeadUpdate
+
+@pytest.mark.asyncio
+async def test_lead_crud_round_trip(db):
+    first = await lead_crud.create_lead(db, LeadCreate(name='Ana', unit='MOEMA', source='Google'))
+    await lead_crud.create_lead(db, LeadCreate(name='Bia', unit='LAPA', source='Google'))
+
+    assert [lead.name for lead in await lead_crud.get_leads(db, unit='MOEMA')] == ['Ana']
+    assert await lead_crud.get_leads_count(db, source='Google') == 2
+    assert await lead_crud.get_leads_by_source(db) == [{'source': 'Google', 'count': 2}]
+
+    updated = await lead_crud.update_lead(db, first.id, LeadUpdate(status='Convertido'))
+    assert (updated.name, updated.status) == ('Ana', 'Convertido')
+
+    assert await lead_crud.delete_lead(db, first.id)
+    assert await lead_crud.get_lead(db, first.id) is None
+    assert not await lead_crud.delete_lead(db, first.id)
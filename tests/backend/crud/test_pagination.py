@@ -0,0 +1,37 @@
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent.parent))
+
+import pytest
+from datetime import datetime
+from backend.crud import sale as sale_crud
+from backend.crud.pagination import decode_cursor, next_cursor
+from backend.models.sale import Sale
+
+async def _add_sales(db, dates):
+    for day in dates:
+        db.add(Sale(lead_id=1, date=datetime(2024, 1, day), procedure='BOTOX', unit='MOEMA', total_value=100,
+                    final_value=100, payment_method='Pix', status='Finalizado', seller='Ana'))
+    await db.commit()
+
+@pytest.mark.asyncio
+async def test_walking_the_cursor_visits_every_sale_once_in_order(db):
+    # Repeated dates: the id breaks the ties
+    await _add_sales(db, [5, 3, 3, 9, 1, 3, 7])
+    seen, after = [], None
+    while True:
+        page = await sale_crud.get_sales(db, limit=3, after=after)
+        page, after = next_cursor(page, 2, sale_crud.SALE_ORDER)
+        seen.extend((sale.date.day, sale.id) for sale in page)
+        if after is None:
+            break
+    assert seen == sorted(seen)
+    assert len(seen) == 7 and len(set(seen)) == 7
+
+    # Offset paging stays available, with the same order
+    offset_page = await sale_crud.get_sales(db, skip=2, limit=2)
+    assert [(sale.date.day, sale.id) for sale in offset_page] == seen[2:4]
+
+def test_malformed_cursors_are_rejected():
+    with pytest.raises(ValueError):
+        decode_cursor('not-a-cursor', sale_crud.SALE_ORDER)
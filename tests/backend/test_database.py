@@ -0,0 +1,25 @@
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
+
+from sqlalchemy import create_engine, inspect, text
+from backend.database import Base, migrate_database, unversioned_revision
+from backend.models import MktLead
+
+def test_migrate_stamps_databases_built_by_create_tables(tmp_path):
+    # Head schema from create_all, and the same without the filter indexes (user-041..049)
+    for name, drop_indexes, expected in [('head.db', False, 'head'), ('fingerprint.db', True, '0002_match_fingerprint')]:
+        engine = create_engine(f"sqlite:///{tmp_path / name}")
+        with engine.begin() as connection:
+            Base.metadata.create_all(connection)
+            if drop_indexes:
+                for table in Base.metadata.tables.values():
+                    for index in table.indexes:
+                        connection.execute(text(f"DROP INDEX {index.name}"))
+            assert unversioned_revision(connection) == expected
+
+            migrate_database(connection)
+            assert unversioned_revision(connection) is None
+            assert connection.execute(text("SELECT version_num FROM alembic_version")).scalar() == '0003_filter_indexes'
+            assert 'ix_mkt_leads_lead_source_lead_id' in {index['name'] for index in inspect(connection).get_indexes(MktLead.__tablename__)}
+        engine.dispose()
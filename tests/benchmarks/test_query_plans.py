@@ -0,0 +1,32 @@
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
+
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import create_engine
+from backend.database import ALEMBIC_INI, migrate_database
+from benchmarks.query_plans import check_plans
+
+def test_hot_queries_use_the_migrated_indexes(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'plans.db'}")
+    with engine.connect() as connection:
+        migrate_database(connection)
+        connection.commit()
+        config = Config(ALEMBIC_INI)
+        config.attributes.update(connection=connection, configure_logger=False)
+        # The migrations build exactly the schema of backend/models (raises otherwise)
+        command.check(config)
+        connection.commit()
+
+        results = check_plans(connection)
+        assert [result['name'] for result in results if not result['used']] == []
+
+        # Without the index migration the same check fails
+        command.downgrade(config, '0002_match_fingerprint')
+        connection.commit()
+    # New connection: sqlite3 keeps explained statements prepared against the old schema
+    engine.dispose()
+    with engine.connect() as connection:
+        assert not any(result['used'] for result in check_plans(connection))
+    engine.dispose()
@@ -0,0 +1,22 @@
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
+
+from benchmarks.funnel import run
+from benchmarks.synthetic import generate
+
+def test_generate_is_seeded():
+    first, second = generate(500, seed=7), generate(500, seed=7)
+    for a, b in zip(first, second):
+        assert a.equals(b)
+
+def test_run_times_every_stage_on_synthetic_data():
+    timings = run(2000, save=False)
+    assert {'clean', 'categorize', 'match', 'purchase_join', 'assemble', 'funnel_total'} <= set(timings)
+    # About APPOINTMENT_RATE of the leads should be found on the agenda
+    assert 0.25 * 2000 < timings['leads_matched'] < 0.45 * 2000
+
+def test_run_saves_the_whole_table():
+    timings = run(1000)
+    assert timings['save_dialect'] == 'sqlite'
+    assert timings['save'] > 0 and timings['resave'] > 0
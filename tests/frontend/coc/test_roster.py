@@ -0,0 +1,40 @@
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
+
+from unittest.mock import MagicMock, patch
+from frontend.coc import roster
+
+def _mock_client():
+    spreadsheet = MagicMock()
+    spreadsheet.values_batch_get.return_value = {"valueRanges": [
+        {"values": [["Atendente", "Unidade", "Turno", "Tam"], ["Ana", "Moema", "Manhã"]]},
+        {"values": [["Consultora", "Unidade", "Turno", "Tam"]]},
+        {"values": [["Unidade", "Tam"], ["Moema", "P"]]},
+        {},
+    ]}
+    client = MagicMock()
+    client.open_by_url.return_value = spreadsheet
+    return client, spreadsheet
+
+def test_roster_reads_all_worksheets_in_one_batch_and_caches():
+    client, spreadsheet = _mock_client()
+    roster.invalidate()
+
+    with patch('frontend.coc.roster.get_client', return_value=client), \
+         patch('frontend.coc.roster.get_ss_url', return_value='url'):
+        df_atendentes = roster.get_roster_table("atendentes")
+        df_lojas = roster.get_roster_table("lojas")
+        df_consultoras = roster.get_roster_table("consultoras")
+        df_dias = roster.get_roster_table("dias")
+
+        assert spreadsheet.values_batch_get.call_count == 1
+        assert df_atendentes.iloc[0]['Tam'] == ''  # trailing empty cell padded
+        assert df_lojas.iloc[0]['Unidade'] == 'Moema'
+        assert df_consultoras.empty and df_dias.empty
+
+        roster.invalidate()
+        roster.get_roster_table("lojas")
+        assert spreadsheet.values_batch_get.call_count == 2
+
+    roster.invalidate()
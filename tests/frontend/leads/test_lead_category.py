@@ -0,0 +1,26 @@
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent.parent))
+
+import pandas as pd
+from frontend.leads.lead_category import categorize, categorize_series, process_lead_categories
+from benchmarks.categorize import legacy_categorize, synthetic_texts
+
+def test_compiled_matcher_keeps_first_keyword_priority():
+    # 'Corporal' comes before 'Preenchimento' in the mapping, though it appears later in the text
+    assert categorize('Preenchimento corporal') == 'Preenchimento Corporal'
+    # 'Crio' and 'Criolipólise' start at the same position; the earlier keyword wins
+    assert categorize('CRIOLIPÓLISE') == 'Crio'
+    assert categorize(None) == 'Indefinido'
+
+def test_vectorized_categorization_matches_original_loop():
+    texts = pd.concat([synthetic_texts(2000, seed=7), pd.Series(['Mamoplastia Redutora', 'rugas e olheiras', ''])])
+    assert list(categorize_series(texts)) == list(texts.apply(legacy_categorize))
+
+def test_process_lead_categories_falls_back_to_message():
+    df_leads = pd.DataFrame({
+        'Content': ['botox_sp', 'campanha', 'campanha'],
+        'Mensagem': ['', 'quero fazer limpeza', 'Lead salvo pelo modal de WhatsApp da Isa'],
+        'Fonte': ['Google Pesquisa'] * 3,
+    })
+    assert list(process_lead_categories(df_leads)['Categoria']) == ['Botox', 'Limpeza', 'Quer Falar no Whatsapp']
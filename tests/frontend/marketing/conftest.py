@@ -0,0 +1,45 @@
+import pytest
+import pandas as pd
+
+LEAD_COLUMNS = ['Email do lead', 'Mensagem', 'Fonte', 'Source', 'Medium', 'Term', 'Content', 'Campaign']
+
+@pytest.fixture
+def leads():
+    leads = pd.DataFrame({
+        'ID do lead': [1, 2, 3, 3],
+        'Telefone do lead': ['11900000001', '11900000002', '11900000003', '11900000003'],
+        'Unidade': ['Moema'] * 4,
+        'Dia da entrada': pd.to_datetime(['2024-01-01'] * 4),
+        'Mês': [1] * 4,
+        'Categoria': ['Botox'] * 4,
+    })
+    for column in LEAD_COLUMNS:
+        leads[column] = ''
+    return leads
+
+@pytest.fixture
+def appointments():
+    return pd.DataFrame({
+        'Telefones Limpos': ['11900000001', '11900000001', '11900000002'],
+        'Email': ['', '', ''],
+        'Data': pd.to_datetime(['2024-01-03', '2024-01-05', '2024-01-04']),
+        'Procedimento': ['AVALIAÇÃO ESTÉTICA'] * 3,
+        'Status': ['Falta', 'Atendido', 'Agendado'],
+        'Unidade do agendamento': ['Lapa', 'Itaim', 'Mooca'],
+    })
+
+@pytest.fixture
+def sales():
+    return pd.DataFrame({
+        'Telefones Limpos': [['11900000001']],
+        'Telefone(s) do cliente': ['(11) 90000-0001'],
+        'ID orçamento': [77],
+        'Data venda': pd.to_datetime(['2024-01-11']),
+        'Unidade': ['Itaim'],
+        'Valor líquido': [300.0],
+        'Total comprado pelo cliente': [300.0],
+        'Número de orçamentos do cliente': [1],
+        'Dia': [11],
+        'Mês': [1],
+        'Dia da Semana': ['Thursday'],
+    })
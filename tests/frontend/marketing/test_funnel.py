@@ -0,0 +1,34 @@
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent.parent))
+
+import pandas as pd
+from frontend.marketing.funnel import build_funnel, funnel_summary
+from helpers.cleaner import rename_columns_df_leads_with_purchases, columns_to_hide_from_final_df_leads_appointments_sales
+
+def test_funnel_applies_status_precedence_and_final_schema(leads, appointments, sales):
+    funnel = build_funnel(leads, appointments, sales)
+
+    # Atendido wins over an earlier 'Falta'; duplicated lead IDs are dropped
+    assert list(funnel['ID lead']) == [1, 2, 3]
+    assert list(funnel['Status Agenda']) == ['Atendido', 'Agendado', 'Não está na agenda']
+    assert list(funnel['Unidade da Agenda']) == ['Itaim', 'Mooca', '']
+    assert list(funnel['comprou']) == [True, False, False]
+    assert list(funnel['Unidade da Venda']) == ['Itaim', 'Não comprou', 'Não comprou']
+    assert funnel['intervalo da compra'].iloc[0] == 10
+
+    # Same columns, in the same order, as the positional rename it replaces
+    expected = rename_columns_df_leads_with_purchases(pd.DataFrame(columns=range(30))).drop(
+        columns=columns_to_hide_from_final_df_leads_appointments_sales)
+    assert list(funnel.columns) == list(expected.columns) + ['intervalo da compra']
+
+    summary = funnel_summary(funnel)
+    assert (summary['atendidos'], summary['outros_status'], summary['nao_encontrados']) == (1, 1, 1)
+    assert summary['total_comprado'] == 300.0
+
+def test_funnel_reports_every_stage(leads, appointments, sales):
+    events = []
+    build_funnel(leads, appointments, sales, progress=events.append)
+
+    finished = [event['stage'] for event in events if event['finished']]
+    assert finished == ['atendidos', 'outros_status', 'compras', 'tabela']
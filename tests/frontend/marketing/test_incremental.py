@@ -0,0 +1,41 @@
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent.parent))
+
+import pytest
+import pandas as pd
+from unittest.mock import patch
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from backend.database import Base
+from backend.models.mkt_lead import MktLead
+from frontend.marketing.incremental import build_incremental_funnel
+from helpers.data_wrestler import save_data_to_db_batch
+
+@pytest.fixture
+def session_factory():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine, tables=[MktLead.__table__])
+    factory = sessionmaker(bind=engine)
+    with patch('frontend.marketing.incremental.SessionLocal', factory), \
+         patch('helpers.data_wrestler.SessionLocal', factory):
+        yield factory
+
+def test_rerun_reuses_stored_leads_until_their_evidence_changes(session_factory, leads, appointments, sales):
+    funnel, fingerprints, stats = build_incremental_funnel(leads, appointments, sales)
+    assert stats == {"reused": 0, "matched": 3}
+    success, _ = save_data_to_db_batch(funnel, fingerprints=fingerprints)
+    assert success
+
+    rerun, rerun_fingerprints, stats = build_incremental_funnel(leads, appointments, sales)
+    assert stats == {"reused": 3, "matched": 0}
+    pd.testing.assert_series_equal(rerun_fingerprints, fingerprints)
+    assert list(rerun.columns) == list(funnel.columns)
+    for column in ['ID lead', 'Status Agenda', 'Unidade da Agenda', 'Unidade da Venda', 'comprou', 'intervalo da compra']:
+        assert list(rerun[column]) == list(funnel[column]), column
+
+    # A new sale for lead 2 only invalidates lead 2
+    more_sales = pd.concat([sales, sales.assign(**{'Telefones Limpos': [['11900000002']], 'ID orçamento': [78]})])
+    rerun, _, stats = build_incremental_funnel(leads, appointments, more_sales)
+    assert stats == {"reused": 2, "matched": 1}
+    assert list(rerun['comprou']) == [True, True, False]
@@ -0,0 +1,46 @@
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent.parent))
+
+import io
+import pandas as pd
+from unittest.mock import MagicMock
+from frontend.marketing import ingestion
+
+def _xlsx_bytes(df):
+    buffer = io.BytesIO()
+    df.to_excel(buffer, index=False)
+    return buffer.getvalue()
+
+def _upload(content):
+    upload = MagicMock()
+    upload.getvalue.return_value = content
+    return upload
+
+def test_uploads_are_parsed_once_per_content(tmp_path, monkeypatch):
+    monkeypatch.setattr(ingestion, 'INGEST_CACHE_DIR', str(tmp_path))
+    monkeypatch.setattr(ingestion, '_memory_cache', ingestion.OrderedDict())
+    calls = []
+
+    def clean_sales(df):
+        calls.append(len(df))
+        df['Telefones Limpos'] = df['Telefone'].astype(str).str.split('/')
+        return df
+
+    monkeypatch.setitem(ingestion.CLEANERS, 'sales', clean_sales)
+    content = _xlsx_bytes(pd.DataFrame({'Telefone': ['11999/11888', '11777'], 'Valor': [1.5, 2.0]}))
+
+    first = ingestion.ingest_uploads({'leads': None, 'sales': _upload(content)})
+    assert first['leads'] is None
+    assert first['sales']['Telefones Limpos'].tolist() == [['11999', '11888'], ['11777']]
+
+    # Memory cache hit
+    ingestion.ingest_uploads({'sales': _upload(content)})
+    assert calls == [2]
+
+    # Parquet cache hit after a process restart, list columns restored
+    monkeypatch.setattr(ingestion, '_memory_cache', ingestion.OrderedDict())
+    again = ingestion.ingest_uploads({'sales': _upload(content)})['sales']
+    assert calls == [2]
+    assert again['Telefones Limpos'].tolist() == [['11999', '11888'], ['11777']]
+    pd.testing.assert_series_equal(again['Valor'], first['sales']['Valor'])
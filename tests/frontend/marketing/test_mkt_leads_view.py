@@ -0,0 +1,56 @@
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent.parent))
+
+import pytest
+from unittest.mock import patch
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from backend.database import Base
+from backend.models.mkt_lead import MktLead
+from frontend.st_mkt import mkt_leads_view
+
+@pytest.fixture
+def session_factory():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine, tables=[MktLead.__table__])
+    factory = sessionmaker(bind=engine)
+    session = factory()
+    session.add_all([
+        MktLead(lead_id=i, lead_store='Moema' if i % 2 else 'Lapa', sales_purchased=(i == 5))
+        for i in range(1, 8)
+    ])
+    session.commit()
+    session.close()
+    mkt_leads_view._count_cache.clear()
+    with patch('frontend.st_mkt.mkt_leads_view.SessionLocal', factory):
+        yield factory
+
+def test_keyset_pages_walk_all_rows_newest_first(session_factory):
+    df, cursor = mkt_leads_view.load_data_from_db(limit=3)
+    assert list(df['ID']) == [7, 6, 5]
+    assert list(df['Comprou']) == ['Não', 'Não', 'Sim']
+
+    df, cursor = mkt_leads_view.load_data_from_db(limit=3, after_id=cursor)
+    assert list(df['ID']) == [4, 3, 2]
+
+    df, cursor = mkt_leads_view.load_data_from_db(limit=3, after_id=cursor)
+    assert list(df['ID']) == [1]
+    assert cursor is None
+
+def test_filtered_count_is_cached(session_factory):
+    assert mkt_leads_view.count_leads(store_filter='Moema') == 4
+
+    with patch('frontend.st_mkt.mkt_leads_view.SessionLocal', side_effect=AssertionError('count not cached')):
+        assert mkt_leads_view.count_leads(store_filter='Moema') == 4
+
+def test_invalidate_counts_picks_up_saved_rows(session_factory):
+    assert mkt_leads_view.count_leads() == 7
+    session = session_factory()
+    session.add(MktLead(lead_id=8, lead_store='Moema'))
+    session.commit()
+    session.close()
+    assert mkt_leads_view.count_leads() == 7
+
+    mkt_leads_view.invalidate_counts()
+    assert mkt_leads_view.count_leads() == 8
@@ -0,0 +1,65 @@
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent.parent))
+
+import pandas as pd
+from frontend.marketing import progress as progress_module
+from frontend.marketing.worker import check_if_lead_has_atendido_status
+
+def test_matching_emits_real_progress_events():
+    df_leads = pd.DataFrame({
+        'Telefone do lead': ['11999990001', '11999990002', '11999990003'],
+        'Email do lead': ['a@x.com', 'b@x.com', 'c@x.com'],
+    })
+    df_appointments = pd.DataFrame({
+        'Telefones Limpos': ['11999990001'],
+        'Email': ['c@x.com'],
+        'Data': [pd.Timestamp('2024-01-02')],
+        'Procedimento': ['AVALIAÇÃO'],
+        'Status': ['Atendido'],
+        'Unidade do agendamento': ['Moema'],
+    })
+    events = []
+
+    result = check_if_lead_has_atendido_status(df_leads, df_appointments, progress=events.append)
+
+    assert list(result['status']) == ['Atendido', None, 'Atendido']
+    assert events[0]['done'] == 0 and events[-1]['done'] == 3
+    assert events[-1]['finished'] and events[-1]['matched'] == 2
+    assert all(event['stage'] == 'atendidos' for event in events)
+
+def test_stage_progress_reports_every_n_rows(monkeypatch):
+    monkeypatch.setattr(progress_module, 'REPORT_EVERY', 2)
+    events = []
+
+    tracker = progress_module.StageProgress(events.append, 'compras', 5)
+    for _ in range(5):
+        tracker.advance(matched=1)
+    tracker.finish()
+
+    assert [event['done'] for event in events] == [0, 2, 4, 5]
+    assert events[-1]['matched'] == 5
+
+def test_matching_advances_per_chunk(monkeypatch):
+    monkeypatch.setattr(progress_module, 'CHUNK_ROWS', 2)
+    monkeypatch.setattr(progress_module, 'REPORT_EVERY', 1)
+    df_leads = pd.DataFrame({
+        'Telefone do lead': ['11999990001', '11999990002', '11999990003', '11999990004', '11999990005'],
+        'Email do lead': [''] * 5,
+    }, index=[10, 11, 12, 13, 14])
+    df_appointments = pd.DataFrame({
+        'Telefones Limpos': ['11999990001', '11999990005'],
+        'Email': ['', ''],
+        'Data': pd.to_datetime(['2024-01-02', '2024-01-03']),
+        'Procedimento': ['AVALIAÇÃO'] * 2,
+        'Status': ['Atendido'] * 2,
+        'Unidade do agendamento': ['Moema', 'Lapa'],
+    })
+    events = []
+
+    result = check_if_lead_has_atendido_status(df_leads, df_appointments, progress=events.append)
+
+    assert list(result.index) == [10, 11, 12, 13, 14]
+    assert list(result['unidade']) == ['Moema', None, None, None, 'Lapa']
+    assert pd.api.types.is_datetime64_any_dtype(result['data_agenda'])
+    assert [(event['done'], event['matched']) for event in events] == [(0, 0), (2, 1), (4, 1), (5, 2), (5, 2)]
@@ -0,0 +1,60 @@
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent.parent))
+
+import pandas as pd
+from frontend.marketing.sales_checker import check_if_lead_has_purchased
+from frontend.marketing.worker import match_leads_to_appointments
+
+def test_purchase_matches_any_of_the_customer_phones():
+    leads = pd.DataFrame({
+        'ID do lead': [1, 2, 3],
+        'Telefone do lead': ['11988880002', '', '11977770003'],
+        'Unidade': ['Moema', 'Lapa', 'Itaim'],
+    })
+    sales = pd.DataFrame({
+        'Telefones Limpos': [['Cliente sem telefone'], ['11999990001', '1188880002'], ['1188880002']],
+        'Unidade': ['Lapa', 'Moema', 'Mooca'],
+        'Valor líquido': [50.0, 100.0, 200.0],
+    }, index=[7, 7, 8])
+
+    result = check_if_lead_has_purchased(leads, sales)
+
+    assert list(result['ID do lead']) == [1, 2, 3]
+    assert list(result['comprou']) == [True, False, False]
+    assert result['Valor líquido'].iloc[0] == 100.0
+
+def test_appointment_matches_second_phone_of_customer():
+    leads = pd.DataFrame({'Telefone do lead': ['11988880002'], 'Email do lead': ['']})
+    appointments = pd.DataFrame({
+        'Telefone': ['(11) 99999-0001, (11) 8888-0002'],
+        'Telefones Limpos': ['11999990001, 11988880002'],
+        'Email': [None],
+        'Data': [pd.Timestamp('2024-01-01')],
+        'Procedimento': ['AVALIAÇÃO'],
+        'Status': ['Atendido'],
+        'Unidade do agendamento': ['Moema'],
+    })
+
+    assert list(match_leads_to_appointments(leads, appointments)['status']) == ['Atendido']
+
+def test_temporal_purchase_picks_nearest_sale_after_entry():
+    leads = pd.DataFrame({
+        'ID do lead': [1, 2],
+        'Telefone do lead': ['11988880002', '11977770003'],
+        'Dia da entrada': pd.to_datetime(['2024-03-01', '2024-03-01']),
+        'Unidade': ['Moema', 'Lapa'],
+    })
+    sales = pd.DataFrame({
+        'Telefones Limpos': [['11988880002'], ['11999990001', '11988880002'], ['11977770003']],
+        'Data venda': pd.to_datetime(['2024-02-01', '2024-03-10', '2024-01-01']),
+        'Unidade': ['Lapa', 'Moema', 'Mooca'],
+        'Valor líquido': [50.0, 100.0, 200.0],
+    })
+
+    result = check_if_lead_has_purchased(leads, sales, window_days=30)
+
+    assert list(result['comprou']) == [True, False]
+    assert result['Valor líquido'].iloc[0] == 100.0
+    assert result['Telefones Limpos'].iloc[0] == '11988880002'
+    assert list(result.columns) == list(check_if_lead_has_purchased(leads, sales).columns)
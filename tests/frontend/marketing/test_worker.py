@@ -0,0 +1,92 @@
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent.parent))
+
+import pandas as pd
+from frontend.marketing.worker import match_leads_to_appointments, build_appointment_index
+from frontend.marketing.parallel import resolve_matches_in_pool
+
+def test_match_keeps_first_appointment_by_phone_or_email():
+    df_leads = pd.DataFrame({
+        'Telefone do lead': ['11900000001', '', '11900000003', '11900000004'],
+        'Email do lead': ['x@x.com', '', 'c@x.com', None],
+    }, index=[10, 11, 12, 13])
+    df_appointments = pd.DataFrame({
+        'Telefones Limpos': ['', '11900000003', '11900000001', '11900000001'],
+        'Email': ['c@x.com', None, 'z@x.com', 'x@x.com'],
+        'Data': pd.to_datetime(['2024-01-01', '2024-01-02', '2024-01-03', '2024-01-04']),
+        'Procedimento': ['AVALIAÇÃO'] * 4,
+        'Status': ['Atendido', 'Falta', 'Agendado', 'Cancelado'],
+        'Unidade do agendamento': ['Moema', 'Lapa', 'Itaim', 'Mooca'],
+    })
+
+    result = match_leads_to_appointments(df_leads, df_appointments)
+
+    assert list(result.index) == [10, 11, 12, 13]
+    # lead 10: phone hits rows 2 and 3 -> first is row 2
+    # lead 11: no phone/email -> never matches
+    # lead 12: email hits row 0 before its phone hits row 1
+    assert list(result['status']) == ['Agendado', None, 'Atendido', None]
+    assert list(result['unidade']) == ['Itaim', None, 'Moema', None]
+    assert result['data_agenda'].iloc[0] == pd.Timestamp('2024-01-03')
+
+def test_process_pool_match_is_identical_to_single_process():
+    df_leads = pd.DataFrame({
+        'Telefone do lead': [f'119000000{i:02d}' for i in range(40)],
+        'Email do lead': [f'{i}@x.com' if i % 3 else '' for i in range(40)],
+    }, index=range(100, 140))
+    df_appointments = pd.DataFrame({
+        'Telefones Limpos': [f'119000000{i:02d}, 11911111111' for i in range(0, 40, 2)],
+        'Email': [f'{i}@x.com' for i in range(1, 40, 2)],
+        'Data': pd.date_range('2024-01-01', periods=20),
+        'Procedimento': ['AVALIAÇÃO'] * 20,
+        'Status': ['Atendido', 'Falta'] * 10,
+        'Unidade do agendamento': ['Moema'] * 20,
+    })
+
+    single = match_leads_to_appointments(df_leads, df_appointments, parallel=False)
+    pooled = resolve_matches_in_pool(df_leads, build_appointment_index(df_appointments), workers=2)
+
+    pd.testing.assert_frame_equal(single, pooled)
+
+def test_temporal_match_picks_nearest_appointment_after_entry():
+    df_leads = pd.DataFrame({
+        'Telefone do lead': ['11900000001', '11900000002', '11900000003'],
+        'Email do lead': ['', 'b@x.com', ''],
+        'Dia da entrada': pd.to_datetime(['2024-02-01 15:30:00', '2024-02-01 00:00:00', '2024-02-01 00:00:00']),
+    }, index=[7, 8, 9])
+    df_appointments = pd.DataFrame({
+        'Telefones Limpos': ['11900000001', '11900000001', '11900000001', '11900000002', '11900000003'],
+        'Email': ['', '', '', '', ''],
+        'Data': pd.to_datetime(['2024-01-15', '2024-02-20', '2024-02-01', '2024-02-10', '2024-08-01']),
+        'Procedimento': ['AVALIAÇÃO'] * 5,
+        'Status': ['Falta', 'Atendido', 'Agendado', 'Falta', 'Atendido'],
+        'Unidade do agendamento': ['Moema', 'Lapa', 'Itaim', 'Mooca', 'Moema'],
+    })
+    df_appointments.loc[0, 'Email'] = 'b@x.com'
+    df_appointments.loc[0, 'Data'] = pd.Timestamp('2024-02-05')
+
+    result = match_leads_to_appointments(df_leads, df_appointments, window_days=90)
+
+    assert list(result.index) == [7, 8, 9]
+    # lead 7: same-day appointment wins over the later one and the one in file order
+    # lead 8: email match on 02-05 is nearer than the phone match on 02-10
+    # lead 9: only appointment is outside the 90-day window
+    assert list(result['unidade']) == ['Itaim', 'Moema', None]
+    assert result['data_agenda'].iloc[1] == pd.Timestamp('2024-02-05')
+
+def test_pool_falls_back_without_pyarrow(monkeypatch):
+    from frontend.marketing import parallel
+    df_leads = pd.DataFrame({'Telefone do lead': ['11900000001'], 'Email do lead': ['']}, index=[5])
+    df_appointments = pd.DataFrame({
+        'Telefones Limpos': ['11900000001'],
+        'Email': [''],
+        'Data': pd.to_datetime(['2024-01-01']),
+        'Procedimento': ['AVALIAÇÃO'],
+        'Status': ['Atendido'],
+        'Unidade do agendamento': ['Moema'],
+    })
+    monkeypatch.setattr(parallel, 'pa', None)
+    result = resolve_matches_in_pool(df_leads, build_appointment_index(df_appointments), workers=2)
+    assert list(result['status']) == ['Atendido']
+    assert list(result.index) == [5]
@@ -0,0 +1,30 @@
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
+
+import pandas as pd
+from helpers.cleaner import normalize_phones, phone_keys, split_telephones
+
+def test_normalize_phones_builds_canonical_keys():
+    phones = pd.Series([
+        '+55 (11) 99999-0001',   # country code
+        '11 8888-0002',          # old mobile without the ninth digit
+        '(11) 3333-4444',        # landline keeps 10 digits
+        '0 11 99999 0001',       # trunk prefix
+        '55 9 9999-0001',        # DDD 55 is not a country code
+        None,
+        'Cliente sem telefone',
+    ])
+    assert normalize_phones(phones).tolist() == [
+        '11999990001', '11988880002', '1133334444', '11999990001', '55999990001', '', ''
+    ]
+
+def test_split_telephones_normalizes_each_number():
+    assert split_telephones('+55 (11) 99999-0001, 11 8888-0002') == ['11999990001', '11988880002']
+    assert split_telephones(['11 99999-0001 / 11999990001']) == ['11999990001']
+    assert split_telephones('Cliente sem telefone') == []
+    assert split_telephones(None) == []
+
+def test_phone_keys_joins_every_number_of_the_row():
+    phones = pd.Series(['11 8888-0002 / 11 99999-0001', None], index=[4, 4])
+    assert phone_keys(phones).tolist() == ['11988880002, 11999990001', '']
@@ -0,0 +1,62 @@
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
+
+import csv
+import datetime
+import pandas as pd
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from backend.database import Base
+from backend.models.mkt_lead import MktLead
+from helpers.data_wrestler import COPY_NULL, _copy_buffer, lead_records, upsert_leads, write_leads
+
+def _funnel():
+    return pd.DataFrame({
+        'ID lead': [1, 2, '', 2],
+        'Email do lead': ['a@x.com', 'b@x.com', 'c@x.com', 'b2@x.com'],
+        'Dia da entrada': pd.to_datetime(['2024-01-05', '2024-01-06', '2024-01-07', '2024-01-08']),
+        'Data Na Agenda': pd.to_datetime(['2024-01-10', None, None, None]),
+        'Status Agenda': ['Atendido', 'Não está na agenda', '', 'Não está na agenda'],
+        'Valor primeiro orçamento': [350.0, float('nan'), float('nan'), float('nan')],
+        'Dia': [12, '', '', ''],
+        'comprou': [True, False, False, False],
+        'intervalo da compra': [7, '', '', ''],
+    })
+
+def test_lead_records_skips_missing_ids_and_keeps_the_last_duplicate():
+    records, skipped = lead_records(_funnel(), fingerprints=pd.Series(['f1', 'f2', 'f3', 'f4']))
+    assert skipped == 1
+    assert [record['lead_id'] for record in records] == [1, 2]
+    first, second = records
+    assert first['appointment_date'] == datetime.datetime(2024, 1, 10)
+    assert (first['lead_entry_day'], first['sales_day'], first['sales_interval']) == (5, 12, 7)
+    assert (first['sales_first_quote'], first['sales_purchased'], first['lead_mkt_term']) == ('350.0', True, '')
+    assert (second['lead_email'], second['appointment_date'], second['sales_day']) == ('b2@x.com', None, None)
+    assert second['match_fingerprint'] == 'f4'
+
+def test_upsert_leads_inserts_then_updates():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine, tables=[MktLead.__table__])
+    session = sessionmaker(bind=engine)()
+
+    records, _ = lead_records(_funnel())
+    assert upsert_leads(session, records) == (2, 0)
+    session.commit()
+
+    records, _ = lead_records(_funnel().assign(**{'Status Agenda': 'Atendido'}).iloc[[1, 3]].assign(**{'ID lead': [2, 3]}))
+    assert write_leads(session, records) == (1, 1)
+    session.commit()
+
+    stored = {lead.lead_id: lead for lead in session.query(MktLead).all()}
+    assert sorted(stored) == [1, 2, 3]
+    assert stored[2].appointment_status == 'Atendido'
+    assert stored[1].appointment_date == datetime.datetime(2024, 1, 10)
+    session.close()
+
+def test_copy_buffer_keeps_nulls_apart_from_empty_strings():
+    records, _ = lead_records(_funnel())
+    columns = ['lead_id', 'lead_mkt_term', 'appointment_date', 'lead_message', 'sales_purchased']
+    rows = list(csv.reader(_copy_buffer(records, columns)))
+    assert rows[0] == ['1', '', '2024-01-10 00:00:00', '', 'True']
+    assert rows[1][2] == COPY_NULL
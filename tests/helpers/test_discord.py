@@ -0,0 +1,31 @@
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
+
+from helpers import discord
+
+def test_messages_are_batched_to_file_sink(tmp_path, monkeypatch):
+    monkeypatch.setattr(discord, 'FLUSH_INTERVAL', 0.05)
+    log_file = tmp_path / 'telemetry.log'
+    discord.set_sink(discord.FileSink(str(log_file)))
+    try:
+        assert discord.send_discord_message("Loading data in page lead_view")
+        assert discord.send_discord_message("Loading data in page funil")
+        assert discord.flush()
+    finally:
+        discord.set_sink(discord.WebhookSink(discord.WEBHOOK_DISCORD))
+
+    lines = log_file.read_text(encoding='utf-8').splitlines()
+    assert [line.split(' ', 1)[1] for line in lines] == [
+        "Loading data in page lead_view",
+        "Loading data in page funil",
+    ]
+
+def test_full_queue_drops_instead_of_blocking(monkeypatch):
+    monkeypatch.setattr(discord, '_queue', discord.queue.Queue(maxsize=1))
+    monkeypatch.setattr(discord, '_ensure_worker', lambda: None)
+    dropped = discord.stats["dropped"]
+
+    assert discord.send_discord_message("first")
+    assert not discord.send_discord_message("second")
+    assert discord.stats["dropped"] == dropped + 1
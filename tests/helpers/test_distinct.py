@@ -0,0 +1,37 @@
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
+
+import numpy as np
+import pandas as pd
+from helpers.distinct import DistinctCache, map_distinct
+
+def test_map_distinct_calls_function_once_per_distinct_value():
+    calls = []
+    def shout(value):
+        calls.append(value)
+        return str(value).upper()
+
+    values = pd.Series(['a', 'b', 'a', None, 'a', np.nan], index=[5, 6, 7, 8, 9, 10], name='x')
+    result = map_distinct(values, shout)
+
+    # None and NaN are the same missing value
+    assert list(result) == ['A', 'B', 'A', 'NAN', 'A', 'NAN']
+    assert list(result.index) == [5, 6, 7, 8, 9, 10] and result.name == 'x'
+    assert len(calls) == 3
+
+def test_cache_skips_values_seen_in_earlier_calls_and_evicts_least_recent():
+    cache = DistinctCache(maxsize=2)
+    seen = []
+    def vectorized(values):
+        seen.append(list(values))
+        return values.str.len()
+
+    map_distinct(pd.Series(['aa', 'b']), vectorized, vectorized=True, cache=cache)
+    result = map_distinct(pd.Series(['b', 'ccc', 'b']), vectorized, vectorized=True, cache=cache)
+
+    assert list(result) == [1, 3, 1]
+    assert seen == [['aa', 'b'], ['ccc']]
+    # 'aa' was the least recently used entry
+    map_distinct(pd.Series(['aa']), vectorized, vectorized=True, cache=cache)
+    assert seen[-1] == ['aa'] and len(cache) == 2
@@ -0,0 +1,48 @@
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
+
+import os
+import pandas as pd
+import pytest
+from helpers import export
+
+@pytest.fixture
+def df_leads():
+    return pd.DataFrame({
+        'ID lead': [1, 2, 3],
+        'Dia da entrada': pd.to_datetime(['2024-01-01', '2024-01-02', None]),
+        'Unidade': ['Moema', '', 'Lapa'],
+        'Valor': [10.5, None, 3.0],
+        'Misto': ['a', 1, pd.Timestamp('2024-01-03')],
+    })
+
+@pytest.mark.parametrize('fmt', export.available_formats())
+def test_export_roundtrip_in_chunks(tmp_path, monkeypatch, df_leads, fmt):
+    monkeypatch.setattr(export, 'EXPORT_DIR', str(tmp_path))
+    monkeypatch.setattr(export, 'EXPORT_CHUNK_SIZE', 2)
+
+    path = export.export_dataframe(df_leads, fmt)
+
+    if fmt == 'csv':
+        df = pd.read_csv(path)
+    elif fmt == 'xlsx':
+        df = pd.read_excel(path, sheet_name='Leads')
+    else:
+        df = pd.read_parquet(path)
+    assert list(df.columns) == list(df_leads.columns)
+    assert list(df['ID lead']) == [1, 2, 3]
+    assert df['Unidade'].fillna('').tolist() == ['Moema', '', 'Lapa']
+
+def test_export_is_cached_by_dataset_hash(tmp_path, monkeypatch, df_leads):
+    monkeypatch.setattr(export, 'EXPORT_DIR', str(tmp_path))
+
+    path = export.export_dataframe(df_leads, 'csv')
+    mtime = os.path.getmtime(path)
+    with monkeypatch.context() as m:
+        m.setattr(export, '_write_csv', lambda *args: pytest.fail('export should be reused'))
+        assert export.export_dataframe(df_leads.copy(), 'csv') == path
+
+    changed = df_leads.assign(Unidade=['Moema', 'Itaim', 'Lapa'])
+    assert export.export_dataframe(changed, 'csv') != path
+    assert os.path.getmtime(path) >= mtime
@@ -0,0 +1,64 @@
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
+
+import pytest
+from unittest.mock import AsyncMock, patch
+from helpers.live_board import LiveBoard
+
+@pytest.mark.asyncio
+async def test_refresh_skips_appointment_fetch_when_total_unchanged():
+    board = LiveBoard('2024-01-01', '2024-01-01')
+    leads = [{'name': 'Ana', 'messages_count': 3, 'created_at': 'x'}]
+    appointments = [{'ID agendamento': 1, 'Status': 'Agendado'}]
+
+    with patch('helpers.live_board.fetch_leadsByUserReport', new=AsyncMock(return_value=leads)), \
+         patch('helpers.live_board.fetch_appointmentReportCreatedAt_total', new=AsyncMock(return_value=1)), \
+         patch('helpers.live_board.fetch_appointmentReportCreatedAt', new=AsyncMock(return_value=appointments)) as mock_appts:
+        await board.refresh()
+        await board.refresh()
+
+    assert mock_appts.await_count == 1
+    assert board.stats['skipped_fetches'] == 1
+    assert board.version == 1
+    _, df_leads, df_appointments, _ = board.snapshot()
+    assert list(df_appointments['ID agendamento']) == [1]
+    assert df_leads.iloc[0]['name'] == 'Ana'
+
+@pytest.mark.asyncio
+async def test_refresh_upserts_appointments_when_total_changes():
+    board = LiveBoard('2024-01-01', '2024-01-01')
+    first = [{'ID agendamento': 1, 'Status': 'Agendado'}]
+    second = [{'ID agendamento': 1, 'Status': 'Atendido'}, {'ID agendamento': 2, 'Status': 'Agendado'}]
+
+    with patch('helpers.live_board.fetch_leadsByUserReport', new=AsyncMock(return_value=[])), \
+         patch('helpers.live_board.fetch_appointmentReportCreatedAt_total', new=AsyncMock(side_effect=[1, 2])), \
+         patch('helpers.live_board.fetch_appointmentReportCreatedAt', new=AsyncMock(side_effect=[first, second])):
+        await board.refresh()
+        await board.refresh()
+
+    assert board.version == 2
+    _, _, df_appointments, _ = board.snapshot()
+    assert dict(zip(df_appointments['ID agendamento'], df_appointments['Status'])) == {1: 'Atendido', 2: 'Agendado'}
+
+@pytest.mark.asyncio
+async def test_failed_or_incomplete_fetch_keeps_board():
+    board = LiveBoard('2024-01-01', '2024-01-01')
+    leads = [{'name': 'Ana', 'messages_count': 3, 'created_at': 'x'}]
+    first = [{'ID agendamento': 1, 'Status': 'Agendado'}, {'ID agendamento': 2, 'Status': 'Agendado'}]
+    partial = [{'ID agendamento': 1, 'Status': 'Atendido'}]
+
+    with patch('helpers.live_board.fetch_leadsByUserReport', new=AsyncMock(side_effect=[leads, None, None, []])), \
+         patch('helpers.live_board.fetch_appointmentReportCreatedAt_total', new=AsyncMock(side_effect=[2, 3, 3, 3])), \
+         patch('helpers.live_board.fetch_appointmentReportCreatedAt', new=AsyncMock(side_effect=[first, None, partial, partial])):
+        await board.refresh()
+        await board.refresh()
+        _, df_leads, _, _ = board.snapshot()
+        assert df_leads.iloc[0]['name'] == 'Ana'
+        await board.refresh()
+        await board.refresh()
+
+    assert board.stats['failed_fetches'] == 3
+    _, df_leads, df_appointments, _ = board.snapshot()
+    assert df_leads.empty
+    assert dict(zip(df_appointments['ID agendamento'], df_appointments['Status'])) == {1: 'Agendado', 2: 'Agendado'}
@@ -0,0 +1,28 @@
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
+
+import ast
+from helpers import page_registry
+
+ROOT = Path(__file__).resolve().parent.parent.parent
+
+def test_menu_pages_resolve_to_functions():
+    source = (ROOT / 'app.py').read_text(encoding='utf-8')
+    paths = [
+        node.value for node in ast.walk(ast.parse(source))
+        if isinstance(node, ast.Constant) and isinstance(node.value, str) and ':load_page_' in node.value
+    ]
+    assert paths
+    for path in paths:
+        module_name, function_name = path.split(':')
+        module_file = ROOT / (module_name.replace('.', '/') + '.py')
+        assert f"def {function_name}(" in module_file.read_text(encoding='utf-8'), path
+
+def test_load_page_imports_once_and_records_timing():
+    path = 'helpers.date:transform_date_from_sales'
+    page_registry._pages.pop(path, None)
+
+    first = page_registry.load_page(path)
+    assert page_registry.load_page(path) is first
+    assert path in page_registry.import_timings
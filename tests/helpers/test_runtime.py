@@ -0,0 +1,30 @@
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
+
+import asyncio
+import pytest
+from concurrent.futures import CancelledError
+from helpers import runtime
+
+async def _echo(value, delay=0):
+    await asyncio.sleep(delay)
+    return value
+
+def test_run_returns_coroutine_result_on_shared_loop():
+    assert runtime.run(_echo(1)) == 1
+    loop = runtime.get_loop()
+    assert runtime.run(_echo(2)) == 2
+    assert runtime.get_loop() is loop
+
+def test_run_raises_timeout():
+    with pytest.raises(TimeoutError):
+        runtime.run(_echo(1, delay=5), timeout=0.05)
+
+def test_submit_with_same_key_cancels_previous_request():
+    first = runtime.submit(_echo('old', delay=5), key='test_view')
+    second = runtime.submit(_echo('new'), key='test_view')
+
+    assert second.result(timeout=1) == 'new'
+    with pytest.raises(CancelledError):
+        first.result(timeout=1)